@@ -0,0 +1,128 @@
+from urllib.parse import urlsplit
+import hmac
+import ipaddress
+import logging
+import os
+import socket
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from pydantic import BaseModel, Field
+from sqlalchemy.orm import Session
+
+from api.coalescing import coalescing_stats
+from api.profiling import ProfiledRoute
+from database.db import get_db
+from models.feed import Feed
+from services.feed_registry import feed_status
+
+logger = logging.getLogger(__name__)
+
+# The admin endpoints require a matching X-Admin-Token header
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+# Local development only: serve the admin endpoints without a token when none is set
+ADMIN_ALLOW_UNAUTHENTICATED = os.getenv("ADMIN_ALLOW_UNAUTHENTICATED", "false").lower() == "true"
+
+
+def require_admin(x_admin_token: str = Header(None)):
+    if not ADMIN_TOKEN:
+        if ADMIN_ALLOW_UNAUTHENTICATED:
+            return
+        raise HTTPException(status_code=503, detail="Admin API disabled: ADMIN_TOKEN is not set")
+    if not hmac.compare_digest(x_admin_token or "", ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="Invalid or missing X-Admin-Token")
+
+
+router = APIRouter(route_class=ProfiledRoute, dependencies=[Depends(require_admin)])
+
+
+class FeedCreate(BaseModel):
+    name: str = Field(..., min_length=1, max_length=100, pattern=r"^[a-z0-9_]+$")
+    url: str = Field(..., max_length=500, pattern=r"^https?://")
+    enabled: bool = True
+
+
+class FeedUpdate(BaseModel):
+    enabled: bool
+
+
+def _check_public_url(url: str):
+    """
+    Refuse feed URLs whose host is, or resolves to, a private, loopback,
+    link-local or otherwise non-public address; the scraper fetches them.
+    """
+    host = urlsplit(url).hostname
+    if not host:
+        raise HTTPException(status_code=422, detail="Feed URL has no host")
+    try:
+        addresses = {info[4][0] for info in socket.getaddrinfo(host, None)}
+    except socket.gaierror:
+        raise HTTPException(status_code=422, detail=f"Cannot resolve feed host {host}")
+    for address in addresses:
+        if not ipaddress.ip_address(address.split("%")[0]).is_global:
+            raise HTTPException(status_code=422, detail=f"Feed host {host} is not a public address")
+
+
+def _get_feed(db: Session, name: str) -> Feed:
+    feed = db.query(Feed).filter(Feed.name == name).first()
+    if feed is None:
+        raise HTTPException(status_code=404, detail=f"Unknown feed: {name}")
+    return feed
+
+
+@router.get("/api/admin/feeds", tags=["admin"])
+def list_feeds(db: Session = Depends(get_db)):
+    """
+    All registered feeds with their health and circuit-breaker state.
+    """
+    feeds = db.query(Feed).order_by(Feed.name).all()
+    return {"feeds": [feed_status(f) for f in feeds]}
+
+
+@router.post("/api/admin/feeds", tags=["admin"], status_code=201)
+def add_feed(feed: FeedCreate, db: Session = Depends(get_db)):
+    """
+    Register a new feed; it is fetched from the next scrape on.
+    """
+    if db.query(Feed.id).filter(Feed.name == feed.name).first():
+        raise HTTPException(status_code=409, detail=f"Feed {feed.name} already exists")
+    _check_public_url(feed.url)
+    
+    new_feed = Feed(name=feed.name, url=feed.url, enabled=feed.enabled)
+    db.add(new_feed)
+    db.commit()
+    logger.info(f"Feed {feed.name} added: {feed.url}")
+    return feed_status(new_feed)
+
+
+@router.patch("/api/admin/feeds/{name}", tags=["admin"])
+def update_feed(name: str, update: FeedUpdate, db: Session = Depends(get_db)):
+    """
+    Enable or disable a feed.
+    """
+    feed = _get_feed(db, name)
+    feed.enabled = update.enabled
+    db.commit()
+    logger.info(f"Feed {name} {'enabled' if update.enabled else 'disabled'}")
+    return feed_status(feed)
+
+
+@router.post("/api/admin/feeds/{name}/reset", tags=["admin"])
+def reset_feed(name: str, db: Session = Depends(get_db)):
+    """
+    Close a feed's circuit so the next scrape tries it again.
+    """
+    feed = _get_feed(db, name)
+    feed.consecutive_failures = 0
+    feed.retry_after = None
+    db.commit()
+    return feed_status(feed)
+
+
+@router.get("/api/admin/coalescing", tags=["admin"])
+def coalescing_metrics():
+    """
+    Request coalescing counters per route: requests, executions, requests
+    that shared an in-flight result, timeouts, errors and the most
+    followers one execution had, plus what is in flight right now.
+    """
+    return {"routes": coalescing_stats()}
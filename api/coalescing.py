@@ -0,0 +1,138 @@
+"""
+Single-flight request coalescing for expensive read endpoints.
+
+When identical requests (same route, same validated query parameters)
+arrive while one is already being computed, they wait for that result
+instead of running the same queries again. Only in-flight work is shared:
+once the leader finishes, the next request starts a fresh computation, so
+nothing is served staler than a request that was already running.
+
+Followers wait at most COALESCE_TIMEOUT_SECONDS, then get a 503 with
+Retry-After rather than piling onto the database. Per-route counters are
+available from coalescing_stats() (and /api/admin/coalescing).
+
+Sync endpoints run in the threadpool, so waiting is a plain Event.wait.
+"""
+import functools
+import logging
+import os
+import threading
+from typing import Callable, Dict, Hashable
+
+from fastapi import HTTPException
+
+logger = logging.getLogger(__name__)
+
+COALESCE_TIMEOUT_SECONDS = float(os.getenv("COALESCE_TIMEOUT_SECONDS", "30"))
+
+
+class CoalesceTimeout(Exception):
+    """Raised in a follower that waited longer than the timeout."""
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time; concurrent callers with the
+    same key share its result or exception.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+    
+    def _count(self, name: str, counter: str, amount: int = 1):
+        # Caller holds self._lock
+        stats = self._stats.setdefault(name, {
+            "requests": 0, "executions": 0, "coalesced": 0,
+            "timeouts": 0, "errors": 0, "max_waiters": 0,
+        })
+        stats[counter] += amount
+    
+    def do(self, name: str, key: Hashable, fn: Callable, timeout: float = COALESCE_TIMEOUT_SECONDS):
+        """
+        Return fn(), or the result of an identical call already in flight.
+        """
+        with self._lock:
+            self._count(name, "requests")
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._count(name, "executions")
+            else:
+                call.waiters += 1
+                self._count(name, "coalesced")
+        
+        if leader:
+            try:
+                call.result = fn()
+            except BaseException as e:
+                call.error = e
+                with self._lock:
+                    self._count(name, "errors")
+                raise
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                    stats = self._stats[name]
+                    stats["max_waiters"] = max(stats["max_waiters"], call.waiters)
+                call.done.set()
+            return call.result
+        
+        if not call.done.wait(timeout):
+            with self._lock:
+                self._count(name, "timeouts")
+            raise CoalesceTimeout(f"{name} did not finish within {timeout}s")
+        if call.error is not None:
+            raise call.error
+        return call.result
+    
+    def stats(self) -> Dict[str, Dict]:
+        """
+        Counters per route name, plus the keys currently in flight.
+        """
+        with self._lock:
+            result = {name: dict(counters) for name, counters in self._stats.items()}
+            for key, call in self._calls.items():
+                result.setdefault(key[0], {}).setdefault("in_flight", []).append(
+                    {"params": dict(key[1]), "waiters": call.waiters}
+                )
+        return result
+
+
+single_flight = SingleFlight()
+
+
+def coalesced(name: str, exclude=("db",), timeout: float = COALESCE_TIMEOUT_SECONDS):
+    """
+    Decorator for a sync endpoint: identical concurrent calls share one
+    execution. The key is the route name plus every keyword argument except
+    `exclude` (dependencies such as the database session), i.e. the query
+    parameters after FastAPI has validated and normalised them.
+    """
+    def decorator(fn: Callable):
+        @functools.wraps(fn)
+        def wrapper(**kwargs):
+            params = tuple(sorted((k, v) for k, v in kwargs.items() if k not in exclude))
+            try:
+                return single_flight.do(name, (name, params), lambda: fn(**kwargs), timeout)
+            except CoalesceTimeout as e:
+                logger.warning(f"Coalesced request timed out: {e}")
+                raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+        return wrapper
+    return decorator
+
+
+def coalescing_stats() -> Dict[str, Dict]:
+    return single_flight.stats()
@@ -0,0 +1,133 @@
+"""
+Opt-in per-request profiling.
+
+Off by default. A request is profiled when PROFILE_SAMPLE_RATE (0.0-1.0)
+samples it, or when it carries an X-Profile header equal to PROFILE_TOKEN.
+The cProfile output is written to PROFILE_DIR (newest PROFILE_KEEP files
+are kept) and named in the X-Profile-Id response header; inspect it with
+`python -m pstats` or snakeviz.
+
+Sync endpoints run in the threadpool, so the middleware only decides and
+saves; ProfiledRoute switches the profiler on inside the worker thread.
+"""
+import asyncio
+import cProfile
+import functools
+import hmac
+import logging
+import os
+import random
+import re
+import time
+import uuid
+from contextvars import ContextVar
+from typing import Optional
+
+from fastapi.routing import APIRoute
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN", "")
+PROFILE_DIR = os.getenv("PROFILE_DIR", "./profiles")
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "50"))
+
+_current_profile: ContextVar[Optional[cProfile.Profile]] = ContextVar("current_profile", default=None)
+
+
+def _requested_by_header(scope) -> bool:
+    if not PROFILE_TOKEN:
+        return False
+    for name, value in scope.get("headers", []):
+        if name == b"x-profile":
+            return hmac.compare_digest(value.decode("latin-1"), PROFILE_TOKEN)
+    return False
+
+
+def _should_profile(scope) -> bool:
+    if _requested_by_header(scope):
+        return True
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+def _save_profile(profile: cProfile.Profile, filename: str):
+    """
+    Write the profile and drop the oldest files beyond PROFILE_KEEP.
+    """
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    profile.dump_stats(os.path.join(PROFILE_DIR, filename))
+    
+    files = sorted(
+        (os.path.join(PROFILE_DIR, f) for f in os.listdir(PROFILE_DIR) if f.endswith(".prof")),
+        key=os.path.getmtime,
+    )
+    for path in files[:-PROFILE_KEEP] if PROFILE_KEEP > 0 else []:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class ProfilingMiddleware:
+    """
+    Pure ASGI middleware so unprofiled requests pay only the sampling check.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+        
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", scope["path"]).strip("_") or "root"
+        filename = f"{time.strftime('%Y%m%d-%H%M%S')}-{scope['method']}-{slug}-{uuid.uuid4().hex[:6]}.prof"
+        
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"x-profile-id", filename.encode())]
+            await send(message)
+        
+        profile = cProfile.Profile()
+        token = _current_profile.set(profile)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            _current_profile.reset(token)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            await run_in_threadpool(_save_profile, profile, filename)
+            logger.info(f"Profiled {scope['method']} {scope['path']} ({elapsed_ms:.1f} ms) -> {filename}")
+
+
+def _profiled(endpoint):
+    """
+    Wrap a sync endpoint so it runs under the request's profiler, if any.
+    """
+    @functools.wraps(endpoint)
+    def wrapper(*args, **kwargs):
+        profile = _current_profile.get()
+        if profile is None:
+            return endpoint(*args, **kwargs)
+        profile.enable()
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            profile.disable()
+    # include_router() rebuilds routes from the wrapped endpoint; wrap once only
+    wrapper._profiled = True
+    return wrapper
+
+
+class ProfiledRoute(APIRoute):
+    """
+    Route class that makes sync endpoints profilable in their worker thread.
+    """
+    
+    def __init__(self, path: str, endpoint, **kwargs):
+        if not asyncio.iscoroutinefunction(endpoint) and not getattr(endpoint, "_profiled", False):
+            endpoint = _profiled(endpoint)
+        super().__init__(path, endpoint, **kwargs)
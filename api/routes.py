@@ -1,16 +1,145 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import desc, func
 from datetime import datetime, timedelta
-from typing import List
+from typing import List, Optional
+from pydantic import BaseModel, Field
 from sqlalchemy import or_
 
 from database.db import get_db
-from models.article import Article
-from services.scheduler import scrape_and_save_articles
+from database.archive import ArchiveWindowError, article_source
+from database.backup import get_analytics_db
+from api.coalescing import coalesced
+from api.profiling import ProfiledRoute
+from models.article import Article, LOCATION_BIT, LOCATION_BITS, published_hour_for
+from models.briefing import Briefing
+from services.scheduler import scrape_and_save_articles, RUN_SCHEDULER
 from services.classifier import LOCATION_KEYWORDS
+from services.batch_classifier import classify_batch, MAX_CLASSIFY_BATCH
+from services.briefing import BRIEFING_WINDOW_HOURS
+from services.trends import trend_engine, TREND_DIMENSIONS, TREND_MIN_COUNT, TREND_Z_THRESHOLD
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
+
+# Columns the list endpoints can return; `fields=` narrows the selection
+ARTICLE_FIELDS = (
+    "id", "title", "link", "summary", "source", "published_date",
+    "locations", "incident_type", "topic", "is_priority", "priority_reason",
+)
+SEARCH_FIELDS = ("id", "title", "summary", "source", "published_date")
+
+# /api/timeseries bucket sizes in hours, and the columns a series can split on
+TIMESERIES_BUCKETS = {"hour": 1, "day": 24, "week": 7 * 24}
+TIMESERIES_GROUPS = ("topic", "incident_type", "source")
+MAX_TIMESERIES_BUCKETS = 2000
+
+# Location names accepted by the location filter: canonical names and the
+# plain (non-regex) classifier keywords such as 'abuja', case-insensitive
+LOCATION_ALIASES = {
+    **{keyword: name for keyword, name in LOCATION_KEYWORDS.items() if keyword.replace(' ', '').isalpha()},
+    **{name.lower(): name for name in LOCATION_BITS},
+}
+
+# Epoch hour 0 fell on a Thursday; shifting by three days starts weeks on Monday
+WEEK_OFFSET_HOURS = 3 * 24
+
+
+def _article_source(db: Session, cutoff: datetime):
+    """
+    article_source(), with a window too long to read in full as a 400.
+    """
+    try:
+        return article_source(db, cutoff)
+    except ArchiveWindowError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _parse_fields(fields: str, allowed: tuple) -> tuple:
+    """
+    Turn a comma-separated `fields` parameter into a tuple of column names.
+    Returns all allowed fields when the parameter is empty.
+    """
+    if not fields:
+        return allowed
+    
+    selected = tuple(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [f for f in selected if f not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(allowed)}"
+        )
+    return selected or allowed
+
+
+def _location_mask(locations: List[str]) -> int:
+    """
+    Bitmask for location names, given repeated or comma-separated.
+    """
+    mask = 0
+    for value in locations:
+        for name in value.split(","):
+            name = name.strip()
+            if not name:
+                continue
+            canonical = LOCATION_ALIASES.get(name.lower())
+            if canonical is None:
+                raise HTTPException(status_code=422, detail=f"Unknown location: {name} (see /api/locations)")
+            mask |= LOCATION_BIT[canonical]
+    return mask
+
+
+def _article_filters(src, source: str = None, location: List[str] = None, incident_type: str = None,
+                     topic: str = None, priority_only: bool = False, location_match: str = "any") -> list:
+    """
+    The filters shared by the article list and the time series, minus the time window.
+    """
+    filters = []
+    
+    if source:
+        filters.append(src.c.source == source)
+    
+    if location:
+        # Bitwise test on location_mask: exact names, no scan of the text column
+        mask = _location_mask(location)
+        matched = src.c.location_mask.op("&")(mask)
+        filters.append(matched == mask if location_match == "all" else matched != 0)
+    
+    if incident_type:
+        filters.append(src.c.incident_type == incident_type)
+    
+    if topic:  # New filter
+        filters.append(src.c.topic == topic)
+    
+    if priority_only:  # New filter
+        filters.append(src.c.is_priority == True)
+    
+    return filters
+
+
+def _serialize_rows(rows, fields: tuple, summary_length: int = None) -> List[dict]:
+    """
+    Build response dicts straight from selected column tuples.
+    Datetimes are left as-is for orjson to encode; only `locations`
+    (comma-separated in the DB) and truncated summaries need touching.
+    """
+    locations_idx = fields.index("locations") if "locations" in fields else None
+    summary_idx = fields.index("summary") if summary_length and "summary" in fields else None
+    
+    if locations_idx is None and summary_idx is None:
+        return [dict(zip(fields, row)) for row in rows]
+    
+    results = []
+    for row in rows:
+        values = list(row)
+        if locations_idx is not None:
+            locations = values[locations_idx]
+            values[locations_idx] = locations.split(",") if locations else []
+        if summary_idx is not None and values[summary_idx]:
+            values[summary_idx] = values[summary_idx][:summary_length]
+        results.append(dict(zip(fields, values)))
+    return results
 
 
 @router.get("/api/articles", tags=["articles"])
@@ -18,129 +147,100 @@ def get_articles(
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
     source: str = Query(None),
-    location: str = Query(None),
+    location: List[str] = Query(None),  # Repeat or comma-separate for several
+    location_match: str = Query("any", pattern="^(any|all)$"),  # Any of the locations, or all of them
     incident_type: str = Query(None),
     topic: str = Query(None),  # New: filter by topic
     priority_only: bool = Query(False),  # New: show only priority articles (Abuja traffic/security)
     days: int = Query(7, ge=1),
+    fields: str = Query(None),  # Comma-separated subset of ARTICLE_FIELDS
+    summary_length: int = Query(None, ge=1),  # Truncate summaries to this many characters
     db: Session = Depends(get_db)
 ):
     """
     Get filtered articles. Default returns last 7 days.
     Filter by topic, location, source, incident type, and more.
+    Several locations (repeated or comma-separated) match articles that
+    mention any of them, or all of them with location_match=all.
+    Only the requested columns are selected, so no ORM objects are built.
     """
-    query = db.query(Article).filter(
-        Article.published_date >= datetime.utcnow() - timedelta(days=days)
-    )
-    
-    if source:
-        query = query.filter(Article.source == source)
-    
-    if location:
-        query = query.filter(Article.locations.ilike(f"%{location}%"))
+    selected = _parse_fields(fields, ARTICLE_FIELDS)
+    cutoff_date = datetime.utcnow() - timedelta(days=days)
     
-    if incident_type:
-        query = query.filter(Article.incident_type == incident_type)
+    # Hot table, or hot + attached monthly archives when the window reaches back that far
+    src = _article_source(db, cutoff_date)
     
-    if topic:  # New filter
-        query = query.filter(Article.topic == topic)
-    
-    if priority_only:  # New filter
-        query = query.filter(Article.is_priority == True)
+    filters = [src.c.published_date >= cutoff_date] + _article_filters(
+        src, source, location, incident_type, topic, priority_only, location_match
+    )
     
-    total = query.count()
-    articles = query.order_by(desc(Article.published_date)).offset(skip).limit(limit).all()
+    total = db.query(func.count(src.c.id)).filter(*filters).scalar()
+    rows = db.query(
+        *[src.c[name] for name in selected]
+    ).filter(*filters).order_by(desc(src.c.published_date)).offset(skip).limit(limit).all()
     
-    return {
+    return ORJSONResponse({
         "total": total,
         "skip": skip,
         "limit": limit,
-        "articles": [
-            {
-                "id": a.id,
-                "title": a.title,
-                "link": a.link,
-                "summary": a.summary,
-                "source": a.source,
-                "published_date": a.published_date.isoformat() if a.published_date else None,
-                "locations": a.locations.split(",") if a.locations else [],
-                "incident_type": a.incident_type,
-                "topic": a.topic,  # New field
-                "is_priority": a.is_priority,  # New field
-                "priority_reason": a.priority_reason,  # New field
-            }
-            for a in articles
-        ]
-    }
-
+        "articles": _serialize_rows(rows, selected, summary_length),
+    })
 
 
 @router.get("/api/statistics", tags=["analytics"])
+@coalesced("statistics")
 def get_statistics(
     days: int = Query(7, ge=1),
     topic: str = Query(None),  # New: filter by topic
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_analytics_db)
 ):
     """
     Get analytics for the selected period.
     Includes statistics by topic, source, location, and priority articles.
+    Identical concurrent requests share one computation.
+    Read from the latest backup snapshot when SNAPSHOT_READS is on.
     """
     cutoff_date = datetime.utcnow() - timedelta(days=days)
+    src = _article_source(db, cutoff_date)
     
-    base_query = db.query(Article).filter(
-        Article.published_date >= cutoff_date
-    )
-    
-    if topic:
-        base_query = base_query.filter(Article.topic == topic)
+    in_window = [src.c.published_date >= cutoff_date]
+    filters = in_window + ([src.c.topic == topic] if topic else [])
     
-    total_articles = base_query.count()
+    total_articles = db.query(func.count(src.c.id)).filter(*filters).scalar()
     
     # By source
     by_source = db.query(
-        Article.source,
-        func.count(Article.id).label('count')
-    ).filter(
-        Article.published_date >= cutoff_date
-    )
-    if topic:
-        by_source = by_source.filter(Article.topic == topic)
-    by_source = by_source.group_by(Article.source).all()
+        src.c.source,
+        func.count(src.c.id).label('count')
+    ).filter(*filters).group_by(src.c.source).all()
     
     # By topic (NEW)
     by_topic_query = db.query(
-        Article.topic,
-        func.count(Article.id).label('count')
-    ).filter(
-        Article.published_date >= cutoff_date
-    ).group_by(Article.topic).all()
+        src.c.topic,
+        func.count(src.c.id).label('count')
+    ).filter(*in_window).group_by(src.c.topic).all()
     
     # By incident type
     by_incident = db.query(
-        Article.incident_type,
-        func.count(Article.id).label('count')
-    ).filter(
-        Article.published_date >= cutoff_date
-    )
-    if topic:
-        by_incident = by_incident.filter(Article.topic == topic)
-    by_incident = by_incident.group_by(Article.incident_type).all()
+        src.c.incident_type,
+        func.count(src.c.id).label('count')
+    ).filter(*filters).group_by(src.c.incident_type).all()
     
     # Priority articles (Abuja traffic/security)
     priority_articles = db.query(
-        func.count(Article.id)
+        func.count(src.c.id)
     ).filter(
-        Article.is_priority == True,
-        Article.published_date >= cutoff_date
+        src.c.is_priority == True,
+        *in_window
     ).scalar()
     
     # Get top locations
-    articles = base_query.all()
+    location_rows = db.query(src.c.locations).filter(*filters).all()
     
     location_counts = {}
-    for article in articles:
-        if article.locations:
-            for loc in article.locations.split(","):
+    for (locations,) in location_rows:
+        if locations:
+            for loc in locations.split(","):
                 loc = loc.strip()
                 location_counts[loc] = location_counts.get(loc, 0) + 1
     
@@ -158,13 +258,184 @@ def get_statistics(
 
 
 
+@router.get("/api/trends", tags=["analytics"])
+def get_trends(
+    hours: int = Query(24, ge=1, le=72, description="Length of the recent window"),
+    baseline_windows: int = Query(7, ge=1, le=14, description="Earlier windows of the same length to compare with"),
+    group_by: str = Query("location,incident_type", description="Comma-separated: location, incident_type, topic"),
+    location: str = Query(None),
+    incident_type: str = Query(None),
+    topic: str = Query(None),
+    spikes_only: bool = Query(False),
+    min_count: int = Query(TREND_MIN_COUNT, ge=1),
+    z_threshold: float = Query(TREND_Z_THRESHOLD, gt=0),
+    limit: int = Query(50, ge=1, le=500),
+):
+    """
+    Recent counts per group against a rolling baseline, with spike flags.
+    Served from the in-memory trend engine; no database access.
+    """
+    dimensions = _parse_fields(group_by, TREND_DIMENSIONS)
+    try:
+        trends = trend_engine.trends(
+            window_hours=hours,
+            baseline_windows=baseline_windows,
+            group_by=dimensions,
+            location=location,
+            incident_type=incident_type,
+            topic=topic,
+            min_count=min_count,
+            z_threshold=z_threshold,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if spikes_only:
+        trends = [t for t in trends if t["is_spike"]]
+    
+    return ORJSONResponse({
+        "window_hours": hours,
+        "baseline_windows": baseline_windows,
+        "group_by": list(dimensions),
+        "spikes": sum(1 for t in trends if t["is_spike"]),
+        "trends": trends[:limit],
+    })
+
+
+@router.get("/api/timeseries", tags=["analytics"])
+def get_timeseries(
+    bucket: str = Query("day", pattern=f"^({'|'.join(TIMESERIES_BUCKETS)})$"),
+    days: int = Query(7, ge=1),
+    group_by: str = Query(None, pattern=f"^({'|'.join(TIMESERIES_GROUPS)})$"),
+    source: str = Query(None),
+    location: List[str] = Query(None),
+    location_match: str = Query("any", pattern="^(any|all)$"),
+    incident_type: str = Query(None),
+    topic: str = Query(None),
+    priority_only: bool = Query(False),
+    db: Session = Depends(get_analytics_db)
+):
+    """
+    Article counts per hour, day or week (weeks start on Monday, UTC) over
+    the last `days` days, optionally split by topic, incident type or source.
+    Takes the same filters as /api/articles. Series are dense: every bucket
+    is present, with zero counts where nothing was published. The first
+    bucket is widened to start on a bucket boundary. Read from the latest
+    backup snapshot when SNAPSHOT_READS is on.
+    """
+    size = TIMESERIES_BUCKETS[bucket]
+    offset = WEEK_OFFSET_HOURS if bucket == "week" else 0
+    
+    now_hour = published_hour_for(datetime.utcnow())
+    first = (now_hour - days * 24 + 1 + offset) // size
+    last = (now_hour + offset) // size
+    count = last - first + 1
+    if count > MAX_TIMESERIES_BUCKETS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"{count} {bucket} buckets requested; at most {MAX_TIMESERIES_BUCKETS} are allowed"
+        )
+    
+    start_hour = first * size - offset
+    end_hour = (last + 1) * size - offset
+    start = datetime(1970, 1, 1) + timedelta(hours=start_hour)
+    
+    src = _article_source(db, start)
+    bucket_index = ((src.c.published_hour + offset) // size).label("bucket")
+    group_column = src.c[group_by] if group_by else None
+    columns = [bucket_index] + ([group_column] if group_by else [])
+    
+    filters = [
+        src.c.published_hour >= start_hour,
+        src.c.published_hour < end_hour,
+    ] + _article_filters(src, source, location, incident_type, topic, priority_only, location_match)
+    
+    # One grouped scan over the published_hour index
+    rows = db.query(*columns, func.count().label("count")).filter(*filters).group_by(*columns).all()
+    
+    totals = [0] * count
+    series = {}
+    for row in rows:
+        position = row.bucket - first
+        totals[position] += row.count
+        if group_by:
+            key = row[1] or "unknown"
+            series.setdefault(key, [0] * count)[position] += row.count
+    
+    return ORJSONResponse({
+        "bucket": bucket,
+        "days": days,
+        "group_by": group_by,
+        "buckets": [start + timedelta(hours=i * size) for i in range(count)],
+        "totals": totals,
+        "series": sorted(
+            ({"key": key, "total": sum(counts), "counts": counts} for key, counts in series.items()),
+            key=lambda s: s["total"],
+            reverse=True,
+        ),
+    })
+
+
+# (briefing id, document bytes) of the last briefing served by this process
+_briefing_cache = (None, b"")
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
+@router.get("/api/briefing", tags=["analytics"])
+def get_briefing(
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
+    """
+    Priority briefing (Abuja/FCT), grouped by topic and location with repeat
+    reports collapsed. Precomputed after every scrape and served as stored;
+    send If-None-Match with the last ETag to get 304 when nothing changed.
+    """
+    global _briefing_cache
+    latest = db.query(Briefing.id, Briefing.etag, Briefing.generated_at).order_by(Briefing.id.desc()).first()
+    if latest is None:
+        # Not generated yet; the scheduler seeds it at startup and after every scrape
+        return ORJSONResponse(
+            {"window_hours": BRIEFING_WINDOW_HOURS, "article_count": 0, "story_count": 0, "topics": []},
+            headers={"Cache-Control": "no-cache"},
+        )
+    
+    etag = f'"{latest.etag}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "no-cache",
+        "Last-Modified": latest.generated_at.strftime("%a, %d %b %Y %H:%M:%S GMT"),
+    }
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    
+    cached_id, document = _briefing_cache
+    if cached_id != latest.id:
+        row = db.query(Briefing).filter(Briefing.id == latest.id).first()
+        if row is None:
+            # Replaced by a newer briefing in the meantime
+            row = db.query(Briefing).order_by(Briefing.id.desc()).first()
+            headers["ETag"] = f'"{row.etag}"'
+            headers["Last-Modified"] = row.generated_at.strftime("%a, %d %b %Y %H:%M:%S GMT")
+        document = row.document
+        _briefing_cache = (row.id, document)
+    return Response(content=document, media_type="application/json", headers=headers)
+
+
 @router.post("/api/scrape-now", tags=["admin"])
 def trigger_scrape():
     """
     Manually trigger article scraping (useful for testing).
     """
     try:
-        scrape_and_save_articles()
+        # Without the in-process scheduler the article tail publishes new rows
+        scrape_and_save_articles(publish=RUN_SCHEDULER)
         return {"status": "success", "message": "Scraping completed"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -200,10 +471,13 @@ def get_topics(db: Session = Depends(get_db)):
 
 
 @router.get("/api/locations", tags=["metadata"])
-def get_all_locations(db: Session = Depends(get_db)):
+@coalesced("locations")
+def get_all_locations(db: Session = Depends(get_analytics_db)):
     """
     Get list of all Nigerian states and locations.
     Returns all 36 states + FCT from the classifier, not just articles in DB.
+    Identical concurrent requests share one computation.
+    Read from the latest backup snapshot when SNAPSHOT_READS is on.
     """
     # Get all unique states from LOCATION_KEYWORDS
     all_locations = sorted(list(set(LOCATION_KEYWORDS.values())))
@@ -227,27 +501,47 @@ def get_all_locations(db: Session = Depends(get_db)):
 def search_articles(
     q: str = Query(..., min_length=2),
     limit: int = Query(20, le=100),
+    fields: str = Query(None),  # Comma-separated subset of SEARCH_FIELDS
+    summary_length: int = Query(200, ge=1),
     db: Session = Depends(get_db)
 ):
     """Full-text search across title and summary"""
-    query = db.query(Article).filter(
+    selected = _parse_fields(fields, SEARCH_FIELDS)
+    
+    rows = db.query(
+        *[getattr(Article, name) for name in selected]
+    ).filter(
         Article.is_security_related == True,
         or_(
             Article.title.ilike(f"%{q}%"),
             Article.summary.ilike(f"%{q}%")
         )
-    ).order_by(desc(Article.published_date)).limit(limit)
+    ).order_by(desc(Article.published_date)).limit(limit).all()
     
-    return {
+    return ORJSONResponse({
         "query": q,
-        "results": [
-            {
-                "id": a.id,
-                "title": a.title,
-                "summary": a.summary[:200],
-                "source": a.source,
-                "published_date": a.published_date.isoformat()
-            }
-            for a in query.all()
-        ]
-    }
\ No newline at end of file
+        "results": _serialize_rows(rows, selected, summary_length),
+    })
+
+
+
+class ClassifyItem(BaseModel):
+    title: str
+    summary: str = ""
+    source: Optional[str] = None
+
+
+class ClassifyBatchRequest(BaseModel):
+    items: List[ClassifyItem] = Field(..., min_length=1, max_length=MAX_CLASSIFY_BATCH)
+
+
+@router.post("/api/classify/batch", tags=["classification"])
+def classify_articles_batch(request: ClassifyBatchRequest):
+    """
+    Classify up to MAX_CLASSIFY_BATCH title/summary pairs in one call.
+    Results are classify_article() dicts in input order, plus throughput stats.
+    """
+    results, stats = classify_batch(
+        [(item.title, item.summary, item.source) for item in request.items]
+    )
+    return ORJSONResponse({"results": results, "stats": stats})
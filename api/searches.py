@@ -0,0 +1,198 @@
+"""
+Saved searches and their inboxes.
+
+Searches are matched against new articles at ingest time (see
+services.percolator); a search created or changed here applies from the
+next scrape run on. Each search's matches are read newest first from the
+search_matches table, paged by match id, and the read marker turns the
+inbox into an unread count.
+"""
+import logging
+from typing import Dict, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from api.profiling import ProfiledRoute
+from database.db import get_db
+from models.saved_search import SavedSearch, SearchMatch
+from services.percolator import CompiledSearch
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(route_class=ProfiledRoute)
+
+MATCH_FIELDS = ("id", "article_id", "matched_at", "title", "link", "source", "topic", "published_date")
+
+
+class SavedSearchCreate(BaseModel):
+    name: str = Field(..., min_length=1, max_length=100)
+    query: Optional[str] = Field(None, max_length=500)
+    topic: Optional[str] = Field(None, max_length=50)
+    location: Optional[str] = Field(None, max_length=100)
+    incident_type: Optional[str] = Field(None, max_length=100)
+    enabled: bool = True
+
+
+class SavedSearchUpdate(BaseModel):
+    name: Optional[str] = Field(None, min_length=1, max_length=100)
+    query: Optional[str] = Field(None, max_length=500)
+    topic: Optional[str] = Field(None, max_length=50)
+    location: Optional[str] = Field(None, max_length=100)
+    incident_type: Optional[str] = Field(None, max_length=100)
+    enabled: Optional[bool] = None
+
+
+def _validate(search: SavedSearch):
+    if CompiledSearch.from_model(search).is_empty:
+        raise HTTPException(
+            status_code=422,
+            detail="A saved search needs query terms, a topic, a location or an incident type",
+        )
+
+
+def _get_search(db: Session, search_id: int) -> SavedSearch:
+    search = db.get(SavedSearch, search_id)
+    if search is None:
+        raise HTTPException(status_code=404, detail=f"Unknown saved search: {search_id}")
+    return search
+
+
+def _unread_counts(db: Session, search_id: int = None) -> Dict[int, int]:
+    query = db.query(SearchMatch.search_id, func.count(SearchMatch.id)).join(
+        SavedSearch, SavedSearch.id == SearchMatch.search_id
+    ).filter(SearchMatch.id > SavedSearch.last_read_match_id)
+    if search_id is not None:
+        query = query.filter(SearchMatch.search_id == search_id)
+    return dict(query.group_by(SearchMatch.search_id).all())
+
+
+def search_status(search: SavedSearch, unread: int = 0) -> Dict:
+    return {
+        "id": search.id,
+        "name": search.name,
+        "query": search.query,
+        "topic": search.topic,
+        "location": search.location,
+        "incident_type": search.incident_type,
+        "enabled": search.enabled,
+        "created_at": search.created_at.isoformat() if search.created_at else None,
+        "last_read_match_id": search.last_read_match_id,
+        "unread": unread,
+    }
+
+
+@router.get("/api/saved-searches", tags=["saved-searches"])
+def list_saved_searches(db: Session = Depends(get_db)):
+    """
+    All saved searches with their unread match counts.
+    """
+    searches = db.query(SavedSearch).order_by(SavedSearch.id).all()
+    unread = _unread_counts(db)
+    return {"searches": [search_status(s, unread.get(s.id, 0)) for s in searches]}
+
+
+@router.post("/api/saved-searches", tags=["saved-searches"], status_code=201)
+def create_saved_search(request: SavedSearchCreate, db: Session = Depends(get_db)):
+    """
+    Save a search. Every query word, "quoted phrase" and prefix* term must
+    appear in an article's title or summary, and topic, location and
+    incident type must equal the article's when given.
+    """
+    search = SavedSearch(**request.model_dump())
+    _validate(search)
+    db.add(search)
+    db.commit()
+    logger.info(f"Saved search {search.id} created: {search.name}")
+    return search_status(search)
+
+
+@router.get("/api/saved-searches/{search_id}", tags=["saved-searches"])
+def get_saved_search(search_id: int, db: Session = Depends(get_db)):
+    search = _get_search(db, search_id)
+    return search_status(search, _unread_counts(db, search_id).get(search_id, 0))
+
+
+@router.patch("/api/saved-searches/{search_id}", tags=["saved-searches"])
+def update_saved_search(search_id: int, update: SavedSearchUpdate, db: Session = Depends(get_db)):
+    """
+    Change a saved search; fields left out keep their value.
+    """
+    search = _get_search(db, search_id)
+    for field, value in update.model_dump(exclude_unset=True).items():
+        setattr(search, field, value)
+    _validate(search)
+    db.commit()
+    return search_status(search, _unread_counts(db, search_id).get(search_id, 0))
+
+
+@router.delete("/api/saved-searches/{search_id}", tags=["saved-searches"], status_code=204)
+def delete_saved_search(search_id: int, db: Session = Depends(get_db)):
+    """
+    Delete a saved search and its inbox.
+    """
+    search = _get_search(db, search_id)
+    db.query(SearchMatch).filter(SearchMatch.search_id == search_id).delete(synchronize_session=False)
+    db.delete(search)
+    db.commit()
+    logger.info(f"Saved search {search_id} deleted")
+
+
+@router.get("/api/saved-searches/{search_id}/matches", tags=["saved-searches"])
+def get_search_matches(
+    search_id: int,
+    before_id: int = Query(None, ge=1),  # Older page: matches with a lower id
+    after_id: int = Query(None, ge=0),   # Polling: only matches newer than this id
+    unread_only: bool = False,
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db)
+):
+    """
+    A saved search's matches, newest first. Page back with
+    before_id=next_before_id.
+    """
+    search = _get_search(db, search_id)
+    
+    query = db.query(*[getattr(SearchMatch, name) for name in MATCH_FIELDS]).filter(
+        SearchMatch.search_id == search_id
+    )
+    if before_id is not None:
+        query = query.filter(SearchMatch.id < before_id)
+    lower = max(after_id or 0, search.last_read_match_id if unread_only else 0)
+    if lower:
+        query = query.filter(SearchMatch.id > lower)
+    rows = query.order_by(SearchMatch.id.desc()).limit(limit).all()
+    
+    matches = []
+    for row in rows:
+        match = dict(zip(MATCH_FIELDS, row))
+        match["matched_at"] = match["matched_at"].isoformat() if match["matched_at"] else None
+        match["published_date"] = match["published_date"].isoformat() if match["published_date"] else None
+        match["unread"] = match["id"] > search.last_read_match_id
+        matches.append(match)
+    
+    return ORJSONResponse({
+        "search_id": search_id,
+        "matches": matches,
+        "next_before_id": matches[-1]["id"] if len(matches) == limit else None,
+    })
+
+
+@router.post("/api/saved-searches/{search_id}/read", tags=["saved-searches"])
+def mark_search_read(
+    search_id: int,
+    up_to_id: int = Query(None, ge=0),  # Defaults to the newest match
+    db: Session = Depends(get_db)
+):
+    """
+    Mark the inbox read up to a match id.
+    """
+    search = _get_search(db, search_id)
+    if up_to_id is None:
+        up_to_id = db.query(func.max(SearchMatch.id)).filter(SearchMatch.search_id == search_id).scalar() or 0
+    search.last_read_match_id = max(search.last_read_match_id, up_to_id)
+    db.commit()
+    return search_status(search, _unread_counts(db, search_id).get(search_id, 0))
@@ -0,0 +1,104 @@
+import asyncio
+import logging
+
+import orjson
+from fastapi import APIRouter, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import desc
+from starlette.concurrency import run_in_threadpool
+
+from database.db import SessionLocal
+from models.article import Article, location_mask_for
+from services.events import ArticleFilter, article_event, broadcaster
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+HEARTBEAT_SECONDS = 15
+REPLAY_LIMIT = 500
+
+
+def _replay_since(last_event_id: int, article_filter: ArticleFilter) -> list:
+    """
+    Articles saved after last_event_id that match the filter, oldest first.
+    """
+    db = SessionLocal()
+    try:
+        query = db.query(Article).filter(Article.id > last_event_id)
+        if article_filter.topic:
+            query = query.filter(Article.topic == article_filter.topic)
+        if article_filter.location:
+            mask = location_mask_for(article_filter.location)
+            query = query.filter(Article.location_mask.op("&")(mask) != 0)
+        if article_filter.priority_only:
+            query = query.filter(Article.is_priority == True)
+        
+        # Newest REPLAY_LIMIT rows, sent oldest first
+        articles = query.order_by(desc(Article.id)).limit(REPLAY_LIMIT).all()
+        events = [article_event(a) for a in reversed(articles)]
+        return [e for e in events if article_filter.matches(e)]
+    finally:
+        db.close()
+
+
+def _format_event(event: dict) -> bytes:
+    return b"id: %d\nevent: article\ndata: %s\n\n" % (event["id"], orjson.dumps(event))
+
+
+@router.get("/api/stream/articles", tags=["articles"])
+async def stream_articles(
+    request: Request,
+    topic: str = Query(None),
+    location: str = Query(None),
+    priority_only: bool = Query(False),
+    last_event_id: str = Header(None),  # Sent by EventSource on reconnect
+):
+    """
+    Server-Sent Events stream of newly saved articles matching the filter.
+    Event ids are article ids; reconnecting with Last-Event-ID replays
+    anything saved in between.
+    """
+    article_filter = ArticleFilter(topic=topic, location=location, priority_only=priority_only)
+    
+    # Subscribe before replaying so nothing saved during the replay is missed
+    subscription = broadcaster.subscribe(article_filter)
+    if subscription is None:
+        raise HTTPException(status_code=503, detail="Too many stream clients")
+    
+    last_sent = int(last_event_id) if last_event_id and last_event_id.isdigit() else None
+    
+    async def event_stream():
+        nonlocal last_sent
+        try:
+            yield b"retry: 5000\n\n"
+            
+            if last_sent is not None:
+                for event in await run_in_threadpool(_replay_since, last_sent, article_filter):
+                    yield _format_event(event)
+                    last_sent = event["id"]
+            
+            while not subscription.overflowed:
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), timeout=HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield b": keep-alive\n\n"
+                    continue
+                
+                if last_sent is not None and event["id"] <= last_sent:
+                    continue
+                yield _format_event(event)
+                last_sent = event["id"]
+            
+            if subscription.overflowed:
+                logger.info("Stream client fell behind; closing so it resumes with Last-Event-ID")
+        finally:
+            broadcaster.unsubscribe(subscription)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,227 @@
+"""
+Hot/cold storage tiering.
+
+Articles older than ARCHIVE_AFTER_DAYS move out of the hot database into one
+SQLite file per month under ARCHIVE_DIR. Queries whose `days` window reaches
+past the hot tier attach the months they need with ATTACH DATABASE and read
+through a UNION ALL over the hot table and the attached archive tables.
+
+The link_hash of every archived article stays behind in the hot
+archived_links table, so ingestion dedupe needs no archive attached.
+"""
+from datetime import datetime, timedelta
+from typing import List, Tuple
+import logging
+import os
+import re
+
+from sqlalchemy import MetaData, Table, delete, exists, func, insert, select, text, union_all
+from sqlalchemy.orm import Session
+
+from database.db import engine
+from database.maintenance import run_database_maintenance
+from database.migrations import migrate_schema
+from models.article import ArchivedLink, Article, ArticleBody
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "90"))
+ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", "./archive")
+
+# SQLite allows 10 attached databases per connection by default
+MAX_ATTACHED_ARCHIVES = 9
+
+_ARCHIVE_FILE = re.compile(r"^articles_(\d{4})_(\d{2})\.db$")
+_archive_metadata = MetaData()
+
+
+class ArchiveWindowError(ValueError):
+    """Raised when a window needs more archive months than can be attached."""
+
+
+def archive_path(year: int, month: int) -> str:
+    return os.path.join(ARCHIVE_DIR, f"articles_{year:04d}_{month:02d}.db")
+
+
+def archive_schema(year: int, month: int) -> str:
+    return f"archive_{year:04d}_{month:02d}"
+
+
+def archive_table(year: int, month: int) -> Table:
+    """
+    The articles table as it appears inside an attached monthly archive.
+    """
+    key = f"{archive_schema(year, month)}.articles"
+    if key not in _archive_metadata.tables:
+        Article.__table__.to_metadata(_archive_metadata, schema=archive_schema(year, month))
+    return _archive_metadata.tables[key]
+
+
+def month_bounds(year: int, month: int) -> Tuple[datetime, datetime]:
+    start = datetime(year, month, 1)
+    end = datetime(year + 1, 1, 1) if month == 12 else datetime(year, month + 1, 1)
+    return start, end
+
+
+def list_archives() -> List[Tuple[int, int]]:
+    """
+    Return (year, month) for every archive file on disk, oldest first.
+    """
+    if not os.path.isdir(ARCHIVE_DIR):
+        return []
+    months = []
+    for name in os.listdir(ARCHIVE_DIR):
+        match = _ARCHIVE_FILE.match(name)
+        if match:
+            months.append((int(match.group(1)), int(match.group(2))))
+    return sorted(months)
+
+
+def archives_for_window(cutoff: datetime) -> List[Tuple[int, int]]:
+    """
+    Archive months that may hold articles published on or after cutoff.
+    """
+    return [(y, m) for y, m in list_archives() if month_bounds(y, m)[1] > cutoff]
+
+
+def attach_archives(connection, months: List[Tuple[int, int]]):
+    """
+    Make sure the given archive months are attached to this connection.
+    Archives no longer needed are detached first to stay under SQLite's limit.
+    """
+    attached = {row[1] for row in connection.execute(text("PRAGMA database_list"))}
+    wanted = {archive_schema(y, m): (y, m) for y, m in months}
+    
+    for name in attached:
+        if name.startswith("archive_") and name not in wanted:
+            connection.execute(text(f"DETACH DATABASE {name}"))
+    
+    for name, (year, month) in wanted.items():
+        if name not in attached:
+            connection.execute(
+                text(f"ATTACH DATABASE :path AS {name}"),
+                {"path": archive_path(year, month)}
+            )
+
+
+def article_source(db: Session, cutoff: datetime):
+    """
+    Selectable to read articles from for a window starting at cutoff.
+    Returns the plain hot table when no archive overlaps the window,
+    otherwise a UNION ALL over the hot table and the attached months.
+    Raises ArchiveWindowError when that takes more than
+    MAX_ATTACHED_ARCHIVES months.
+    On a backup snapshot (session.info["snapshot"]) archive rows whose
+    link is still in the snapshot's hot table are left out.
+    """
+    months = archives_for_window(cutoff)
+    if not months:
+        return Article.__table__
+    
+    if len(months) > MAX_ATTACHED_ARCHIVES:
+        # Reading only some of the months would return silently partial results
+        year, month = months[-MAX_ATTACHED_ARCHIVES]
+        oldest = month_bounds(year, month)[0]
+        raise ArchiveWindowError(
+            f"The window reaches {len(months)} archived months, but at most "
+            f"{MAX_ATTACHED_ARCHIVES} can be read at once (back to {oldest:%Y-%m-%d}, "
+            f"days={(datetime.utcnow() - oldest).days})"
+        )
+    
+    attach_archives(db.connection(), months)
+    
+    hot = Article.__table__
+    columns = hot.c.keys()
+    selects = [select(*[hot.c[name] for name in columns])]
+    for year, month in months:
+        archived = archive_table(year, month)
+        archived_select = select(*[archived.c[name] for name in columns])
+        if db.info.get("snapshot"):
+            # A snapshot's hot table still holds the rows archived since it was taken
+            archived_select = archived_select.where(
+                ~exists().where(hot.c.link_hash == archived.c.link_hash)
+            )
+        selects.append(archived_select)
+    return union_all(*selects).subquery("articles")
+
+
+def archive_old_articles(older_than_days: int = ARCHIVE_AFTER_DAYS) -> int:
+    """
+    Move articles published before the retention cutoff into their monthly
+    archive files. Each month is copied and deleted in its own transaction.
+    Returns the number of articles moved.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    hot = Article.__table__
+    moved = 0
+    
+    os.makedirs(ARCHIVE_DIR, exist_ok=True)
+    
+    with engine.connect() as conn:
+        months = conn.execute(
+            select(func.strftime('%Y-%m', hot.c.published_date))
+            .where(hot.c.published_date < cutoff)
+            .distinct()
+        ).scalars().all()
+        months = sorted(tuple(int(part) for part in m.split('-')) for m in months if m)
+        
+        for year, month in months:
+            start, end = month_bounds(year, month)
+            window = (
+                hot.c.published_date >= start,
+                hot.c.published_date < min(end, cutoff),
+            )
+            schema = archive_schema(year, month)
+            archived = archive_table(year, month)
+            columns = hot.c.keys()
+            
+            conn.execute(
+                text(f"ATTACH DATABASE :path AS {schema}"),
+                {"path": archive_path(year, month)}
+            )
+            try:
+                archived.create(conn, checkfirst=True)
+                migrate_schema(conn, schema)
+                conn.commit()
+                
+                conn.execute(
+                    insert(archived).prefix_with("OR IGNORE").from_select(
+                        columns, select(*[hot.c[name] for name in columns]).where(*window)
+                    )
+                )
+                # Remember the moved links so feeds that still list them are not re-ingested
+                conn.execute(
+                    insert(ArchivedLink.__table__).prefix_with("OR IGNORE").from_select(
+                        ["link_hash"], select(hot.c.link_hash).where(*window, hot.c.link_hash.isnot(None))
+                    )
+                )
+                # Page text is enrichment for the hot tier only and is not archived
+                bodies = ArticleBody.__table__
+                conn.execute(delete(bodies).where(
+                    bodies.c.article_id.in_(select(hot.c.id).where(*window))
+                ))
+                count = conn.execute(delete(hot).where(*window)).rowcount
+                conn.commit()
+                moved += count
+                logger.info(f"Archived {count} articles into {archive_path(year, month)}")
+            except Exception as e:
+                conn.rollback()
+                logger.error(f"Error archiving {year}-{month:02d}: {e}")
+            finally:
+                conn.execute(text(f"DETACH DATABASE {schema}"))
+    
+    return moved
+
+
+def run_storage_maintenance():
+    """
+    Scheduled maintenance: archive cold articles, then release the freed
+    pages and refresh planner statistics so the hot database and its
+    indexes stay small and well planned.
+    """
+    try:
+        moved = archive_old_articles()
+        run_database_maintenance()
+        logger.info(f"Storage maintenance completed. Archived {moved} articles")
+    except Exception as e:
+        logger.error(f"Error in storage maintenance: {e}")
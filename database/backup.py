@@ -0,0 +1,213 @@
+"""
+Online backups of the hot database and read-only snapshot serving.
+
+backup_database() copies the live database with SQLite's online backup
+API, BACKUP_PAGES_PER_STEP pages at a time with BACKUP_STEP_SLEEP_SECONDS
+between steps. A file copy taken during a commit can be torn; the backup
+API always produces a consistent database, and the source is only read
+for the length of one step, so the ingestion writer never waits long. If
+another connection writes mid-backup, SQLite restarts the copy from the
+first page, so backups are scheduled away from the scrape times.
+
+The copy is written to a temporary file, switched out of WAL mode,
+quick-checked and then renamed into BACKUP_DIR, so a half-written file
+is never mistaken for a backup. The newest BACKUP_KEEP files are kept.
+Monthly archive files are not included; they only change when the
+nightly job archives a month.
+
+With SNAPSHOT_READS=true the analytics endpoints read from the newest
+backup through a read-only engine (get_analytics_db), keeping their
+full-window scans off the live database. The data is then as old as the
+last backup. Without a backup they fall back to the live database. The
+archive files are read live, so rows archived after the backup was taken
+are read from the snapshot's hot table only (see article_source).
+
+Take a backup by hand (from the project root):
+    python -m database.backup
+Restore by stopping the API and worker and copying a backup over
+news_platform.db (removing any -wal/-shm files next to it).
+"""
+from datetime import datetime
+from typing import List, Optional
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database.db import SessionLocal, engine
+from database.query_log import install_slow_query_logging
+
+logger = logging.getLogger(__name__)
+
+BACKUP_DIR = os.getenv("BACKUP_DIR", "./backups")
+BACKUP_KEEP = int(os.getenv("BACKUP_KEEP", "7"))
+BACKUP_PAGES_PER_STEP = int(os.getenv("BACKUP_PAGES_PER_STEP", "256"))
+BACKUP_STEP_SLEEP_SECONDS = float(os.getenv("BACKUP_STEP_SLEEP_SECONDS", "0.05"))
+
+# Serve analytics endpoints from the newest backup instead of the live database
+SNAPSHOT_READS = os.getenv("SNAPSHOT_READS", "false").lower() == "true"
+# How often the API looks for a newer backup to read from
+SNAPSHOT_CHECK_SECONDS = float(os.getenv("SNAPSHOT_CHECK_SECONDS", "60"))
+
+_BACKUP_FILE = re.compile(r"^news_platform-(\d{8}-\d{6})\.db$")
+
+
+def list_backups() -> List[str]:
+    """
+    Paths of the backups in BACKUP_DIR, oldest first.
+    """
+    if not os.path.isdir(BACKUP_DIR):
+        return []
+    names = sorted(name for name in os.listdir(BACKUP_DIR) if _BACKUP_FILE.match(name))
+    return [os.path.join(BACKUP_DIR, name) for name in names]
+
+
+def latest_backup() -> Optional[str]:
+    backups = list_backups()
+    return backups[-1] if backups else None
+
+
+def rotate_backups(keep: int = BACKUP_KEEP) -> List[str]:
+    """
+    Delete all but the newest `keep` backups. Returns the deleted paths.
+    """
+    backups = list_backups()
+    expired = backups[:-keep] if keep > 0 else []
+    for path in expired:
+        os.remove(path)
+    return expired
+
+
+def backup_database(pages: int = BACKUP_PAGES_PER_STEP, sleep: float = BACKUP_STEP_SLEEP_SECONDS) -> Optional[str]:
+    """
+    Copy the live database into a new file in BACKUP_DIR and return its
+    path, or None when the database is not SQLite.
+    """
+    if engine.dialect.name != "sqlite":
+        logger.warning(f"Online backup needs SQLite, not {engine.dialect.name}")
+        return None
+    
+    os.makedirs(BACKUP_DIR, exist_ok=True)
+    path = os.path.join(BACKUP_DIR, f"news_platform-{datetime.utcnow():%Y%m%d-%H%M%S}.db")
+    partial = path + ".partial"
+    steps = 0
+    
+    def progress(status, remaining, total):
+        nonlocal steps
+        steps += 1
+    
+    started = time.perf_counter()
+    source = engine.raw_connection()
+    target = sqlite3.connect(partial)
+    try:
+        source.driver_connection.backup(target, pages=pages, progress=progress, sleep=sleep)
+        # A standalone file: no -wal/-shm needed to open it, even read-only
+        target.execute("PRAGMA journal_mode=DELETE")
+        check = target.execute("PRAGMA quick_check").fetchone()[0]
+        if check != "ok":
+            raise sqlite3.DatabaseError(f"Backup failed quick_check: {check}")
+    except Exception:
+        target.close()
+        os.remove(partial)
+        raise
+    finally:
+        source.close()
+    target.close()
+    os.replace(partial, path)
+    
+    logger.info(
+        f"Backed up database to {path} ({os.path.getsize(path)} bytes, {steps} steps) "
+        f"in {time.perf_counter() - started:.1f}s"
+    )
+    return path
+
+
+def run_backup():
+    """
+    Scheduled job: back up, then rotate old backups.
+    """
+    try:
+        path = backup_database()
+        if path:
+            expired = rotate_backups()
+            if expired:
+                logger.info(f"Removed {len(expired)} old backups")
+    except Exception as e:
+        logger.error(f"Error backing up database: {e}")
+
+
+class SnapshotReader:
+    """
+    Read-only engine over the newest backup, switched when a newer one
+    appears (checked at most every SNAPSHOT_CHECK_SECONDS).
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._path = None
+        self._engine = None
+        self._sessionmaker = None
+        self._checked_at = 0.0
+    
+    def _refresh(self):
+        path = latest_backup()
+        if path == self._path:
+            return
+        old = self._engine
+        if path is None:
+            self._engine = self._sessionmaker = None
+        else:
+            self._engine = create_engine(
+                f"sqlite:///file:{os.path.abspath(path)}?mode=ro&uri=true",
+                connect_args={"check_same_thread": False},
+            )
+            install_slow_query_logging(self._engine)
+            # Marked so article_source() does not count rows archived since twice
+            self._sessionmaker = sessionmaker(
+                autocommit=False, autoflush=False, bind=self._engine, info={"snapshot": True}
+            )
+            logger.info(f"Serving analytics from snapshot {path}")
+        self._path = path
+        if old is not None:
+            # Sessions still open on the old engine keep their connections
+            old.dispose(close=False)
+    
+    def session(self):
+        """
+        A session on the current snapshot, or None when there is none.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now - self._checked_at >= SNAPSHOT_CHECK_SECONDS:
+                self._checked_at = now
+                self._refresh()
+            return self._sessionmaker() if self._sessionmaker else None
+
+
+snapshot_reader = SnapshotReader()
+
+
+def get_analytics_db():
+    """
+    Dependency for read-only analytics endpoints: the newest snapshot when
+    SNAPSHOT_READS is on and a backup exists, otherwise the live database.
+    """
+    db = snapshot_reader.session() if SNAPSHOT_READS else None
+    if db is None:
+        db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    print(backup_database())
+    for expired_path in rotate_backups():
+        print(f"Removed {expired_path}")
@@ -1,15 +1,30 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 import os
 
+from database.query_log import install_slow_query_logging
+
 # Using SQLite for cost-free local storage
-DATABASE_URL = "sqlite:///./news_platform.db"
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./news_platform.db")
 
 engine = create_engine(
     DATABASE_URL, 
     connect_args={"check_same_thread": False}
 )
 
+install_slow_query_logging(engine)
+
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine, "connect")
+    def _sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        # Only takes effect on a new, empty file; see database.maintenance
+        cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        # WAL lets the API keep reading while the ingestion worker writes
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA busy_timeout=5000")
+        cursor.close()
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 def get_db():
@@ -20,5 +35,18 @@ def get_db():
         db.close()
 
 def init_db():
+    """
+    Create and migrate the schema unless the database is already stamped
+    with the current schema version, so a warm boot skips create_all.
+    """
+    from database.migrations import SCHEMA_VERSION, get_schema_version, set_schema_version, run_migrations
+    if get_schema_version() == SCHEMA_VERSION:
+        return
+    
     from models.article import Base
+    from models.feed import Feed  # registers the feeds table
+    from models.saved_search import SavedSearch, SearchMatch  # and the saved-search tables
+    from models.briefing import Briefing
     Base.metadata.create_all(bind=engine)
+    run_migrations()
+    set_schema_version(SCHEMA_VERSION)
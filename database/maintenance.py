@@ -0,0 +1,194 @@
+"""
+SQLite diagnostics and planner/storage maintenance.
+
+Reports per-table and per-index page counts (the dbstat virtual table),
+freelist size, integrity check results and planner statistics, and keeps
+the database in shape: PRAGMA optimize (or a full ANALYZE the first time)
+refreshes the statistics the query planner uses to choose indexes, and
+incremental VACUUM returns free pages to the filesystem a batch at a time
+instead of rewriting the whole file.
+
+Incremental VACUUM needs auto_vacuum=INCREMENTAL. New databases get it from
+the connect hook in database.db; an existing file is converted once with a
+full VACUUM by the scheduled job (or scripts/db_maintenance.py vacuum
+--enable-incremental).
+
+Used by the nightly storage job and by scripts/db_maintenance.py.
+"""
+from typing import Dict, List, Optional
+import logging
+import os
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from database.db import engine
+
+logger = logging.getLogger(__name__)
+
+# Free pages released per scheduled run; 0 releases all of them
+MAINTENANCE_VACUUM_PAGES = int(os.getenv("MAINTENANCE_VACUUM_PAGES", "0"))
+
+# Rows sampled per index by ANALYZE / PRAGMA optimize; 0 scans everything
+ANALYSIS_LIMIT = int(os.getenv("ANALYSIS_LIMIT", "1000"))
+
+AUTO_VACUUM_MODES = {0: "none", 1: "full", 2: "incremental"}
+
+
+def _pragma(conn, name: str, schema: str = "main"):
+    return conn.execute(text(f"PRAGMA {schema}.{name}")).scalar()
+
+
+def _run_to_completion(conn, statement: str):
+    # incremental_vacuum does one page per step and returns column-less rows,
+    # so cursor.execute() stops after one; executescript() runs it to the end
+    conn.connection.dbapi_connection.executescript(statement)
+
+
+def page_stats(conn, schema: str = "main") -> Dict:
+    """
+    File size, page counts, freelist size and auto_vacuum mode.
+    """
+    page_size = _pragma(conn, "page_size", schema)
+    page_count = _pragma(conn, "page_count", schema)
+    freelist_count = _pragma(conn, "freelist_count", schema)
+    return {
+        "page_size": page_size,
+        "page_count": page_count,
+        "size_bytes": page_size * page_count,
+        "freelist_count": freelist_count,
+        "free_ratio": round(freelist_count / page_count, 4) if page_count else 0.0,
+        "auto_vacuum": AUTO_VACUUM_MODES.get(_pragma(conn, "auto_vacuum", schema), "unknown"),
+    }
+
+
+def object_sizes(conn, schema: str = "main") -> List[Dict]:
+    """
+    Pages, bytes and unused bytes per table and index, largest first.
+    Empty when SQLite was built without the dbstat virtual table.
+    """
+    try:
+        rows = conn.execute(text(
+            f"SELECT s.name, m.type, m.tbl_name, COUNT(*) AS pages, "
+            f"SUM(s.pgsize) AS bytes, SUM(s.unused) AS unused "
+            f"FROM dbstat('{schema}') AS s LEFT JOIN {schema}.sqlite_schema AS m ON m.name = s.name "
+            f"GROUP BY s.name ORDER BY bytes DESC"
+        )).all()
+    except OperationalError as e:
+        logger.warning(f"dbstat is not available in this SQLite build: {e}")
+        return []
+    
+    return [
+        {
+            "name": row.name,
+            # Internal tables (sqlite_schema itself, autoindexes) have no row of their own
+            "type": row.type or ("index" if row.name.startswith("sqlite_autoindex") else "table"),
+            "table": row.tbl_name or row.name,
+            "pages": row.pages,
+            "bytes": row.bytes,
+            "unused_bytes": row.unused,
+        }
+        for row in rows
+    ]
+
+
+def integrity_check(conn, schema: str = "main", quick: bool = False) -> List[str]:
+    """
+    Problems found by PRAGMA integrity_check (or quick_check), ['ok'] when none.
+    """
+    pragma = "quick_check" if quick else "integrity_check"
+    return [row[0] for row in conn.execute(text(f"PRAGMA {schema}.{pragma}"))]
+
+
+def planner_statistics(conn, schema: str = "main") -> Dict:
+    """
+    Which indexes have ANALYZE statistics (sqlite_stat1) and which do not.
+    """
+    indexes = [
+        row.name for row in conn.execute(text(
+            f"SELECT name FROM {schema}.sqlite_schema WHERE type = 'index' ORDER BY name"
+        ))
+    ]
+    has_stat1 = conn.execute(text(
+        f"SELECT 1 FROM {schema}.sqlite_schema WHERE name = 'sqlite_stat1'"
+    )).first() is not None
+    stats = {}
+    if has_stat1:
+        stats = {
+            row.idx: row.stat
+            for row in conn.execute(text(f"SELECT idx, stat FROM {schema}.sqlite_stat1 WHERE idx IS NOT NULL"))
+        }
+    return {
+        "analyzed": has_stat1,
+        "indexes": stats,
+        "missing": [name for name in indexes if name not in stats],
+    }
+
+
+def analyze(conn, full: bool = False, schema: str = "main"):
+    """
+    Refresh planner statistics: a full ANALYZE, or PRAGMA optimize, which
+    only re-analyzes tables whose statistics look stale.
+    """
+    if ANALYSIS_LIMIT:
+        conn.execute(text(f"PRAGMA analysis_limit = {int(ANALYSIS_LIMIT)}"))
+    if full:
+        conn.execute(text(f"ANALYZE {schema}"))
+    else:
+        _run_to_completion(conn, f"PRAGMA {schema}.optimize")
+
+
+def incremental_vacuum(conn, pages: int = 0, schema: str = "main") -> int:
+    """
+    Release up to `pages` free pages (all when 0). Returns how many were
+    released; 0 unless auto_vacuum is INCREMENTAL.
+    """
+    if _pragma(conn, "auto_vacuum", schema) != 2:
+        return 0
+    before = _pragma(conn, "freelist_count", schema)
+    _run_to_completion(conn, f"PRAGMA {schema}.incremental_vacuum({int(pages)})")
+    return before - _pragma(conn, "freelist_count", schema)
+
+
+def enable_incremental_vacuum(conn, schema: str = "main"):
+    """
+    Switch an existing database to auto_vacuum=INCREMENTAL. Rewrites the
+    whole file with VACUUM, so it needs an autocommit connection.
+    """
+    conn.execute(text(f"PRAGMA {schema}.auto_vacuum = INCREMENTAL"))
+    conn.execute(text(f"VACUUM {schema}"))
+
+
+def run_database_maintenance(vacuum_pages: int = MAINTENANCE_VACUUM_PAGES) -> Optional[Dict]:
+    """
+    Scheduled maintenance for the hot database: release free pages
+    (converting the file to incremental auto_vacuum the first time), then
+    refresh planner statistics. Returns what was done.
+    """
+    if engine.dialect.name != "sqlite":
+        return None
+    
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        before = page_stats(conn)
+        converted = False
+        if before["auto_vacuum"] != "incremental":
+            enable_incremental_vacuum(conn)
+            converted = True
+            freed = before["freelist_count"]
+        else:
+            freed = incremental_vacuum(conn, vacuum_pages)
+        
+        analyzed = planner_statistics(conn)["analyzed"]
+        analyze(conn, full=not analyzed)
+        
+        after = page_stats(conn)
+    
+    summary = {
+        "converted_to_incremental": converted,
+        "pages_freed": freed,
+        "full_analyze": not analyzed,
+        "size_bytes_before": before["size_bytes"],
+        "size_bytes_after": after["size_bytes"],
+    }
+    logger.info(f"Database maintenance: {summary}")
+    return summary
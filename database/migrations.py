@@ -0,0 +1,316 @@
+"""
+Idempotent schema migrations, run by init_db() when the stored schema
+version (SQLite's PRAGMA user_version) differs from SCHEMA_VERSION.
+
+create_all() only creates missing tables, so columns added to the models
+after a database was created are added here with ALTER TABLE, followed by
+any data backfills. The same steps run on the hot database and on every
+monthly archive file, which must keep the hot table's column set for the
+UNION ALL reads. Every step is a no-op once applied.
+
+Bump SCHEMA_VERSION with every model or migration change; a database
+already at the current version boots without touching the schema.
+
+Run manually (from the project root):
+    python -m database.migrations
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+import logging
+
+from sqlalchemy import Table, text
+
+from database.db import engine
+from models.article import Article, location_mask_for, published_hour_for
+from scrapers.links import canonicalize_url, link_hash
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 7
+
+
+def get_schema_version() -> Optional[int]:
+    """
+    The version stamped on the database, or None when it cannot be tracked.
+    """
+    if engine.dialect.name != "sqlite":
+        return None
+    with engine.connect() as conn:
+        return conn.execute(text("PRAGMA user_version")).scalar()
+
+
+def set_schema_version(version: int = SCHEMA_VERSION):
+    if engine.dialect.name == "sqlite":
+        with engine.begin() as conn:
+            conn.execute(text(f"PRAGMA user_version = {int(version)}"))
+
+
+def add_missing_columns(conn, table: Table, schema: str = "main") -> List[str]:
+    """
+    ALTER TABLE ADD COLUMN for every model column the stored table lacks.
+    """
+    existing = {row[1] for row in conn.execute(text(f"PRAGMA {schema}.table_info({table.name})"))}
+    if not existing:
+        return []
+    
+    added = []
+    for column in table.columns:
+        if column.name not in existing:
+            column_type = column.type.compile(dialect=conn.dialect)
+            conn.execute(text(f"ALTER TABLE {schema}.{table.name} ADD COLUMN {column.name} {column_type}"))
+            added.append(column.name)
+    return added
+
+
+def _merge_locations(*values) -> str:
+    merged = []
+    for value in values:
+        for location in (value or '').split(','):
+            if location and location not in merged:
+                merged.append(location)
+    return ','.join(merged)
+
+
+def backfill_link_hashes(conn, schema: str = "main") -> Tuple[int, int]:
+    """
+    Canonicalize links and fill link_hash for rows that lack it.
+    Rows whose links canonicalize to the same story are merged into the
+    oldest one (or the one already holding the hash): priority and security
+    flags are OR-ed, locations unioned, and the duplicates deleted.
+    Returns (rows hashed, duplicates removed).
+    """
+    columns = "id, link, link_hash, locations, is_security_related, is_priority, priority_reason"
+    rows = conn.execute(text(
+        f"SELECT {columns} FROM {schema}.articles WHERE link_hash IS NULL ORDER BY id"
+    )).all()
+    if not rows:
+        return 0, 0
+    
+    groups = {}
+    for row in rows:
+        groups.setdefault(link_hash(row.link or ''), []).append(row)
+    
+    # Rows hashed earlier (by the scraper) that collide with a backfilled row
+    hashes = list(groups)
+    for i in range(0, len(hashes), 500):
+        params = {f"h{n}": h for n, h in enumerate(hashes[i:i + 500])}
+        stored = conn.execute(text(
+            f"SELECT {columns} FROM {schema}.articles "
+            f"WHERE link_hash IN ({', '.join(':' + name for name in params)})"
+        ), params).all()
+        for row in stored:
+            groups[row.link_hash].insert(0, row)
+    
+    updates = []
+    merges = []
+    duplicate_ids = []
+    for hash_value, group in groups.items():
+        survivor, duplicates = group[0], group[1:]
+        if survivor.link_hash is None:
+            updates.append({"id": survivor.id, "link": canonicalize_url(survivor.link or ''), "hash": hash_value})
+        if duplicates:
+            merges.append({
+                "id": survivor.id,
+                "locations": _merge_locations(*(r.locations for r in group)),
+                "is_security_related": any(r.is_security_related for r in group),
+                "is_priority": any(r.is_priority for r in group),
+                "priority_reason": next((r.priority_reason for r in group if r.priority_reason), None),
+            })
+            duplicate_ids.extend(r.id for r in duplicates)
+    
+    if duplicate_ids:
+        conn.execute(text(f"DELETE FROM {schema}.articles WHERE id = :id"), [{"id": i} for i in duplicate_ids])
+        # location_mask is recomputed by backfill_location_masks
+        conn.execute(text(
+            f"UPDATE {schema}.articles SET locations = :locations, location_mask = NULL, "
+            f"is_security_related = :is_security_related, is_priority = :is_priority, "
+            f"priority_reason = :priority_reason WHERE id = :id"
+        ), merges)
+    if updates:
+        conn.execute(text(
+            f"UPDATE {schema}.articles SET link = :link, link_hash = :hash WHERE id = :id"
+        ), updates)
+    
+    return len(updates), len(duplicate_ids)
+
+
+def backfill_published_hours(conn, schema: str = "main") -> int:
+    """
+    Fill published_hour (hours since the epoch) for rows that lack it.
+    """
+    return conn.execute(text(
+        f"UPDATE {schema}.articles "
+        f"SET published_hour = CAST(strftime('%s', published_date) AS INTEGER) / 3600 "
+        f"WHERE published_hour IS NULL AND published_date IS NOT NULL"
+    )).rowcount
+
+
+DATE_STORAGE_FORMAT = '%Y-%m-%d %H:%M:%S.%f'
+
+
+def parse_stored_date(value: str) -> datetime:
+    """
+    Parse a stored published_date, with or without an offset.
+    """
+    if value.endswith(('Z', 'z')):
+        value = value[:-1] + '+00:00'
+    return datetime.fromisoformat(value)
+
+
+def detect_date_offsets(conn, schema: str = "main") -> Dict[str, timedelta]:
+    """
+    Guess the UTC offset each source's not yet normalized dates were stored
+    in, from the largest lead of published_date over extracted_date.
+    """
+    rows = conn.execute(text(
+        f"SELECT source, MAX((julianday(published_date) - julianday(extracted_date)) * 24) "
+        f"FROM {schema}.articles "
+        f"WHERE published_utc IS NULL AND published_date > extracted_date "
+        # Values that kept their offset are converted, not shifted
+        f"AND substr(published_date, 20) NOT GLOB '*[-+Zz]*' "
+        f"GROUP BY source"
+    )).all()
+    offsets = {}
+    for source, hours in rows:
+        if not hours or hours > 14:
+            continue
+        # UTC offsets are whole or half hours (WAT is +01:00); a smaller lead is clock skew
+        offset = round(hours * 2) / 2
+        if offset:
+            offsets[source] = timedelta(hours=offset)
+    return offsets
+
+
+def normalize_published_dates(conn, schema: str = "main", offsets: Dict[str, timedelta] = None) -> int:
+    """
+    Rewrite the published_date of rows stored before UTC normalization as
+    naive UTC: values with an offset are converted, and naive values of a
+    source in `offsets` (detected when not given) are shifted back by it.
+    Every such row is then marked published_utc, so no row is shifted twice.
+    Returns the number of dates changed.
+    """
+    rows = conn.execute(text(
+        f"SELECT id, source, published_date FROM {schema}.articles "
+        f"WHERE published_utc IS NULL AND published_date IS NOT NULL"
+    )).all()
+    if offsets is None:
+        offsets = detect_date_offsets(conn, schema)
+    for source, offset in offsets.items():
+        logger.info(f"Shifting {source} dates in {schema}.articles back by {offset}")
+    
+    updates = []
+    for article_id, source, stored in rows:
+        try:
+            value = parse_stored_date(stored)
+        except ValueError:
+            logger.error(f"Unparseable published_date for article {article_id} in {schema}: {stored!r}")
+            continue
+        
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        elif source in offsets:
+            value = value - offsets[source]
+        
+        normalized = value.strftime(DATE_STORAGE_FORMAT)
+        if normalized != stored:
+            updates.append({"id": article_id, "value": normalized, "hour": published_hour_for(value)})
+    
+    if updates:
+        conn.execute(
+            text(f"UPDATE {schema}.articles SET published_date = :value, published_hour = :hour WHERE id = :id"),
+            updates,
+        )
+    conn.execute(text(f"UPDATE {schema}.articles SET published_utc = 1 WHERE published_utc IS NULL"))
+    return len(updates)
+
+
+def backfill_location_masks(conn, schema: str = "main") -> int:
+    """
+    Fill location_mask from locations for rows that lack it.
+    """
+    rows = conn.execute(text(
+        f"SELECT id, locations FROM {schema}.articles WHERE location_mask IS NULL"
+    )).all()
+    if rows:
+        conn.execute(
+            text(f"UPDATE {schema}.articles SET location_mask = :mask WHERE id = :id"),
+            [{"id": row.id, "mask": location_mask_for(row.locations)} for row in rows],
+        )
+    return len(rows)
+
+
+def backfill_archived_links(conn, schema: str) -> int:
+    """
+    Record the link hashes of an attached archive in main.archived_links.
+    """
+    return conn.execute(text(
+        f"INSERT OR IGNORE INTO main.archived_links (link_hash) "
+        f"SELECT link_hash FROM {schema}.articles WHERE link_hash IS NOT NULL"
+    )).rowcount
+
+
+def migrate_schema(conn, schema: str = "main"):
+    """
+    Bring one articles table (hot or attached archive) up to the model.
+    """
+    added = add_missing_columns(conn, Article.__table__, schema)
+    if added:
+        logger.info(f"Added columns {added} to {schema}.articles")
+    
+    # link_hash replaces the wide unique index on the raw link
+    conn.execute(text(f"DROP INDEX IF EXISTS {schema}.ix_articles_link"))
+    
+    hashed, merged = backfill_link_hashes(conn, schema)
+    if hashed or merged:
+        logger.info(f"Backfilled {hashed} link hashes in {schema}.articles, merged {merged} duplicates")
+    
+    conn.execute(text(
+        f"CREATE UNIQUE INDEX IF NOT EXISTS {schema}.ix_articles_link_hash ON articles (link_hash)"
+    ))
+    
+    normalized = normalize_published_dates(conn, schema)
+    if normalized:
+        logger.info(f"Normalized {normalized} published dates in {schema}.articles to UTC")
+    
+    filled = backfill_published_hours(conn, schema)
+    if filled:
+        logger.info(f"Backfilled published_hour for {filled} rows in {schema}.articles")
+    conn.execute(text(
+        f"CREATE INDEX IF NOT EXISTS {schema}.ix_articles_published_hour ON articles (published_hour)"
+    ))
+    
+    masked = backfill_location_masks(conn, schema)
+    if masked:
+        logger.info(f"Backfilled location_mask for {masked} rows in {schema}.articles")
+
+
+def run_migrations():
+    """
+    Migrate the hot database, then every archive file on disk.
+    """
+    from database.archive import archive_path, archive_schema, list_archives
+    
+    with engine.begin() as conn:
+        migrate_schema(conn)
+    
+    with engine.connect() as conn:
+        for year, month in list_archives():
+            schema = archive_schema(year, month)
+            conn.execute(text(f"ATTACH DATABASE :path AS {schema}"), {"path": archive_path(year, month)})
+            try:
+                migrate_schema(conn, schema)
+                remembered = backfill_archived_links(conn, schema)
+                if remembered:
+                    logger.info(f"Recorded {remembered} archived links from {schema}")
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                logger.error(f"Error migrating archive {year}-{month:02d}: {e}")
+            finally:
+                conn.execute(text(f"DETACH DATABASE {schema}"))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    from database.db import init_db
+    init_db()
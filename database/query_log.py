@@ -0,0 +1,64 @@
+"""
+Slow-query logging through SQLAlchemy engine events.
+
+Every statement slower than SLOW_QUERY_MS is logged with its parameters
+and, for SELECTs, SQLite's EXPLAIN QUERY PLAN. Disabled when SLOW_QUERY_MS
+is 0 (the default).
+"""
+import logging
+import os
+import time
+
+from sqlalchemy import event
+
+logger = logging.getLogger("database.slow_query")
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "0"))
+MAX_LOGGED_PARAMS = 500  # characters of repr(parameters) to keep
+
+
+def explain_statement(cursor, statement: str, parameters) -> str:
+    """
+    EXPLAIN QUERY PLAN for a statement, on a separate cursor of the same connection.
+    """
+    explain_cursor = cursor.connection.cursor()
+    try:
+        explain_cursor.execute("EXPLAIN QUERY PLAN " + statement, parameters)
+        return "; ".join(str(row[-1]) for row in explain_cursor.fetchall())
+    except Exception as e:
+        return f"unavailable ({e})"
+    finally:
+        explain_cursor.close()
+
+
+def install_slow_query_logging(engine, threshold_ms: float = SLOW_QUERY_MS):
+    """
+    Attach timing hooks to the engine. No-op when threshold_ms is 0.
+    """
+    if threshold_ms <= 0:
+        return
+    
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+    
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - conn.info["query_started"].pop()) * 1000
+        if elapsed_ms < threshold_ms:
+            return
+        
+        plan = None
+        if not executemany and statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            plan = explain_statement(cursor, statement, parameters)
+        
+        params = repr(parameters)
+        if len(params) > MAX_LOGGED_PARAMS:
+            params = params[:MAX_LOGGED_PARAMS] + "..."
+        
+        logger.warning(
+            f"Slow query ({elapsed_ms:.1f} ms): {' '.join(statement.split())} | "
+            f"params={params} | plan={plan}"
+        )
+    
+    logger.info(f"Slow query logging enabled (threshold {threshold_ms} ms)")
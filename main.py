@@ -3,18 +3,31 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 import logging
 import os
+import threading
 
 from database.db import init_db
-from services.scheduler import start_scheduler, stop_scheduler
+from services.scheduler import start_scheduler, stop_scheduler, RUN_SCHEDULER
+from services.article_tail import article_tail
+from services.process_pool import shutdown_process_pool
+from services.trends import trend_engine
+from services.feed_registry import init_feed_registry
 from api.routes import router
+from api.stream import router as stream_router
+from api.admin import router as admin_router
+from api.searches import router as searches_router
+from api.profiling import ProfilingMiddleware
+from services.logging_setup import configure_logging
 
-# Logging setup
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Logging setup: queued, see services.logging_setup
+configure_logging()
 logger = logging.getLogger(__name__)
 
+# Seconds after startup before the trend rebuild and scheduler/tail start,
+# so the first requests are not competing with them
+BACKGROUND_START_DELAY_SECONDS = float(os.getenv("BACKGROUND_START_DELAY_SECONDS", "2"))
+
+_background_timer = None
+
 # Create FastAPI app
 app = FastAPI(
     title="Nigerian Security News Platform",
@@ -31,29 +44,64 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Opt-in request profiling (PROFILE_SAMPLE_RATE / PROFILE_TOKEN)
+app.add_middleware(ProfilingMiddleware)
+
 # Include API routes
 app.include_router(router)
+app.include_router(stream_router)
+app.include_router(admin_router)
+app.include_router(searches_router)
+
+
+def start_background_services():
+    """
+    Rebuild the trend counters and start ingestion (RUN_SCHEDULER=true) or
+    the tail of articles written by the worker (RUN_SCHEDULER=false).
+    """
+    try:
+        if RUN_SCHEDULER:
+            init_feed_registry()
+            trend_engine.rebuild()
+            start_scheduler()
+            logger.info("Scheduler started")
+        else:
+            trend_engine.rebuild(max_id=article_tail.mark_current())
+            article_tail.start()
+            logger.info("Scheduler disabled; tailing articles written by the worker")
+    except Exception as e:
+        logger.error(f"Error starting background services: {e}")
 
 
 @app.on_event("startup")
 async def startup_event():
     """
-    Initialize database and start scheduler on app startup.
+    Initialize database on app startup, then start the background services
+    once the app is serving.
+    With RUN_SCHEDULER=false ingestion runs in the worker process and new
+    articles are picked up from the database instead.
     """
+    global _background_timer
     logger.info("Starting Nigerian Security News Platform")
     init_db()
     logger.info("Database initialized")
-    start_scheduler()
-    logger.info("Scheduler started")
+    
+    _background_timer = threading.Timer(BACKGROUND_START_DELAY_SECONDS, start_background_services)
+    _background_timer.daemon = True
+    _background_timer.start()
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """
-    Stop scheduler on app shutdown.
+    Stop scheduler and worker processes on app shutdown.
     """
     logger.info("Shutting down application")
+    if _background_timer is not None:
+        _background_timer.cancel()
+    article_tail.stop()
     stop_scheduler()
+    shutdown_process_pool()
 
 
 @app.get("/", tags=["root"])
@@ -71,7 +119,13 @@ def read_root():
             "sources": "/api/sources",
             "incident_types": "/api/incident-types",
             "locations": "/api/locations",
-            "scrape_now": "/api/scrape-now"
+            "scrape_now": "/api/scrape-now",
+            "stream": "/api/stream/articles",
+            "trends": "/api/trends",
+            "timeseries": "/api/timeseries",
+            "briefing": "/api/briefing",
+            "saved_searches": "/api/saved-searches",
+            "feeds": "/api/admin/feeds"
         }
     }
 
@@ -1,25 +1,96 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean
+from sqlalchemy import Column, Integer, BigInteger, String, Text, DateTime, Boolean, ForeignKey
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.ext.declarative import declarative_base
-from datetime import datetime
+from datetime import datetime, timedelta
 
 Base = declarative_base()
 
+_EPOCH = datetime(1970, 1, 1)
+
+# Bit positions of location_mask: the 36 states, FCT and Nigeria, i.e. every
+# location the classifier reports (LOCATION_KEYWORDS values, gazetteer
+# states). Append only; stored masks depend on the order.
+LOCATION_BITS = (
+    'Abia', 'Adamawa', 'Akwa Ibom', 'Anambra', 'Bauchi', 'Bayelsa', 'Benue', 'Borno',
+    'Cross River', 'Delta', 'Ebonyi', 'Edo', 'Ekiti', 'Enugu', 'Gombe', 'Imo', 'Jigawa',
+    'Kaduna', 'Kano', 'Katsina', 'Kebbi', 'Kogi', 'Kwara', 'Lagos', 'Nasarawa', 'Niger',
+    'Ogun', 'Ondo', 'Osun', 'Oyo', 'Plateau', 'Rivers', 'Sokoto', 'Taraba', 'Yobe', 'Zamfara',
+    'FCT', 'Nigeria',
+)
+LOCATION_BIT = {name: 1 << i for i, name in enumerate(LOCATION_BITS)}
+
+
+def published_hour_for(value: datetime):
+    """
+    Hours since the Unix epoch for a naive UTC datetime, or None.
+    """
+    return None if value is None else (value - _EPOCH) // timedelta(hours=1)
+
+
+def location_mask_for(locations: str) -> int:
+    """
+    Bitmask of the known locations in a comma-separated list.
+    """
+    mask = 0
+    for name in (locations or '').split(','):
+        mask |= LOCATION_BIT.get(name.strip(), 0)
+    return mask
+
+
 class Article(Base):
     __tablename__ = "articles"
-
+    
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(500), index=True)
-    link = Column(String(500), unique=True, index=True)
+    link = Column(String(500))  # Canonical URL, see scrapers.links
+    link_hash = Column(BigInteger, unique=True, index=True)  # 64-bit dedupe key
     summary = Column(Text)
     source = Column(String(100), index=True)
     published_date = Column(DateTime, index=True)
+    published_hour = Column(Integer, index=True)  # Hours since epoch, kept in step with published_date
+    published_utc = Column(Boolean, default=True)  # NULL: stored before dates were normalized to UTC
     extracted_date = Column(DateTime, default=datetime.utcnow)
     is_security_related = Column(Boolean, default=False)
     locations = Column(Text)  # Comma-separated
+    location_mask = Column(BigInteger)  # LOCATION_BITS of locations, kept in step with it
     incident_type = Column(String(100))
     topic = Column(String(50), default='general', index=True)  # security, traffic, politics, business, etc.
     is_priority = Column(Boolean, default=False, index=True)  # Flag for Abuja traffic/security
     priority_reason = Column(String(200))  # Why it's marked as priority
     
+    # Full page text lives in its own table and loads only when accessed
+    body = relationship("ArticleBody", uselist=False, lazy="select", cascade="all, delete-orphan")
+    
+    @validates("published_date")
+    def _set_published_hour(self, key, value):
+        self.published_hour = published_hour_for(value)
+        return value
+    
+    @validates("locations")
+    def _set_location_mask(self, key, value):
+        self.location_mask = location_mask_for(value)
+        return value
+    
     def __repr__(self):
         return f"<Article(title='{self.title}', source='{self.source}', topic='{self.topic}')>"
+
+
+class ArticleBody(Base):
+    __tablename__ = "article_bodies"
+    
+    article_id = Column(Integer, ForeignKey("articles.id", ondelete="CASCADE"), primary_key=True)
+    text = Column(Text, nullable=False)  # Main text extracted from the article page
+    fetched_at = Column(DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<ArticleBody(article_id={self.article_id}, chars={len(self.text or '')})>"
+
+
+class ArchivedLink(Base):
+    __tablename__ = "archived_links"
+    
+    # link_hash of an article moved to a monthly archive, so dedupe still sees it
+    link_hash = Column(BigInteger, primary_key=True)
+    
+    def __repr__(self):
+        return f"<ArchivedLink(link_hash={self.link_hash})>"
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, DateTime, LargeBinary
+from datetime import datetime
+
+from models.article import Base
+
+class Briefing(Base):
+    __tablename__ = "briefings"
+    
+    id = Column(Integer, primary_key=True)
+    generated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    etag = Column(String(64), nullable=False)  # Hash of document, served as the ETag
+    window_hours = Column(Integer, nullable=False)
+    article_count = Column(Integer, nullable=False)
+    story_count = Column(Integer, nullable=False)
+    document = Column(LargeBinary, nullable=False)  # Serialized JSON, served as-is
+    
+    def __repr__(self):
+        return f"<Briefing(generated_at='{self.generated_at}', stories={self.story_count}, etag='{self.etag}')>"
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Float
+from datetime import datetime
+
+from models.article import Base
+
+class Feed(Base):
+    __tablename__ = "feeds"
+    
+    id = Column(Integer, primary_key=True)
+    name = Column(String(100), unique=True, nullable=False)  # Stored as Article.source
+    url = Column(String(500), nullable=False)
+    enabled = Column(Boolean, default=True, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    # Health of the most recent attempts
+    last_attempt_at = Column(DateTime)
+    last_success_at = Column(DateTime)
+    last_latency_ms = Column(Float)
+    last_bytes = Column(Integer)
+    last_entries = Column(Integer)
+    last_error = Column(String(500))
+    consecutive_failures = Column(Integer, default=0, nullable=False)
+    
+    # Circuit breaker: the feed is skipped until this time
+    retry_after = Column(DateTime)
+    
+    def __repr__(self):
+        return f"<Feed(name='{self.name}', enabled={self.enabled}, failures={self.consecutive_failures})>"
@@ -0,0 +1,43 @@
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, UniqueConstraint
+from datetime import datetime
+
+from models.article import Base
+
+class SavedSearch(Base):
+    __tablename__ = "saved_searches"
+    
+    id = Column(Integer, primary_key=True)
+    name = Column(String(100), nullable=False)
+    query = Column(String(500))  # Words, "quoted phrases" and prefix* terms; all must match
+    topic = Column(String(50))
+    location = Column(String(100))
+    incident_type = Column(String(100))
+    enabled = Column(Boolean, default=True, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    # Inbox read marker: matches with a higher id are unread
+    last_read_match_id = Column(Integer, default=0, nullable=False)
+    
+    def __repr__(self):
+        return f"<SavedSearch(name='{self.name}', query='{self.query}', enabled={self.enabled})>"
+
+
+class SearchMatch(Base):
+    __tablename__ = "search_matches"
+    __table_args__ = (UniqueConstraint("search_id", "article_id"),)
+    
+    id = Column(Integer, primary_key=True)
+    # The index carries the rowid, so an inbox page is one range scan
+    search_id = Column(Integer, nullable=False, index=True)
+    article_id = Column(Integer, nullable=False)
+    matched_at = Column(DateTime, default=datetime.utcnow)
+    
+    # Copied from the article so the inbox never joins articles (or archives)
+    title = Column(String(500))
+    link = Column(String(500))
+    source = Column(String(100))
+    topic = Column(String(50))
+    published_date = Column(DateTime)
+    
+    def __repr__(self):
+        return f"<SearchMatch(search_id={self.search_id}, article_id={self.article_id})>"
@@ -0,0 +1,200 @@
+"""
+Optional enrichment stage: fetch full article pages and extract their text.
+
+RSS summaries are often a single truncated sentence. When
+BODY_FETCH_ENABLED is set, new articles have their pages fetched through a
+bounded thread pool that keeps one pooled requests.Session per worker
+thread. Each host gets at most BODY_FETCH_PER_HOST concurrent requests,
+spaced at least BODY_FETCH_HOST_DELAY seconds apart. Pages are capped at
+MAX_BODY_BYTES and BODY_FETCH_TIMEOUT_SECONDS.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+import logging
+import os
+import threading
+import time
+
+import requests
+from bs4 import BeautifulSoup
+
+from scrapers.rss_scraper import USER_AGENT
+
+logger = logging.getLogger(__name__)
+
+BODY_FETCH_ENABLED = os.getenv("BODY_FETCH_ENABLED", "false").lower() == "true"
+BODY_FETCH_WORKERS = int(os.getenv("BODY_FETCH_WORKERS", "4"))
+BODY_FETCH_PER_HOST = int(os.getenv("BODY_FETCH_PER_HOST", "1"))
+BODY_FETCH_HOST_DELAY = float(os.getenv("BODY_FETCH_HOST_DELAY", "1.0"))
+BODY_FETCH_TIMEOUT_SECONDS = float(os.getenv("BODY_FETCH_TIMEOUT_SECONDS", "10"))
+MAX_BODY_BYTES = int(os.getenv("MAX_BODY_BYTES", str(2 * 1024 * 1024)))
+MAX_BODY_CHARS = int(os.getenv("MAX_BODY_CHARS", "20000"))
+
+# Paragraphs shorter than this are usually captions, bylines or share links
+MIN_PARAGRAPH_CHARS = 40
+
+_BOILERPLATE_TAGS = ['script', 'style', 'noscript', 'nav', 'header', 'footer', 'aside', 'form', 'figure', 'iframe']
+
+
+class PageTooLargeError(Exception):
+    """Raised when an article page exceeds MAX_BODY_BYTES."""
+
+
+class HostThrottle:
+    """
+    Per-host concurrency limit plus a minimum gap between request starts.
+    """
+    
+    def __init__(self, per_host: int = BODY_FETCH_PER_HOST, delay: float = BODY_FETCH_HOST_DELAY):
+        self.per_host = per_host
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._slots: Dict[str, threading.Semaphore] = {}
+        self._next_start: Dict[str, float] = {}
+    
+    def _slot(self, host: str) -> threading.Semaphore:
+        with self._lock:
+            if host not in self._slots:
+                self._slots[host] = threading.Semaphore(self.per_host)
+            return self._slots[host]
+    
+    def acquire(self, host: str):
+        self._slot(host).acquire()
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start.get(host, 0.0))
+            self._next_start[host] = start + self.delay
+        if start > now:
+            time.sleep(start - now)
+    
+    def release(self, host: str):
+        self._slot(host).release()
+
+
+_local = threading.local()
+
+
+def _session() -> requests.Session:
+    """
+    One keep-alive session per worker thread, so connections are reused.
+    """
+    if not hasattr(_local, "session"):
+        session = requests.Session()
+        session.headers["User-Agent"] = USER_AGENT
+        _local.session = session
+    return _local.session
+
+
+def download_page(url: str, max_bytes: int = MAX_BODY_BYTES) -> Optional[str]:
+    """
+    Fetch an HTML page, refusing anything larger than max_bytes.
+    Returns None for non-HTML responses.
+    """
+    with _session().get(url, stream=True, timeout=BODY_FETCH_TIMEOUT_SECONDS) as response:
+        response.raise_for_status()
+        
+        if 'html' not in response.headers.get("Content-Type", "text/html"):
+            return None
+        
+        declared = response.headers.get("Content-Length")
+        if declared and declared.isdigit() and int(declared) > max_bytes:
+            raise PageTooLargeError(f"{url} declares {declared} bytes (limit {max_bytes})")
+        
+        chunks = []
+        received = 0
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            received += len(chunk)
+            if received > max_bytes:
+                raise PageTooLargeError(f"{url} exceeded {max_bytes} bytes")
+            chunks.append(chunk)
+        
+        encoding = response.encoding or response.apparent_encoding or "utf-8"
+    
+    return b"".join(chunks).decode(encoding, errors="replace")
+
+
+def extract_main_text(html: str, max_chars: int = MAX_BODY_CHARS) -> str:
+    """
+    Extract the article text from a page.
+    Uses the <article> element when there is one, otherwise the element
+    whose direct <p> children hold the most text.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    for tag in soup(_BOILERPLATE_TAGS):
+        tag.decompose()
+    
+    container = soup.find("article")
+    if container is None:
+        best_length = 0
+        for paragraph in soup.find_all("p"):
+            parent = paragraph.parent
+            length = sum(len(p.get_text(strip=True)) for p in parent.find_all("p", recursive=False))
+            if length > best_length:
+                container, best_length = parent, length
+    if container is None:
+        return ''
+    
+    paragraphs = [
+        " ".join(p.get_text(" ", strip=True).split())
+        for p in container.find_all("p")
+    ]
+    text = "\n\n".join(p for p in paragraphs if len(p) >= MIN_PARAGRAPH_CHARS)
+    return text[:max_chars]
+
+
+def fetch_article_body(url: str, throttle: HostThrottle) -> Optional[str]:
+    """
+    Fetch and extract one article; None on any failure.
+    """
+    host = urlsplit(url).hostname or ''
+    throttle.acquire(host)
+    try:
+        html = download_page(url)
+    except Exception as e:
+        # Failures are counted in fetch_article_bodies' summary line
+        logger.debug("Could not fetch article body %s: %s", url, e)
+        return None
+    finally:
+        throttle.release(host)
+    
+    if not html:
+        return None
+    text = extract_main_text(html)
+    return text or None
+
+
+def _interleave_hosts(urls: Iterable[str]) -> List[str]:
+    """
+    Order URLs round-robin by host so workers do not queue behind one site.
+    """
+    by_host: Dict[str, List[str]] = {}
+    for url in urls:
+        by_host.setdefault(urlsplit(url).hostname or '', []).append(url)
+    queues = list(by_host.values())
+    ordered = []
+    while queues:
+        ordered.extend(q.pop(0) for q in queues)
+        queues = [q for q in queues if q]
+    return ordered
+
+
+def fetch_article_bodies(urls: Iterable[str], workers: int = BODY_FETCH_WORKERS) -> Dict[str, str]:
+    """
+    Fetch many article pages concurrently.
+    Returns {url: extracted text} for the pages that yielded text.
+    """
+    urls = _interleave_hosts(dict.fromkeys(u for u in urls if u))
+    if not urls:
+        return {}
+    
+    throttle = HostThrottle()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="body-fetch") as pool:
+        texts = pool.map(lambda url: fetch_article_body(url, throttle), urls)
+        bodies = {url: text for url, text in zip(urls, texts) if text}
+    
+    logger.info(
+        "Fetched %d/%d article bodies in %.1fs", len(bodies), len(urls), time.perf_counter() - started
+    )
+    return bodies
@@ -0,0 +1,73 @@
+"""
+Article URL canonicalization and the 64-bit dedupe key.
+
+canonicalize_url() produces the link we store: tracking parameters and
+fragments removed, scheme and host lowercased, default ports dropped and
+the remaining query parameters sorted. It keeps the scheme, `www.` and the
+trailing slash, because some sites only answer on the exact form.
+
+link_hash() folds those remaining variants too (http/https, `www.`,
+trailing slash) and hashes the result into a signed 64-bit integer that
+fits SQLite's INTEGER column and is the unique dedupe key for articles.
+"""
+import hashlib
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'igshid', 'mc_cid', 'mc_eid',
+    '_ga', 'ref', 'ref_src', 'cmpid', 'ocid', 'amp',
+}
+TRACKING_PREFIXES = ('utm_',)
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def _is_tracking(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normalize a feed link for storage. Unparseable input is returned stripped.
+    """
+    url = (url or '').strip()
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url
+    if not parts.scheme or not parts.hostname:
+        return url
+    
+    scheme = parts.scheme.lower()
+    host = parts.hostname.lower()
+    if port and port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{port}"
+    
+    query = sorted(
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_tracking(name)
+    )
+    
+    return urlunsplit((scheme, host, parts.path or '/', urlencode(query), ''))
+
+
+def link_key(url: str) -> str:
+    """
+    The scheme-, `www.`- and trailing-slash-insensitive form that gets hashed.
+    """
+    parts = urlsplit(canonicalize_url(url))
+    if not parts.netloc:
+        return parts.geturl()
+    host = parts.netloc[4:] if parts.netloc.startswith('www.') else parts.netloc
+    path = parts.path.rstrip('/') or '/'
+    return f"{host}{path}?{parts.query}" if parts.query else f"{host}{path}"
+
+
+def link_hash(url: str) -> int:
+    """
+    Signed 64-bit hash of link_key(url).
+    """
+    digest = hashlib.blake2b(link_key(url).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
@@ -1,12 +1,28 @@
 import feedparser
-from datetime import datetime
-from typing import List, Dict
+import requests
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import List, Dict, Optional
 import logging
+import os
 import re
 from html import unescape
 
+from services.logging_setup import SAMPLED
+
 logger = logging.getLogger(__name__)
 
+# Per-feed safety limits so one oversized or malicious feed cannot exhaust memory
+MAX_FEED_BYTES = int(os.getenv("MAX_FEED_BYTES", str(5 * 1024 * 1024)))
+MAX_FEED_ENTRIES = int(os.getenv("MAX_FEED_ENTRIES", "20"))
+FEED_TIMEOUT_SECONDS = float(os.getenv("FEED_TIMEOUT_SECONDS", "20"))
+
+USER_AGENT = "NigerianSecurityNewsBot/1.0 (+https://github.com/Uniqwrites1/news-scrapper-backend)"
+
+
+class FeedTooLargeError(Exception):
+    """Raised when a feed response exceeds MAX_FEED_BYTES."""
+
 # Major Nigerian news sources with RSS feeds (25+ outlets covering all topics)
 NIGERIAN_NEWS_FEEDS = {
     # Security News Sources
@@ -46,29 +62,82 @@ NIGERIAN_NEWS_FEEDS = {
 }
 
 
-def parse_feed_date(date_str: str) -> datetime:
+def to_naive_utc(value: datetime) -> datetime:
     """
-    Parse various date formats from RSS feeds.
+    Convert an aware datetime to naive UTC; naive values are assumed to be UTC already.
+    All stored published dates use this form so the date index orders them correctly.
     """
-    try:
-        # Try multiple date formats
-        for fmt in [
-            '%a, %d %b %Y %H:%M:%S %z',
-            '%a, %d %b %Y %H:%M:%S GMT',
-            '%Y-%m-%dT%H:%M:%S%z',
-            '%Y-%m-%d %H:%M:%S',
-        ]:
-            try:
-                return datetime.strptime(date_str.strip(), fmt)
-            except ValueError:
-                continue
-        
-        # Fallback
-        logger.warning(f"Could not parse date: {date_str}")
-        return datetime.utcnow()
-    except Exception as e:
-        logger.error(f"Date parsing error: {e}")
-        return datetime.utcnow()
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _parse_rfc822(value: str) -> datetime:
+    return parsedate_to_datetime(value)
+
+
+def _parse_iso8601(value: str) -> datetime:
+    if value.endswith(('Z', 'z')):
+        value = value[:-1] + '+00:00'
+    return datetime.fromisoformat(value)
+
+
+DATE_PARSERS = {
+    'rfc822': _parse_rfc822,
+    'iso8601': _parse_iso8601,
+}
+
+# Last format that worked for each source, tried first on the next entry
+_source_date_formats: Dict[str, str] = {}
+
+
+def parse_feed_date(date_str: str, source_name: str = None) -> Optional[datetime]:
+    """
+    Parse an RSS (RFC 822) or Atom (ISO 8601) date string to naive UTC.
+    The format that last worked for source_name is tried first, so a
+    consistent feed costs one parse per entry. Returns None if unparseable.
+    """
+    if not date_str:
+        return None
+    
+    value = date_str.strip()
+    learned = _source_date_formats.get(source_name)
+    if learned:
+        order = [learned] + [name for name in DATE_PARSERS if name != learned]
+    elif value[:4].isdigit():
+        order = ['iso8601', 'rfc822']
+    else:
+        order = ['rfc822', 'iso8601']
+    
+    for name in order:
+        try:
+            parsed = DATE_PARSERS[name](value)
+        except (TypeError, ValueError, IndexError):
+            continue
+        if source_name:
+            _source_date_formats[source_name] = name
+        return to_naive_utc(parsed)
+    
+    return None
+
+
+def entry_published_date(entry, source_name: str = None) -> Optional[datetime]:
+    """
+    Published date of a feed entry as naive UTC.
+    Uses feedparser's already-parsed UTC structs when present and only
+    falls back to parsing the raw strings when it could not parse them.
+    """
+    for key in ('published_parsed', 'updated_parsed'):
+        parsed = entry.get(key)
+        if parsed:
+            return datetime(*parsed[:6])
+    
+    for key in ('published', 'updated'):
+        published = parse_feed_date(entry.get(key), source_name)
+        if published:
+            return published
+    
+    return None
 
 
 def clean_html_content(html_content: str) -> str:
@@ -80,7 +149,7 @@ def clean_html_content(html_content: str) -> str:
         return ''
 
     # Remove script and style tags and their content
-    clean_text = re.sub(r'<(script|style).*?</\1>(?s)', '', html_content)
+    clean_text = re.sub(r'<(script|style).*?</\1>', '', html_content, flags=re.DOTALL | re.IGNORECASE)
     
     # Remove HTML comments
     clean_text = re.sub(r'<!--.*?-->', '', clean_text, flags=re.DOTALL)
@@ -103,6 +172,76 @@ def clean_html_content(html_content: str) -> str:
     return clean_text
 
 
+def download_feed(feed_url: str, max_bytes: int = MAX_FEED_BYTES) -> bytes:
+    """
+    Download the raw feed document, refusing anything larger than max_bytes.
+    The body is streamed so an oversized response is abandoned early.
+    """
+    with requests.get(
+        feed_url,
+        stream=True,
+        timeout=FEED_TIMEOUT_SECONDS,
+        headers={"User-Agent": USER_AGENT},
+    ) as response:
+        response.raise_for_status()
+        
+        declared = response.headers.get("Content-Length")
+        if declared and declared.isdigit() and int(declared) > max_bytes:
+            raise FeedTooLargeError(f"{feed_url} declares {declared} bytes (limit {max_bytes})")
+        
+        chunks = []
+        received = 0
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            received += len(chunk)
+            if received > max_bytes:
+                raise FeedTooLargeError(f"{feed_url} exceeded {max_bytes} bytes")
+            chunks.append(chunk)
+    
+    return b"".join(chunks)
+
+
+def parse_feed_bytes(raw: bytes, source_name: str, max_entries: int = MAX_FEED_ENTRIES) -> List[Dict]:
+    """
+    Parse a downloaded feed document into cleaned article dicts.
+    Pure function of its inputs so it can run inside a worker process.
+    """
+    articles = []
+    undated = 0
+    feed = feedparser.parse(raw)
+    
+    if feed.bozo:
+        logger.warning("Feed %s has parsing issues: %s", source_name, feed.bozo_exception)
+    
+    for entry in feed.entries[:max_entries]:
+        try:
+            # Clean the summary/description
+            summary = entry.get('summary', '') or entry.get('description', '')
+            
+            article = {
+                'title': clean_html_content(entry.get('title', 'No title')),
+                'link': entry.get('link', ''),
+                'summary': clean_html_content(summary),
+                'source': source_name,
+                'published_date': None,
+            }
+            
+            # Extract date; entries without a usable date are stamped with the fetch time
+            article['published_date'] = entry_published_date(entry, source_name)
+            if article['published_date'] is None:
+                undated += 1
+                article['published_date'] = datetime.utcnow()
+            
+            articles.append(article)
+        except Exception as e:
+            logger.error("Error parsing entry from %s: %s", source_name, e)
+            continue
+    
+    # One line per feed rather than one per entry
+    if undated:
+        logger.warning("%d entries from %s had no usable date; using fetch time", undated, source_name)
+    return articles
+
+
 def fetch_single_feed(feed_url: str, source_name: str) -> List[Dict]:
     """
     Fetch articles from a single RSS feed.
@@ -110,42 +249,13 @@ def fetch_single_feed(feed_url: str, source_name: str) -> List[Dict]:
     articles = []
     
     try:
-        logger.info(f"Fetching feed from {source_name}: {feed_url}")
-        feed = feedparser.parse(feed_url)
-        
-        if feed.bozo:
-            logger.warning(f"Feed has parsing issues: {feed.bozo_exception}")
-        
-        for entry in feed.entries[:20]:  # Limit to 20 most recent
-            try:
-                # Clean the summary/description
-                summary = entry.get('summary', '') or entry.get('description', '')
-                
-                article = {
-                    'title': clean_html_content(entry.get('title', 'No title')),
-                    'link': entry.get('link', ''),
-                    'summary': clean_html_content(summary),
-                    'source': source_name,
-                    'published_date': None,
-                }
-                
-                # Extract date
-                if 'published' in entry:
-                    article['published_date'] = parse_feed_date(entry.published)
-                elif 'updated' in entry:
-                    article['published_date'] = parse_feed_date(entry.updated)
-                else:
-                    article['published_date'] = datetime.utcnow()
-                
-                articles.append(article)
-            except Exception as e:
-                logger.error(f"Error parsing entry from {source_name}: {e}")
-                continue
-        
-        logger.info(f"Successfully fetched {len(articles)} articles from {source_name}")
+        logger.info("Fetching feed from %s: %s", source_name, feed_url, extra=SAMPLED)
+        raw = download_feed(feed_url)
+        articles = parse_feed_bytes(raw, source_name)
+        logger.info("Fetched %d articles from %s", len(articles), source_name, extra=SAMPLED)
         
     except Exception as e:
-        logger.error(f"Error fetching feed {source_name}: {e}")
+        logger.error("Error fetching feed %s: %s", source_name, e)
     
     return articles
 
@@ -160,5 +270,5 @@ def fetch_all_feeds() -> List[Dict]:
         articles = fetch_single_feed(feed_url, source_name)
         all_articles.extend(articles)
     
-    logger.info(f"Total articles fetched: {len(all_articles)}")
+    logger.info("Total articles fetched: %d", len(all_articles))
     return all_articles
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark the rule-based and linear topic engines.
+
+Classifies the labelled articles in the database with both engines and
+prints throughput (articles per second), the agreement between the engines
+and each engine's agreement with the stored topics, overall and on the
+rows train_topic_model holds out. Rows are repeated --repeat times for the
+throughput runs so timings are not dominated by a small database.
+
+Run from the project root (after python -m scripts.train_topic_model):
+    python -m scripts.bench_classifier --repeat 20
+"""
+
+import argparse
+import time
+from collections import Counter
+
+from services.classifier import SOURCE_TOPICS, classify_article, classify_topic
+from services.ml_classifier import LinearTopicModel, TOPIC_MODEL_PATH
+from scripts.train_topic_model import load_labelled_articles, split
+
+
+def rule_topics(rows: list) -> list:
+    return [classify_article(r.title, r.summary or '', source=r.source)['topic'] for r in rows]
+
+
+def rule_topic_only(rows: list) -> list:
+    return [classify_topic(r.title, r.summary or '')[0] for r in rows]
+
+
+def linear_topics(model: LinearTopicModel, rows: list) -> list:
+    topics = model.predict([(r.title, r.summary) for r in rows])
+    return [
+        SOURCE_TOPICS.get((r.source or '').lower(), topic)
+        for r, topic in zip(rows, topics)
+    ]
+
+
+def timed(fn, *args) -> tuple:
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+def agreement(a: list, b: list) -> str:
+    same = sum(x == y for x, y in zip(a, b))
+    return f"{same}/{len(a)} ({same / len(a):.1%})" if a else "n/a"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=3650)
+    parser.add_argument("--repeat", type=int, default=10, help="copies of the rows per throughput run")
+    parser.add_argument("--model", default=TOPIC_MODEL_PATH)
+    args = parser.parse_args()
+
+    rows = load_labelled_articles(args.days)
+    if not rows:
+        raise SystemExit("No labelled articles found")
+    model = LinearTopicModel.load(args.model)
+
+    batch = rows * args.repeat
+    # Warm both paths (gazetteer load, feature cache) before timing
+    rule_topics(rows[:10])
+    linear_topics(model, rows[:10])
+    runs = [
+        ("rules (classify_article)", timed(rule_topics, batch)[1]),
+        ("rules (classify_topic)", timed(rule_topic_only, batch)[1]),
+        ("linear", timed(linear_topics, model, batch)[1]),
+    ]
+
+    print(f"{len(batch)} articles ({len(rows)} x {args.repeat})")
+    print(f"{'engine':<26}{'seconds':>10}{'articles/s':>14}")
+    for name, seconds in runs:
+        print(f"{name:<26}{seconds:>10.3f}{len(batch) / seconds:>14.0f}")
+
+    stored = [r.topic for r in rows]
+    rules = rule_topics(rows)
+    linear = linear_topics(model, rows)
+    print(f"\nlinear vs rules:        {agreement(linear, rules)}")
+    print(f"rules vs stored topic:  {agreement(rules, stored)}")
+    print(f"linear vs stored topic: {agreement(linear, stored)}")
+
+    # The saved model has seen every row; refit without the held-out ones
+    train, holdout = split(rows)
+    if train and holdout:
+        unseen = LinearTopicModel.train([(r.title, r.summary) for r in train], [r.topic for r in train])
+        held_linear = linear_topics(unseen, holdout)
+        print(f"\nHeld-out rows ({len(holdout)}), model fitted without them:")
+        print(f"  linear vs rules:        {agreement(held_linear, rule_topics(holdout))}")
+        print(f"  linear vs stored topic: {agreement(held_linear, [r.topic for r in holdout])}")
+
+    print("\nDisagreements (rules -> linear), most common:")
+    for (rule, lin), count in Counter((r, l) for r, l in zip(rules, linear) if r != l).most_common(8):
+        print(f"  {rule:>14} -> {lin:<14}{count:>5}")
+
+
+if __name__ == "__main__":
+    main()
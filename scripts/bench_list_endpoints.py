@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the /api/articles and /api/search list endpoints.
+
+Compares the old path (hydrate Article objects, build dicts by hand,
+jsonable_encoder + json) with the column-projected path and ORJSONResponse
+at limit=100. Uses a throwaway SQLite file, never news_platform.db.
+
+Run from the project root:
+    python -m scripts.bench_list_endpoints --rows 5000 --iterations 200
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import create_engine, desc, insert, or_
+from sqlalchemy.orm import sessionmaker
+
+from api.routes import get_articles, search_articles
+from models.article import Article, Base, published_hour_for
+from scrapers.links import link_hash
+
+SOURCES = ['punch', 'vanguard', 'premium_times', 'daily_trust', 'channels', 'thisday']
+TOPICS = ['security', 'traffic', 'politics', 'business', 'technology', 'health', 'general']
+LOCATIONS = ['FCT', 'Lagos', 'Kaduna', 'Kano', 'Rivers', 'Borno', 'Nigeria']
+INCIDENT_TYPES = ['kidnapping', 'armed_robbery', 'terrorism', 'homicide', 'other']
+
+
+def build_database(path: str, rows: int, days: int = 7):
+    """
+    Create a synthetic articles table with `rows` rows spread over `days` days.
+    """
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    now = datetime.utcnow()
+    rng = random.Random(42)
+
+    batch = []
+    with engine.begin() as conn:
+        for i in range(rows):
+            published = now - timedelta(minutes=rng.randint(0, days * 24 * 60 - 1))
+            batch.append({
+                "title": f"Synthetic article {i} about kidnapping in {rng.choice(LOCATIONS)}",
+                "link": f"https://example.com/article/{i}",
+                "link_hash": link_hash(f"https://example.com/article/{i}"),
+                "summary": "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 8,
+                "source": rng.choice(SOURCES),
+                "published_date": published,
+                "published_hour": published_hour_for(published),
+                "extracted_date": now,
+                "is_security_related": rng.random() < 0.5,
+                "locations": ','.join(rng.sample(LOCATIONS, rng.randint(1, 3))),
+                "incident_type": rng.choice(INCIDENT_TYPES),
+                "topic": rng.choice(TOPICS),
+                "is_priority": rng.random() < 0.1,
+                "priority_reason": None,
+            })
+            if len(batch) == 5000:
+                conn.execute(insert(Article.__table__), batch)
+                batch = []
+        if batch:
+            conn.execute(insert(Article.__table__), batch)
+
+    return sessionmaker(bind=engine)
+
+
+def legacy_get_articles(db, limit: int) -> bytes:
+    """
+    The pre-projection implementation of get_articles, kept for comparison.
+    """
+    query = db.query(Article).filter(
+        Article.published_date >= datetime.utcnow() - timedelta(days=7)
+    )
+    total = query.count()
+    articles = query.order_by(desc(Article.published_date)).offset(0).limit(limit).all()
+    content = {
+        "total": total,
+        "skip": 0,
+        "limit": limit,
+        "articles": [
+            {
+                "id": a.id,
+                "title": a.title,
+                "link": a.link,
+                "summary": a.summary,
+                "source": a.source,
+                "published_date": a.published_date.isoformat() if a.published_date else None,
+                "locations": a.locations.split(",") if a.locations else [],
+                "incident_type": a.incident_type,
+                "topic": a.topic,
+                "is_priority": a.is_priority,
+                "priority_reason": a.priority_reason,
+            }
+            for a in articles
+        ]
+    }
+    return json.dumps(jsonable_encoder(content)).encode("utf-8")
+
+
+def legacy_search_articles(db, q: str, limit: int) -> bytes:
+    """
+    The pre-projection implementation of search_articles, kept for comparison.
+    """
+    query = db.query(Article).filter(
+        Article.is_security_related == True,
+        or_(
+            Article.title.ilike(f"%{q}%"),
+            Article.summary.ilike(f"%{q}%")
+        )
+    ).order_by(desc(Article.published_date)).limit(limit)
+    content = {
+        "query": q,
+        "results": [
+            {
+                "id": a.id,
+                "title": a.title,
+                "summary": a.summary[:200],
+                "source": a.source,
+                "published_date": a.published_date.isoformat()
+            }
+            for a in query.all()
+        ]
+    }
+    return json.dumps(jsonable_encoder(content)).encode("utf-8")
+
+
+def measure(name: str, func, Session, iterations: int) -> dict:
+    """
+    Run `func(db)` repeatedly and report per-request CPU time and peak allocation.
+    """
+    db = Session()
+    func(db)  # warm up statement caches
+
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    for _ in range(iterations):
+        func(db)
+    cpu_ms = (time.process_time() - cpu_start) * 1000 / iterations
+    wall_ms = (time.perf_counter() - wall_start) * 1000 / iterations
+
+    tracemalloc.start()
+    func(db)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    db.close()
+    return {
+        "name": name,
+        "cpu_ms": round(cpu_ms, 3),
+        "wall_ms": round(wall_ms, 3),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--limit', type=int, default=100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        Session = build_database(os.path.join(tmp, 'bench.db'), args.rows)
+        limit = args.limit
+
+        def new_articles(db):
+            return get_articles(
+                skip=0, limit=limit, source=None, location=None, incident_type=None,
+                topic=None, priority_only=False, days=7, fields=None,
+                summary_length=None, db=db,
+            ).body
+
+        def new_search(db):
+            return search_articles(q='kidnapping', limit=limit, fields=None, summary_length=200, db=db).body
+
+        results = [
+            measure('articles (legacy)', lambda db: legacy_get_articles(db, limit), Session, args.iterations),
+            measure('articles (projected)', new_articles, Session, args.iterations),
+            measure('search (legacy)', lambda db: legacy_search_articles(db, 'kidnapping', limit), Session, args.iterations),
+            measure('search (projected)', new_search, Session, args.iterations),
+        ]
+
+    print(f"rows={args.rows} limit={limit} iterations={args.iterations}")
+    print(f"{'path':<24}{'cpu ms':>10}{'wall ms':>10}{'peak KiB':>11}")
+    for r in results:
+        print(f"{r['name']:<24}{r['cpu_ms']:>10}{r['wall_ms']:>10}{r['peak_kib']:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Measure what logging costs the ingestion threads during one scrape.
+
+Replays the log calls a scrape of --feeds feeds with --entries entries each
+makes, with --duplicates of the entries already stored, in two setups:
+
+    before  logging.basicConfig's synchronous StreamHandler, eager f-strings,
+            a line per feed fetched/processed and per duplicate article
+            (the old save loop)
+    after   services.logging_setup: QueueHandler/QueueListener, lazy
+            %-formatting, sampled per-feed lines and one line of per-run
+            counters
+
+and prints the time spent inside logging calls on the scraping thread and
+the time until everything was written. Output goes to a temporary file so
+terminal speed does not skew the numbers.
+
+Run from the project root:
+    python -m scripts.bench_logging --feeds 60 --entries 20 --runs 20
+"""
+
+import argparse
+import logging
+import tempfile
+import time
+
+from services.logging_setup import SAMPLED, TEXT_FORMAT, configure_logging, stop_logging
+
+logger = logging.getLogger("services.pipeline")
+
+
+def before_scrape(feeds: int, entries: int, duplicates: float):
+    duplicate_count = int(entries * duplicates)
+    for f in range(feeds):
+        source_name = f"source_{f}"
+        logger.info(f"Fetching feed from {source_name}: https://example.com/{source_name}/rss")
+        logger.info(f"Successfully fetched {entries} articles from {source_name}")
+        for e in range(duplicate_count):
+            logger.info(f"Article already exists: https://example.com/{source_name}/{e}")
+    logger.info(f"Scrape completed. Saved {feeds * (entries - duplicate_count)} articles")
+
+
+def after_scrape(feeds: int, entries: int, duplicates: float):
+    duplicate_count = int(entries * duplicates)
+    for f in range(feeds):
+        source_name = f"source_{f}"
+        logger.info("Fetching feed from %s: %s", source_name, f"https://example.com/{source_name}/rss", extra=SAMPLED)
+        logger.info("Processed %d articles from %s", entries, source_name, extra=SAMPLED)
+    stats = {"feeds": feeds, "saved": feeds * (entries - duplicate_count), "skipped": feeds * duplicate_count}
+    logger.info(
+        "Pipeline completed: %d feeds, %d saved, %d skipped",
+        stats["feeds"], stats["saved"], stats["skipped"], extra={"stats": stats},
+    )
+
+
+def measure(setup, teardown, scrape, args) -> tuple:
+    """
+    Best (caller seconds, seconds until flushed, bytes written) over the runs.
+    """
+    results = []
+    for _ in range(args.runs):
+        with tempfile.TemporaryFile("w+") as out:
+            setup(out)
+            started = time.perf_counter()
+            scrape(args.feeds, args.entries, args.duplicates)
+            caller = time.perf_counter() - started
+            teardown()
+            flushed = time.perf_counter() - started
+            results.append((caller, flushed, out.tell()))
+    return min(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--feeds", type=int, default=60)
+    parser.add_argument("--entries", type=int, default=20)
+    parser.add_argument("--duplicates", type=float, default=0.8, help="share of entries already stored")
+    parser.add_argument("--sample-rate", type=float, default=0.1, help="LOG_SAMPLE_RATE for the after run")
+    parser.add_argument("--format", choices=("text", "json"), default="text")
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    def basic_setup(out):
+        logging.basicConfig(level=logging.INFO, format=TEXT_FORMAT, stream=out, force=True)
+
+    def basic_teardown():
+        logging.getLogger().handlers[0].flush()
+
+    def queued_setup(out):
+        configure_logging("INFO", args.format, args.sample_rate, stream=out)
+
+    runs = [
+        ("before", measure(basic_setup, basic_teardown, before_scrape, args)),
+        ("after", measure(queued_setup, stop_logging, after_scrape, args)),
+        # Same call pattern, only the handler changed
+        ("before calls, queued", measure(queued_setup, stop_logging, before_scrape, args)),
+    ]
+
+    print(
+        f"{args.feeds} feeds x {args.entries} entries, {args.duplicates:.0%} duplicates, "
+        f"sample rate {args.sample_rate}, best of {args.runs}"
+    )
+    print(f"{'setup':<24}{'scrape thread ms':>18}{'until written ms':>18}{'bytes':>10}")
+    for name, (caller, flushed, size) in runs:
+        print(f"{name:<24}{caller * 1000:>18.2f}{flushed * 1000:>18.2f}{size:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for the API process.
+
+Measures, over several fresh interpreters:
+  * import time of main (and whether the ingestion stack got imported);
+  * time from spawning uvicorn to the first /health and /api/articles
+    responses, on a first boot (schema not yet stamped, migrations run)
+    and on warm boots of the same database.
+
+Uses a throwaway synthetic SQLite file, never news_platform.db.
+
+Run from the project root:
+    python -m scripts.bench_startup --runs 5 --rows 5000
+    python -m scripts.bench_startup --env RUN_SCHEDULER=true
+"""
+
+import argparse
+import http.client
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from scripts.bench_list_endpoints import build_database
+
+INGESTION_MODULES = ["feedparser", "requests", "bs4", "apscheduler"]
+
+IMPORT_PROBE = (
+    "import sys, time\n"
+    "started = time.perf_counter()\n"
+    "import main\n"
+    "elapsed = time.perf_counter() - started\n"
+    f"loaded = [m for m in {INGESTION_MODULES!r} if m in sys.modules]\n"
+    "print(elapsed, ','.join(loaded))\n"
+)
+
+
+def measure_import(env: dict) -> tuple:
+    """
+    Seconds to import main in a fresh interpreter, and which ingestion
+    modules it pulled in.
+    """
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_PROBE], env=env, capture_output=True, text=True, check=True,
+    ).stdout.split()
+    return float(output[0]), output[1].split(",") if len(output) > 1 else []
+
+
+def wait_for(port: int, path: str, deadline: float) -> float:
+    """
+    Poll path until it answers 200; returns the perf_counter time it did.
+    """
+    while time.perf_counter() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+            conn.request("GET", path)
+            response = conn.getresponse()
+            response.read()
+            if response.status == 200:
+                return time.perf_counter()
+        except OSError:
+            time.sleep(0.01)
+    raise RuntimeError(f"{path} on port {port} did not answer in time")
+
+
+def measure_boot(env: dict, port: int, timeout: float = 60) -> tuple:
+    """
+    Seconds from spawning uvicorn to the first /health and /api/articles responses.
+    """
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+    try:
+        health = wait_for(port, "/health", started + timeout)
+        articles = wait_for(port, "/api/articles?limit=20", started + timeout)
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+    return health - started, articles - started
+
+
+def describe(values: list) -> str:
+    ms = [v * 1000 for v in values]
+    return f"median {statistics.median(ms):7.1f} ms  min {min(ms):7.1f} ms  max {max(ms):7.1f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per measurement")
+    parser.add_argument("--rows", type=int, default=5000, help="synthetic articles to generate")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE",
+                        help="extra environment for the server (repeatable)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "startup.db")
+        print(f"Building synthetic database with {args.rows} articles...")
+        build_database(db_path, args.rows)
+
+        env = dict(
+            os.environ,
+            DATABASE_URL=f"sqlite:///{db_path}",
+            ARCHIVE_DIR=os.path.join(tmp, "archive"),
+            RUN_SCHEDULER="false",
+        )
+        for item in args.env:
+            key, _, value = item.partition("=")
+            env[key] = value
+
+        import_times, loaded = [], set()
+        for _ in range(args.runs):
+            seconds, modules = measure_import(env)
+            import_times.append(seconds)
+            loaded.update(modules)
+
+        first_health, first_articles = measure_boot(env, args.port)
+        warm = [measure_boot(env, args.port) for _ in range(args.runs)]
+
+    print(f"\nimport main            {describe(import_times)}")
+    print(f"  ingestion modules loaded: {', '.join(sorted(loaded)) or 'none'}")
+    print(f"first boot /health     {first_health * 1000:7.1f} ms")
+    print(f"first boot /articles   {first_articles * 1000:7.1f} ms")
+    print(f"warm boot /health      {describe([h for h, _ in warm])}")
+    print(f"warm boot /articles    {describe([a for _, a in warm])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Database diagnostics and maintenance for the database at DATABASE_URL.
+
+Commands:
+    report      page counts per table and index (dbstat), freelist size,
+                planner statistics and a quick integrity check
+    integrity   full PRAGMA integrity_check
+    explain     EXPLAIN QUERY PLAN for every query the main API routes run
+    analyze     PRAGMA optimize, or a full ANALYZE with --full
+    vacuum      incremental VACUUM (--pages N), or switch an existing file
+                to incremental auto_vacuum with --enable-incremental
+    run         what the nightly job does: vacuum, then refresh statistics
+
+Run from the project root:
+    python -m scripts.db_maintenance report --archives
+    python -m scripts.db_maintenance explain
+    DATABASE_URL=sqlite:///./copy.db python -m scripts.db_maintenance vacuum --enable-incremental
+"""
+
+import argparse
+import logging
+import sys
+
+from sqlalchemy import event, text
+
+from database.archive import archive_path, archive_schema, list_archives
+from database.db import engine
+from database.maintenance import (
+    analyze, enable_incremental_vacuum, incremental_vacuum, integrity_check,
+    object_sizes, page_stats, planner_statistics, run_database_maintenance,
+)
+from database.query_log import explain_statement
+
+# Representative requests for each list/analytics route
+API_QUERIES = [
+    ("articles", "/api/articles?days=7&limit=20"),
+    ("articles_filtered", "/api/articles?topic=security&location=Kaduna&days=30&limit=20"),
+    ("articles_priority", "/api/articles?priority_only=true&limit=50"),
+    ("articles_archive", "/api/articles?days=365&limit=20"),
+    ("statistics", "/api/statistics?days=7"),
+    ("timeseries", "/api/timeseries?bucket=day&days=30&group_by=topic"),
+    ("locations", "/api/locations"),
+    ("search", "/api/search?q=kidnapping&limit=20"),
+    ("sources", "/api/sources"),
+    ("topics", "/api/topics"),
+    ("incident_types", "/api/incident-types"),
+]
+
+
+def human_bytes(value: int) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if value < 1024 or unit == "GB":
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+
+
+def print_report(conn, schema: str = "main"):
+    stats = page_stats(conn, schema)
+    print(f"\n== {schema} ==")
+    print(
+        f"{stats['page_count']} pages of {stats['page_size']} B ({human_bytes(stats['size_bytes'])}), "
+        f"{stats['freelist_count']} free ({stats['free_ratio']:.1%}), auto_vacuum={stats['auto_vacuum']}"
+    )
+
+    sizes = object_sizes(conn, schema)
+    if sizes:
+        print(f"\n{'object':<40}{'type':<7}{'pages':>8}{'size':>11}{'unused':>11}")
+        for obj in sizes:
+            print(
+                f"{obj['name']:<40}{obj['type']:<7}{obj['pages']:>8}"
+                f"{human_bytes(obj['bytes']):>11}{human_bytes(obj['unused_bytes']):>11}"
+            )
+
+    planner = planner_statistics(conn, schema)
+    print(f"\nPlanner statistics: {'present' if planner['analyzed'] else 'none (run analyze)'}")
+    for index, stat in sorted(planner["indexes"].items()):
+        print(f"  {index:<38} {stat}")
+    if planner["missing"]:
+        print(f"  without statistics: {', '.join(planner['missing'])}")
+
+    print(f"\nQuick check: {'; '.join(integrity_check(conn, schema, quick=True))}")
+
+
+def for_each_archive(conn, fn):
+    """
+    Call fn(conn, schema) with every archive file attached in turn.
+    """
+    for year, month in list_archives():
+        schema = archive_schema(year, month)
+        conn.execute(text(f"ATTACH DATABASE :path AS {schema}"), {"path": archive_path(year, month)})
+        try:
+            fn(conn, schema)
+        finally:
+            conn.execute(text(f"DETACH DATABASE {schema}"))
+
+
+def explain_api_queries():
+    """
+    Issue API_QUERIES against the app in-process and print the plan of
+    every SELECT the routes execute.
+    """
+    from fastapi.testclient import TestClient
+    from main import app
+
+    captured = []
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            captured.append((statement, explain_statement(cursor, statement, parameters)))
+
+    # Without a `with` block the startup hooks (scheduler, tail) do not run
+    client = TestClient(app)
+    try:
+        for name, path in API_QUERIES:
+            captured.clear()
+            status = client.get(path).status_code
+            print(f"\n== {name}: GET {path} -> {status}")
+            for statement, plan in captured:
+                print(f"  {' '.join(statement.split())[:160]}")
+                for step in plan.split("; "):
+                    print(f"      {step}")
+    finally:
+        event.remove(engine, "after_cursor_execute", _capture)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    report = commands.add_parser("report")
+    report.add_argument("--archives", action="store_true", help="also report every archive file")
+
+    integrity = commands.add_parser("integrity")
+    integrity.add_argument("--archives", action="store_true", help="also check every archive file")
+
+    commands.add_parser("explain")
+
+    analyze_cmd = commands.add_parser("analyze")
+    analyze_cmd.add_argument("--full", action="store_true", help="full ANALYZE instead of PRAGMA optimize")
+
+    vacuum = commands.add_parser("vacuum")
+    vacuum.add_argument("--pages", type=int, default=0, help="free pages to release (0 = all)")
+    vacuum.add_argument("--enable-incremental", action="store_true",
+                        help="set auto_vacuum=INCREMENTAL and rewrite the file with a full VACUUM")
+
+    commands.add_parser("run")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    if engine.dialect.name != "sqlite":
+        sys.exit(f"Only SQLite databases are supported, not {engine.dialect.name}")
+
+    if args.command == "explain":
+        explain_api_queries()
+        return
+    if args.command == "run":
+        print(run_database_maintenance())
+        return
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        if args.command == "report":
+            print_report(conn)
+            if args.archives:
+                for_each_archive(conn, print_report)
+
+        elif args.command == "integrity":
+            def check(conn, schema="main"):
+                print(f"{schema}: {'; '.join(integrity_check(conn, schema))}")
+            check(conn)
+            if args.archives:
+                for_each_archive(conn, check)
+
+        elif args.command == "analyze":
+            analyze(conn, full=args.full)
+            print(f"Planner statistics refreshed ({'ANALYZE' if args.full else 'PRAGMA optimize'})")
+
+        elif args.command == "vacuum":
+            if args.enable_incremental:
+                before = page_stats(conn)
+                enable_incremental_vacuum(conn)
+                after = page_stats(conn)
+                print(
+                    f"auto_vacuum={after['auto_vacuum']}; "
+                    f"{human_bytes(before['size_bytes'])} -> {human_bytes(after['size_bytes'])}"
+                )
+            else:
+                if page_stats(conn)["auto_vacuum"] != "incremental":
+                    sys.exit("auto_vacuum is not INCREMENTAL; run vacuum --enable-incremental first")
+                print(f"Released {incremental_vacuum(conn, args.pages)} free pages")
+
+
+if __name__ == "__main__":
+    main()
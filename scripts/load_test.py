@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Load-testing harness for the HTTP API.
+
+Builds a synthetic database of the requested size (or benchmarks a copy of
+--database, which is never written to), starts uvicorn against it in a
+subprocess with the scheduler off, and replays a dashboard-like
+traffic mix from concurrent keep-alive clients for a fixed duration.
+Prints throughput and p50/p95/p99 latency per route and writes a JSON
+report so runs with different storage or query settings can be compared.
+
+Run from the project root:
+    python -m scripts.load_test --rows 50000 --concurrency 16 --duration 30 \\
+        --output reports/50k.json
+    python -m scripts.load_test --rows 50000 --env ARCHIVE_AFTER_DAYS=30 --output reports/50k-tiered.json
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+from scripts.bench_list_endpoints import build_database
+
+# (name, path, weight): roughly what an open dashboard issues
+DASHBOARD_MIX = [
+    ("articles", "/api/articles?days=7&limit=20", 35),
+    ("articles_priority", "/api/articles?priority_only=true&limit=50", 15),
+    ("articles_filtered", "/api/articles?topic=security&location=Kaduna&days=30&limit=20", 5),
+    ("statistics", "/api/statistics?days=7", 15),
+    ("statistics_30d", "/api/statistics?days=30", 5),
+    ("locations", "/api/locations", 10),
+    ("search", "/api/search?q=kidnapping&limit=20", 10),
+    ("sources", "/api/sources", 5),
+]
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    if not sorted_values:
+        return None
+    rank = max(1, int(round(pct / 100 * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def wait_for_server(port: int, timeout: float = 30) -> float:
+    """
+    Poll /health until the server answers; returns seconds waited.
+    """
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/health")
+            if conn.getresponse().status == 200:
+                return time.perf_counter() - started
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Server on port {port} did not become healthy within {timeout}s")
+
+
+def client_loop(port: int, mix: list, deadline: float, seed: int, samples: list):
+    """
+    One keep-alive client issuing weighted random requests until deadline.
+    """
+    rng = random.Random(seed)
+    names = [m[0] for m in mix]
+    paths = {m[0]: m[1] for m in mix}
+    weights = [m[2] for m in mix]
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+
+    while time.perf_counter() < deadline:
+        name = rng.choices(names, weights)[0]
+        started = time.perf_counter()
+        try:
+            conn.request("GET", paths[name])
+            response = conn.getresponse()
+            response.read()
+            status = response.status
+        except (OSError, http.client.HTTPException):
+            status = 0
+            conn.close()
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        samples.append((name, time.perf_counter() - started, status))
+
+    conn.close()
+
+
+def summarize(samples: list, duration: float) -> dict:
+    """
+    Per-route and overall throughput and latency percentiles (milliseconds).
+    """
+    by_route = {}
+    for name, latency, status in samples:
+        by_route.setdefault(name, []).append((latency, status))
+
+    def stats(entries):
+        latencies = sorted(latency * 1000 for latency, _ in entries)
+        errors = sum(1 for _, status in entries if status != 200)
+        return {
+            "requests": len(entries),
+            "errors": errors,
+            "rps": round(len(entries) / duration, 1),
+            "mean_ms": round(sum(latencies) / len(latencies), 2),
+            "p50_ms": round(percentile(latencies, 50), 2),
+            "p95_ms": round(percentile(latencies, 95), 2),
+            "p99_ms": round(percentile(latencies, 99), 2),
+            "max_ms": round(latencies[-1], 2),
+        }
+
+    return {
+        "routes": {name: stats(entries) for name, entries in sorted(by_route.items())},
+        "overall": stats([(latency, status) for _, latency, status in samples]),
+    }
+
+
+def print_comparison(baseline_path: str, report: dict):
+    """
+    Print per-route throughput and latency changes against an earlier report.
+    """
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+
+    print(f"\nCompared with {baseline_path}")
+    print(f"{'route':<20}{'rps':>16}{'p50 ms':>18}{'p95 ms':>18}")
+    rows = list(report["routes"].items()) + [("OVERALL", report["overall"])]
+    for name, s in rows:
+        before = baseline["overall"] if name == "OVERALL" else baseline["routes"].get(name)
+        if not before:
+            continue
+        print(
+            f"{name:<20}"
+            f"{before['rps']:>7} -> {s['rps']:<6}"
+            f"{before['p50_ms']:>8} -> {s['p50_ms']:<7}"
+            f"{before['p95_ms']:>8} -> {s['p95_ms']:<7}"
+        )
+
+
+def copy_database(source: str, target: str):
+    """
+    Consistent copy of a SQLite file, taken with the online backup API so
+    a database in use (WAL) can be copied too.
+    """
+    src = sqlite3.connect(f"file:{os.path.abspath(source)}?mode=ro", uri=True)
+    dst = sqlite3.connect(target)
+    try:
+        src.backup(dst)
+    finally:
+        dst.close()
+        src.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000, help="synthetic articles to generate")
+    parser.add_argument("--days", type=int, default=90, help="spread synthetic articles over this many days")
+    parser.add_argument("--database", help="use this SQLite file instead of a synthetic one")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=20, help="seconds of load")
+    parser.add_argument("--warmup", type=float, default=2, help="seconds of unrecorded load first")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE",
+                        help="extra environment for the server (repeatable)")
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--baseline", help="earlier JSON report to compare p50/p95 against")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.database:
+            # The server migrates and writes; keep that off the user's file
+            db_path = os.path.join(tmp, "loadtest.db")
+            print(f"Copying {args.database}...")
+            copy_database(args.database, db_path)
+        else:
+            db_path = os.path.join(tmp, "loadtest.db")
+            print(f"Building synthetic database with {args.rows} articles...")
+            build_database(db_path, args.rows, days=args.days)
+
+        # No scheduler: scrapes, maintenance, backups and the startup briefing would skew the numbers
+        env = dict(
+            os.environ,
+            DATABASE_URL=f"sqlite:///{db_path}",
+            ARCHIVE_DIR=os.path.join(tmp, "archive"),
+            BACKUP_DIR=os.path.join(tmp, "backups"),
+            RUN_SCHEDULER="false",
+        )
+        for item in args.env:
+            key, _, value = item.partition("=")
+            env[key] = value
+
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--port", str(args.port),
+             "--workers", str(args.workers), "--log-level", "warning"],
+            env=env,
+        )
+        try:
+            startup_seconds = wait_for_server(args.port)
+
+            warmup_samples = []
+            threads = [
+                threading.Thread(target=client_loop, args=(args.port, DASHBOARD_MIX,
+                                 time.perf_counter() + args.warmup, i, warmup_samples))
+                for i in range(args.concurrency)
+            ]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+            samples = []
+            deadline = time.perf_counter() + args.duration
+            threads = [
+                threading.Thread(target=client_loop, args=(args.port, DASHBOARD_MIX, deadline, 1000 + i, samples))
+                for i in range(args.concurrency)
+            ]
+            started = time.perf_counter()
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            elapsed = time.perf_counter() - started
+        finally:
+            server.terminate()
+            server.wait(timeout=10)
+
+    report = {
+        "generated_at": datetime.utcnow().isoformat(),
+        "config": {
+            "rows": None if args.database else args.rows,
+            "days": args.days,
+            "database": args.database,
+            "concurrency": args.concurrency,
+            "duration_s": round(elapsed, 2),
+            "uvicorn_workers": args.workers,
+            "env": args.env,
+            "mix": [{"name": n, "path": p, "weight": w} for n, p, w in DASHBOARD_MIX],
+        },
+        "startup_s": round(startup_seconds, 2),
+        **summarize(samples, elapsed),
+    }
+
+    print(f"\n{'route':<20}{'reqs':>8}{'err':>6}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, s in list(report["routes"].items()) + [("OVERALL", report["overall"])]:
+        print(f"{name:<20}{s['requests']:>8}{s['errors']:>6}{s['rps']:>9}{s['p50_ms']:>10}{s['p95_ms']:>10}{s['p99_ms']:>10}")
+
+    if args.baseline:
+        print_comparison(args.baseline, report)
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Normalize stored published dates to naive UTC.
+
+Older scrapes stored timezone-aware dates with their offset dropped, so a
+source publishing in WAT (+01:00) was stored an hour ahead of UTC. The
+schema migration (database.migrations.normalize_published_dates) fixes
+those rows at startup:
+  * any value with an offset is converted to naive UTC, and
+  * naive values of a source are shifted back by its offset, detected from
+    rows published after they were extracted and rounded to the nearest
+    half hour.
+Only rows without the published_utc mark (stored before the UTC handling)
+are touched, and each is marked once done, so running this again, or
+after the migration, changes nothing.
+
+Run it by hand before starting the new version to preview the changes
+(--dry-run) or to give a source's offset instead of detecting it
+(--offset source=+0100, which disables detection). Only the hot database
+is handled here; archive files are normalized by the migration.
+
+Usage (from the project root):
+    python -m scripts.normalize_dates --dry-run
+    python -m scripts.normalize_dates --offset punch=+0100
+"""
+
+import argparse
+import logging
+from datetime import timedelta
+
+from database.db import engine
+from database.migrations import add_missing_columns, normalize_published_dates
+from models.article import Article
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def parse_offset(value: str) -> timedelta:
+    """
+    Parse '+0100', '+01:00' or '-0530' into a timedelta.
+    """
+    sign = -1 if value.startswith('-') else 1
+    digits = value.lstrip('+-').replace(':', '')
+    return sign * timedelta(hours=int(digits[:2]), minutes=int(digits[2:4] or 0))
+
+
+def normalize_dates(offsets: dict, dry_run: bool = False):
+    """
+    Normalize the hot database's not yet normalized dates.
+    """
+    with engine.connect() as conn:
+        add_missing_columns(conn, Article.__table__)
+        updated = normalize_published_dates(conn, offsets=offsets or None)
+
+        if dry_run:
+            conn.rollback()
+            logger.info(f"Dry run: {updated} articles would be updated")
+        else:
+            conn.commit()
+            logger.info(f"Migration completed! Updated {updated} articles.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--offset', action='append', default=[], metavar='SOURCE=+HHMM',
+                        help='UTC offset the source stored its dates in (repeatable); disables detection')
+    parser.add_argument('--dry-run', action='store_true')
+    args = parser.parse_args()
+
+    offsets = {}
+    for item in args.offset:
+        source, _, value = item.partition('=')
+        offsets[source] = parse_offset(value)
+
+    normalize_dates(offsets, dry_run=args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Train the linear topic model from the labelled articles in the database.
+
+Every fifth article (by id) is held out to report accuracy against the
+stored topics. The saved model is then refitted on all articles. Use it by
+setting CLASSIFIER_ENGINE=linear (and TOPIC_MODEL_PATH if you used --output).
+
+Run from the project root:
+    python -m scripts.train_topic_model
+    python -m scripts.train_topic_model --days 90 --epochs 300 --output /tmp/topic_model.npz
+"""
+
+import argparse
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+from database.archive import article_source
+from database.db import SessionLocal
+from services.ml_classifier import LinearTopicModel, TOPIC_MODEL_PATH
+
+HOLDOUT_EVERY = 5
+
+
+def load_labelled_articles(days: int) -> list:
+    """
+    (id, title, summary, source, topic) rows from the hot and archived tables.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    db = SessionLocal()
+    try:
+        src = article_source(db, cutoff)
+        return db.query(src.c.id, src.c.title, src.c.summary, src.c.source, src.c.topic).filter(
+            src.c.published_date >= cutoff,
+            src.c.topic.isnot(None),
+            src.c.topic != '',
+        ).order_by(src.c.id).all()
+    finally:
+        db.close()
+
+
+def split(rows: list) -> tuple:
+    """
+    (train, holdout) by id, so the same rows are held out on every run.
+    """
+    train = [r for r in rows if r.id % HOLDOUT_EVERY]
+    holdout = [r for r in rows if not r.id % HOLDOUT_EVERY]
+    return train, holdout
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=3650, help="train on articles published in this many days")
+    parser.add_argument("--epochs", type=int, default=200)
+    parser.add_argument("--learning-rate", type=float, default=0.05)
+    parser.add_argument("--l2", type=float, default=1e-4)
+    parser.add_argument("--output", default=TOPIC_MODEL_PATH)
+    args = parser.parse_args()
+
+    rows = load_labelled_articles(args.days)
+    if not rows:
+        raise SystemExit("No labelled articles found")
+    print(f"Loaded {len(rows)} labelled articles: {dict(Counter(r.topic for r in rows).most_common())}")
+
+    def fit(subset):
+        return LinearTopicModel.train(
+            [(r.title, r.summary) for r in subset], [r.topic for r in subset],
+            epochs=args.epochs, learning_rate=args.learning_rate, l2=args.l2,
+        )
+
+    train, holdout = split(rows)
+    if train and holdout:
+        model = fit(train)
+        predicted = model.predict([(r.title, r.summary) for r in holdout])
+        correct = sum(p == r.topic for p, r in zip(predicted, holdout))
+        print(f"Holdout accuracy: {correct}/{len(holdout)} ({correct / len(holdout):.1%})")
+
+    started = time.perf_counter()
+    model = fit(rows)
+    print(f"Trained on all {len(rows)} articles in {time.perf_counter() - started:.1f}s")
+    model.save(args.output)
+    print(f"Model written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Feed the API process's live views from the database.
+
+When ingestion runs in the separate worker process (RUN_SCHEDULER=false),
+the API never sees scrape_and_save_articles() commit. This thread polls
+for article ids above the last one seen and publishes them to the SSE
+broadcaster and the trend engine, so both processes communicate only
+through the database.
+"""
+import logging
+import os
+import threading
+from typing import Optional
+
+from sqlalchemy import func
+
+from database.db import SessionLocal
+from models.article import Article
+from services.events import article_event, broadcaster
+from services.trends import trend_engine
+
+logger = logging.getLogger(__name__)
+
+TAIL_INTERVAL_SECONDS = float(os.getenv("TAIL_INTERVAL_SECONDS", "5"))
+TAIL_BATCH_SIZE = 500
+
+
+class ArticleTail:
+    """
+    Background poller for newly inserted articles.
+    """
+    
+    def __init__(self, interval: float = TAIL_INTERVAL_SECONDS):
+        self.interval = interval
+        self.last_id = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def mark_current(self) -> int:
+        """
+        Start tailing after the newest stored article; returns its id.
+        """
+        db = SessionLocal()
+        try:
+            self.last_id = db.query(func.max(Article.id)).scalar() or 0
+        finally:
+            db.close()
+        return self.last_id
+    
+    def poll(self) -> int:
+        """
+        Publish articles saved since the last poll. Returns how many.
+        """
+        published = 0
+        db = SessionLocal()
+        try:
+            while True:
+                articles = db.query(Article).filter(
+                    Article.id > self.last_id
+                ).order_by(Article.id).limit(TAIL_BATCH_SIZE).all()
+                if not articles:
+                    break
+                
+                broadcaster.publish([article_event(a) for a in articles])
+                trend_engine.record_many(
+                    {
+                        'published_date': a.published_date,
+                        'locations': a.locations,
+                        'incident_type': a.incident_type,
+                        'topic': a.topic,
+                    }
+                    for a in articles
+                )
+                self.last_id = articles[-1].id
+                published += len(articles)
+        finally:
+            db.close()
+        
+        if published:
+            logger.info(f"Picked up {published} new articles from the database")
+        return published
+    
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception as e:
+                logger.error(f"Error tailing articles: {e}")
+    
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="article-tail", daemon=True)
+            self._thread.start()
+            logger.info(f"Tailing new articles every {self.interval}s from id {self.last_id}")
+    
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join(timeout=self.interval + 5)
+            self._thread = None
+
+
+article_tail = ArticleTail()
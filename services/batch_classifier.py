@@ -0,0 +1,69 @@
+"""
+Batch classification on the shared process pool.
+
+Large backfills are split into chunks so each worker call amortises the
+pickling overhead, and results come back in input order.
+"""
+import logging
+import math
+import os
+import time
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from services.classifier import classify_articles
+from services.process_pool import get_process_pool, PROCESS_POOL_WORKERS
+
+logger = logging.getLogger(__name__)
+
+MAX_CLASSIFY_BATCH = int(os.getenv("MAX_CLASSIFY_BATCH", "1000"))
+CLASSIFY_CHUNK_SIZE = int(os.getenv("CLASSIFY_CHUNK_SIZE", "200"))
+
+# (title, summary) or (title, summary, source)
+BatchItem = Tuple[str, ...]
+
+
+def _classify_chunk(items: Sequence[BatchItem]) -> List[dict]:
+    """
+    Runs in a worker process: classify a chunk of items in order.
+    """
+    return classify_articles(items)
+
+
+def classify_batch(items: Sequence[BatchItem], chunk_size: Optional[int] = None) -> Tuple[List[dict], dict]:
+    """
+    Classify many articles across the process pool.
+    
+    Args:
+        items: (title, summary) or (title, summary, source) tuples
+        chunk_size: items per worker task; by default the batch is spread
+            evenly over the workers, up to CLASSIFY_CHUNK_SIZE per task
+    
+    Returns:
+        (results, stats): classify_article() dicts in input order, and
+        throughput figures for the batch
+    """
+    items = [tuple(item) for item in items]
+    if not items:
+        return [], {"count": 0, "chunks": 0, "elapsed_ms": 0.0, "items_per_second": 0.0}
+    
+    if chunk_size is None:
+        chunk_size = min(CLASSIFY_CHUNK_SIZE, math.ceil(len(items) / PROCESS_POOL_WORKERS))
+    chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+    
+    started = time.perf_counter()
+    results = []
+    for chunk_results in get_process_pool().map(_classify_chunk, chunks):
+        results.extend(chunk_results)
+    elapsed = time.perf_counter() - started
+    
+    stats = {
+        "count": len(results),
+        "chunks": len(chunks),
+        "elapsed_ms": round(elapsed * 1000, 2),
+        "items_per_second": round(len(results) / elapsed, 1) if elapsed > 0 else None,
+    }
+    logger.info(
+        f"Classified {stats['count']} articles in {stats['chunks']} chunks "
+        f"({stats['items_per_second']} items/s)"
+    )
+    return results, stats
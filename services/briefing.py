@@ -0,0 +1,189 @@
+"""
+Materialized priority briefing.
+
+After every scrape the priority articles (is_priority, i.e. Abuja/FCT
+traffic and security) from the last BRIEFING_WINDOW_HOURS are grouped by
+topic and location, reports of the same story from several outlets are
+collapsed into one entry, and the result is serialized once and stored in
+the briefings table. /api/briefing serves those stored bytes with an ETag
+instead of filtering, sorting and counting per request.
+
+Two titles are the same story when they share at least
+BRIEFING_DUPLICATE_MIN_WORDS significant words and BRIEFING_DUPLICATE_OVERLAP
+of the shorter title's words. The ETag is a hash of the document, which
+holds no generation timestamp, so a scrape that changes nothing keeps the
+stored row and clients keep getting 304s.
+"""
+from datetime import datetime, timedelta
+from typing import Dict, List
+import hashlib
+import logging
+import os
+import re
+
+import orjson
+from sqlalchemy.orm import Session
+
+from models.article import Article
+from models.briefing import Briefing
+
+logger = logging.getLogger(__name__)
+
+BRIEFING_WINDOW_HOURS = int(os.getenv("BRIEFING_WINDOW_HOURS", "24"))
+BRIEFING_MAX_ARTICLES = int(os.getenv("BRIEFING_MAX_ARTICLES", "500"))
+BRIEFING_DUPLICATE_OVERLAP = float(os.getenv("BRIEFING_DUPLICATE_OVERLAP", "0.5"))
+BRIEFING_DUPLICATE_MIN_WORDS = int(os.getenv("BRIEFING_DUPLICATE_MIN_WORDS", "3"))
+
+# Stories are filed under the first of these they mention, else their first location
+PRIMARY_LOCATIONS = ("FCT", "Abuja")
+
+_WORD = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset({
+    "a", "an", "and", "as", "at", "by", "for", "from", "in", "into", "is", "of",
+    "on", "or", "over", "the", "to", "with", "after", "says",
+})
+
+BRIEFING_FIELDS = (
+    Article.id, Article.title, Article.link, Article.source, Article.published_date,
+    Article.locations, Article.incident_type, Article.topic, Article.priority_reason,
+)
+
+
+def _title_words(title: str) -> frozenset:
+    return frozenset(w for w in _WORD.findall((title or '').lower()) if w not in _STOPWORDS and len(w) > 1)
+
+
+def _same_story(a: frozenset, b: frozenset) -> bool:
+    shared = len(a & b)
+    return (
+        shared >= BRIEFING_DUPLICATE_MIN_WORDS
+        and shared >= BRIEFING_DUPLICATE_OVERLAP * min(len(a), len(b))
+    )
+
+
+def _primary_location(locations: List[str]) -> str:
+    for location in PRIMARY_LOCATIONS:
+        if location in locations:
+            return location
+    return locations[0] if locations else "Unspecified"
+
+
+def collapse_stories(rows: list) -> List[Dict]:
+    """
+    Cluster rows of one topic into stories. Rows arrive oldest first, so
+    each story is headed by its first report.
+    """
+    stories = []
+    for row in rows:
+        words = _title_words(row.title)
+        locations = row.locations.split(",") if row.locations else []
+        for story in stories:
+            if _same_story(words, story["_words"]):
+                story["_words"] |= words
+                story["article_ids"].append(row.id)
+                if row.source not in story["sources"]:
+                    story["sources"].append(row.source)
+                story["locations"].extend(l for l in locations if l not in story["locations"])
+                if row.published_date:
+                    story["last_published"] = row.published_date.isoformat()
+                break
+        else:
+            published = row.published_date.isoformat() if row.published_date else None
+            stories.append({
+                "_words": words,
+                "title": row.title,
+                "link": row.link,
+                "source": row.source,
+                "sources": [row.source],
+                "incident_type": row.incident_type,
+                "priority_reason": row.priority_reason,
+                "locations": locations,
+                "first_published": published,
+                "last_published": published,
+                "article_ids": [row.id],
+            })
+    for story in stories:
+        del story["_words"]
+        story["report_count"] = len(story["article_ids"])
+    return stories
+
+
+def build_briefing(db: Session, window_hours: int = BRIEFING_WINDOW_HOURS) -> Dict:
+    """
+    The briefing document: topics -> locations -> stories, largest first.
+    """
+    since = datetime.utcnow() - timedelta(hours=window_hours)
+    rows = db.query(*BRIEFING_FIELDS).filter(
+        Article.is_priority == True,
+        Article.published_date >= since,
+    ).order_by(Article.published_date.desc()).limit(BRIEFING_MAX_ARTICLES).all()
+    rows.reverse()
+    
+    by_topic: Dict[str, list] = {}
+    for row in rows:
+        by_topic.setdefault(row.topic or "general", []).append(row)
+    
+    topics = []
+    for topic, topic_rows in by_topic.items():
+        by_location: Dict[str, list] = {}
+        for story in collapse_stories(topic_rows):
+            by_location.setdefault(_primary_location(story["locations"]), []).append(story)
+        locations = [
+            {
+                "location": location,
+                "story_count": len(stories),
+                "stories": sorted(stories, key=lambda s: s["last_published"] or "", reverse=True),
+            }
+            for location, stories in by_location.items()
+        ]
+        locations.sort(key=lambda l: (-l["story_count"], l["location"]))
+        topics.append({
+            "topic": topic,
+            "article_count": len(topic_rows),
+            "story_count": sum(l["story_count"] for l in locations),
+            "locations": locations,
+        })
+    topics.sort(key=lambda t: (-t["story_count"], t["topic"]))
+    
+    return {
+        "window_hours": window_hours,
+        "article_count": len(rows),
+        "story_count": sum(t["story_count"] for t in topics),
+        "topics": topics,
+    }
+
+
+def refresh_briefing(db: Session, window_hours: int = BRIEFING_WINDOW_HOURS) -> Briefing:
+    """
+    Rebuild the briefing and store it if it changed. Returns the current row.
+    """
+    try:
+        document = build_briefing(db, window_hours)
+        data = orjson.dumps(document)
+        etag = hashlib.blake2b(data, digest_size=16).hexdigest()
+        
+        current = db.query(Briefing).order_by(Briefing.id.desc()).first()
+        if current is not None and current.etag == etag and current.window_hours == window_hours:
+            logger.info(f"Briefing unchanged ({document['story_count']} stories)")
+            return current
+        
+        briefing = Briefing(
+            etag=etag,
+            window_hours=window_hours,
+            article_count=document["article_count"],
+            story_count=document["story_count"],
+            document=data,
+        )
+        db.add(briefing)
+        db.flush()
+        # Only the latest briefing is served
+        db.query(Briefing).filter(Briefing.id < briefing.id).delete(synchronize_session=False)
+        db.commit()
+        logger.info(
+            f"Briefing regenerated: {document['story_count']} stories from "
+            f"{document['article_count']} priority articles"
+        )
+        return briefing
+    except Exception:
+        db.rollback()
+        raise
@@ -1,4 +1,13 @@
+import os
 import re
+from datetime import datetime
+from typing import List, Sequence, Tuple
+
+from services.gazetteer import get_gazetteer
+
+# Topic engine: 'rules' (keyword rules below) or 'linear' (the trained
+# model in services.ml_classifier, which needs numpy and scipy)
+CLASSIFIER_ENGINE = os.getenv("CLASSIFIER_ENGINE", "rules").lower()
 
 # Topic/Category Keywords (comprehensive for ALL news types)
 TOPIC_KEYWORDS = {
@@ -96,7 +105,9 @@ SECURITY_KEYWORDS = {
 }
 
 # Nigerian states and major cities (All 36 states + FCT)
-# Updated to prevent false matches and improve accuracy
+# The values are the canonical location names listed by /api/locations.
+# Matching itself uses the gazetteer (services/data/gazetteer.csv), which
+# also covers all 774 LGAs and major towns.
 LOCATION_KEYWORDS = {
     # Country - must be exact to avoid confusion with Niger state
     'nigeria': 'Nigeria',
@@ -141,6 +152,7 @@ LOCATION_KEYWORDS = {
     # North-Central Region
     'kwara': 'Kwara',
     'kogi': 'Kogi',
+    'benue': 'Benue',
     'niger': 'Niger',
     'plateau': 'Plateau',
     'nasarawa': 'Nasarawa',
@@ -152,6 +164,7 @@ LOCATION_KEYWORDS = {
     'lokoja': 'Kogi',
     'minna': 'Niger',
     'lafia': 'Nasarawa',
+    'makurdi': 'Benue',
     
     # Northwest Region
     'kaduna': 'Kaduna',
@@ -196,10 +209,30 @@ INCIDENT_PATTERNS = {
     'communal_conflict': r'\b(communal clash|land dispute|inter-ethnic|border dispute)\b',
 }
 
+# Sources whose topic is fixed regardless of the text
+SOURCE_TOPICS = {
+    'techcabal': 'technology',
+    'disrupt_africa': 'technology',
+    'sports_ng': 'sports',
+}
+
+
+# Compiled once at import instead of going through re's pattern cache per call
+_KEYWORD_PATTERNS = {
+    keyword: re.compile(r'\b' + re.escape(keyword) + r'\b')
+    for config in TOPIC_KEYWORDS.values()
+    for keyword in config['keywords']
+}
+_INCIDENT_REGEXES = {
+    incident_type: re.compile(pattern, re.IGNORECASE)
+    for incident_type, pattern in INCIDENT_PATTERNS.items()
+}
+
 
-def classify_topic(article_title: str, article_summary: str) -> tuple[str, int]:
+def classify_topic(article_title: str, article_summary: str, locations: list[str] = None) -> tuple[str, int]:
     """
     Classify article into a topic category.
+    Pass locations when they are already known to skip extracting them again.
     Returns: (topic, priority) where priority=0 for normal, 1 for priority
     """
     text = (article_title + ' ' + article_summary).lower()
@@ -218,14 +251,14 @@ def classify_topic(article_title: str, article_summary: str) -> tuple[str, int]:
                         'nutrition', 'diet', 'benefit', 'healthy']
     if any(indicator in title_lower for indicator in health_indicators):
         return 'health', 0
-        
+    
     # Technology topics
     tech_indicators = ['tech', 'technology', 'digital', 'software', 'app', 'startup',
                       'artificial intelligence', 'ai', 'blockchain', 'data', 'cyber',
                       'computer', 'internet', 'website', 'platform', 'system']
     if any(indicator in title_lower for indicator in tech_indicators):
         return 'technology', 0
-        
+    
     # Security topics
     security_indicators = ['kill', 'killed', 'attack', 'terror', 'bomb', 'shoot', 'rob',
                          'robbery', 'kidnap', 'abduct', 'murder', 'death', 'dead',
@@ -244,7 +277,8 @@ def classify_topic(article_title: str, article_summary: str) -> tuple[str, int]:
         ]
         if not any(fp in text for fp in false_positives):
             # Extract locations for priority check
-            locations = extract_locations(article_title, article_summary)
+            if locations is None:
+                locations = extract_locations(article_title, article_summary)
             priority_locations = TOPIC_KEYWORDS['security']['priority_locations']
             is_priority = 1 if any(loc in priority_locations for loc in locations) else 0
             return 'security', is_priority
@@ -256,12 +290,12 @@ def classify_topic(article_title: str, article_summary: str) -> tuple[str, int]:
     for topic, config in TOPIC_KEYWORDS.items():
         if topic == 'security':  # Skip security as we already checked it
             continue
-            
+        
         score = 0
         for keyword in config['keywords']:
             if keyword in text:
                 # Use word boundaries to avoid partial matches
-                if re.search(r'\b' + re.escape(keyword) + r'\b', text):
+                if _KEYWORD_PATTERNS[keyword].search(text):
                     score += config['weight']
         
         topic_scores[topic] = score
@@ -276,7 +310,8 @@ def classify_topic(article_title: str, article_summary: str) -> tuple[str, int]:
     
     # Check for priority locations
     if best_topic in ['traffic', 'security']:
-        locations = extract_locations(article_title, article_summary)
+        if locations is None:
+            locations = extract_locations(article_title, article_summary)
         priority_locations = TOPIC_KEYWORDS[best_topic]['priority_locations']
         if any(loc in priority_locations for loc in locations):
             is_priority = 1
@@ -341,33 +376,42 @@ def is_security_related(article_title: str, article_summary: str) -> tuple[bool,
     return is_security, confidence
 
 
+def resolve_locations(article_title: str, article_summary: str) -> list[dict]:
+    """
+    Resolve places mentioned in the article against the gazetteer.
+    Returns one entry per distinct place with its LGA (None if the mention
+    is state-level) and state, in order of first mention.
+    """
+    places = get_gazetteer().resolve(article_title + ' ' + article_summary)
+    
+    results = {}
+    for place in places:
+        key = (place.lga or None, place.state)
+        if key not in results:
+            results[key] = {'lga': place.lga or None, 'state': place.state}
+    return list(results.values())
+
+
+def locations_from_places(places: list[dict]) -> list[str]:
+    """
+    Unique location names (states, FCT or Nigeria) of resolved places,
+    in order of first mention.
+    """
+    found_locations = dict.fromkeys(place['state'] for place in places)
+    
+    # Special case: a Niger State mention takes precedence over the generic country
+    if 'Niger' in found_locations:
+        found_locations.pop('Nigeria', None)
+    
+    return list(found_locations)
+
+
 def extract_locations(article_title: str, article_summary: str) -> list[str]:
     """
     Extract Nigerian locations mentioned in the article with improved accuracy.
-    Returns a list of unique location names.
+    Returns a list of unique location names (states, FCT or Nigeria).
     """
-    text = (article_title + ' ' + article_summary).lower()
-    found_locations = set()
-    
-    # First, check for Nigeria specifically to avoid confusion with Niger state
-    if re.search(r'\bniger(?:ia|ian|ians)\b', text) and not re.search(r'\bniger(?:\s+state|\s+republic|\s+\w+\s+state)\b', text, re.IGNORECASE):
-        found_locations.add('Nigeria')
-    
-    # Check for other locations
-    for pattern, location_name in LOCATION_KEYWORDS.items():
-        if re.search(pattern, text, re.IGNORECASE):
-            # Special case: Don't add Niger state if we already have Nigeria
-            if location_name == 'Niger' and 'Nigeria' in found_locations:
-                found_locations.discard('Nigeria')
-            found_locations.add(location_name)
-    
-    # Remove locations that are substrings of other found locations
-    final_locations = []
-    for loc in found_locations:
-        if not any(loc != other and loc in other for other in found_locations):
-            final_locations.append(loc)
-    
-    return final_locations
+    return locations_from_places(resolve_locations(article_title, article_summary))
 
 
 def classify_incident_type(article_title: str, article_summary: str) -> str:
@@ -376,14 +420,35 @@ def classify_incident_type(article_title: str, article_summary: str) -> str:
     """
     text = (article_title + ' ' + article_summary).lower()
     
-    for incident_type, pattern in INCIDENT_PATTERNS.items():
-        if re.search(pattern, text, re.IGNORECASE):
+    for incident_type, pattern in _INCIDENT_REGEXES.items():
+        if pattern.search(text):
             return incident_type
     
     return 'other'
 
 
-def classify_article(article_title: str, article_summary: str, source: str = None) -> dict:
+def _priority_reason(is_priority: bool, topic: str, locations: list[str]) -> str:
+    if not is_priority:
+        return None
+    if topic == 'security':
+        return f"Security incident in {', '.join(locations) if locations else 'a key location'}"
+    if topic == 'traffic':
+        return f"Traffic update for {', '.join(locations) if locations else 'a major city'}"
+    return None
+
+
+def topic_priority(topic: str, locations: list[str]) -> bool:
+    """
+    Whether a security or traffic article mentions one of its topic's
+    priority locations; the priority classify_topic() reports.
+    """
+    if topic not in ('security', 'traffic'):
+        return False
+    return any(loc in TOPIC_KEYWORDS[topic]['priority_locations'] for loc in locations)
+
+
+def classify_article(article_title: str, article_summary: str, source: str = None,
+                     predicted_topic: str = None) -> dict:
     """
     Comprehensive article classification with improved topic and location detection.
     
@@ -391,21 +456,29 @@ def classify_article(article_title: str, article_summary: str, source: str = Non
         article_title: The title of the article
         article_summary: The summary/content of the article
         source: (Optional) The news source for source-specific rules
+        predicted_topic: (Optional) Topic from the trained model; replaces the
+            keyword rules, and priority is derived from it
     
     Returns:
         dict: Classification results including topic, locations, and other metadata
     """
     # Get base classification
     is_security, confidence = is_security_related(article_title, article_summary)
-    locations = extract_locations(article_title, article_summary)
+    # One gazetteer pass gives both the LGAs and the location names
+    places = resolve_locations(article_title, article_summary)
+    locations = locations_from_places(places)
     incident_type = classify_incident_type(article_title, article_summary)
     
     # Determine topic with source-specific rules
-    topic, is_priority = classify_topic(article_title, article_summary)
+    if predicted_topic is None:
+        topic, is_priority = classify_topic(article_title, article_summary, locations)
+    else:
+        topic, is_priority = predicted_topic, False
     
     # Special handling for security-related articles
     if is_security and confidence >= 5:
-        topic = 'security'
+        if predicted_topic is None:
+            topic = 'security'
         # If security-related but no incident type, try to classify based on content
         if incident_type == 'other':
             if any(word in article_title.lower() for word in ['kill', 'dead', 'death', 'murder']):
@@ -414,30 +487,49 @@ def classify_article(article_title: str, article_summary: str, source: str = Non
                 incident_type = 'armed_robbery'
     
     # Source-specific adjustments
-    if source and source.lower() in ['techcabal', 'disrupt_africa']:
-        topic = 'technology'
-    elif source and source.lower() in ['sports_ng']:
-        topic = 'sports'
+    if source and source.lower() in SOURCE_TOPICS:
+        topic = SOURCE_TOPICS[source.lower()]
+    
+    if predicted_topic is not None:
+        is_priority = topic_priority(topic, locations)
+    # The priority_locations rule alone; this is what ingestion stores
+    stored_priority = bool(is_priority)
     
     # Location-based priority
     priority_locations = ['Abuja', 'FCT', 'Lagos', 'Kaduna']
     is_priority = is_priority or any(loc in priority_locations for loc in locations)
     
-    # Build priority reason
-    priority_reason = None
-    if is_priority:
-        if topic == 'security':
-            priority_reason = f"Security incident in {', '.join(locations) if locations else 'a key location'}"
-        elif topic == 'traffic':
-            priority_reason = f"Traffic update for {', '.join(locations) if locations else 'a major city'}"
-    
     return {
         'is_security_related': is_security,
         'confidence': confidence,
         'locations': locations,
+        'lgas': [p for p in places if p['lga']],
         'incident_type': incident_type,
         'topic': topic,
         'is_priority': is_priority,
-        'priority_reason': priority_reason,
+        'stored_priority': stored_priority,
+        'priority_reason': _priority_reason(is_priority, topic, locations),
         'processed_at': datetime.utcnow().isoformat()
     }
+
+
+def classify_articles(items: Sequence[Tuple[str, ...]]) -> List[dict]:
+    """
+    classify_article() for a batch of (title, summary) or
+    (title, summary, source) tuples, in order.
+    With CLASSIFIER_ENGINE=linear the topics of the whole batch come from
+    the trained model in one pass instead of the keyword rules;
+    source-specific topics still apply.
+    """
+    topics = None
+    if CLASSIFIER_ENGINE == 'linear' and items:
+        from services.ml_classifier import predict_topics
+        topics = predict_topics([(item[0], item[1] or '') for item in items])
+    if topics is None:
+        topics = [None] * len(items)
+    
+    results = []
+    for item, topic in zip(items, topics):
+        source = item[2] if len(item) > 2 else None
+        results.append(classify_article(item[0], item[1] or '', source=source, predicted_topic=topic))
+    return results
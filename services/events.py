@@ -0,0 +1,134 @@
+"""
+In-process broadcast of newly saved articles.
+
+scrape_and_save_articles publishes each committed batch here; every
+streaming client holds a Subscription with its own bounded queue. A client
+that falls behind is disconnected rather than silently skipped, and its
+EventSource reconnects with Last-Event-ID to replay the gap from the database.
+"""
+import asyncio
+import logging
+import os
+import threading
+from typing import Dict, List, Optional
+
+from models.article import Article
+
+logger = logging.getLogger(__name__)
+
+STREAM_QUEUE_SIZE = int(os.getenv("STREAM_QUEUE_SIZE", "100"))
+MAX_STREAM_CLIENTS = int(os.getenv("MAX_STREAM_CLIENTS", "100"))
+
+
+def article_event(article: Article) -> Dict:
+    """
+    Event payload for an article, in the same shape as /api/articles.
+    """
+    return {
+        "id": article.id,
+        "title": article.title,
+        "link": article.link,
+        "summary": article.summary,
+        "source": article.source,
+        "published_date": article.published_date.isoformat() if article.published_date else None,
+        "locations": article.locations.split(",") if article.locations else [],
+        "incident_type": article.incident_type,
+        "topic": article.topic,
+        "is_priority": bool(article.is_priority),
+        "priority_reason": article.priority_reason,
+    }
+
+
+class ArticleFilter:
+    """
+    Subset of the /api/articles filters a stream client can subscribe with.
+    """
+    
+    def __init__(self, topic: str = None, location: str = None, priority_only: bool = False):
+        self.topic = topic
+        self.location = location
+        self.priority_only = priority_only
+    
+    def matches(self, event: Dict) -> bool:
+        if self.topic and event["topic"] != self.topic:
+            return False
+        if self.location and self.location not in event["locations"]:
+            return False
+        if self.priority_only and not event["is_priority"]:
+            return False
+        return True
+
+
+class Subscription:
+    """
+    One streaming client: a filter and a bounded asyncio queue on the client's loop.
+    """
+    
+    def __init__(self, loop: asyncio.AbstractEventLoop, article_filter: ArticleFilter):
+        self.loop = loop
+        self.filter = article_filter
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=STREAM_QUEUE_SIZE)
+        self.overflowed = False
+    
+    def offer(self, event: Dict):
+        """
+        Called from the publishing thread; hands the event to the client's loop.
+        """
+        self.loop.call_soon_threadsafe(self._put, event)
+    
+    def _put(self, event: Dict):
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Client cannot keep up; end its stream so it resumes from the DB
+            self.overflowed = True
+
+
+class ArticleBroadcaster:
+    """
+    Fan-out of new article events to all current subscriptions.
+    """
+    
+    def __init__(self):
+        self._subscriptions = set()
+        self._lock = threading.Lock()
+    
+    def subscribe(self, article_filter: ArticleFilter) -> Optional[Subscription]:
+        """
+        Register a client on the running event loop.
+        Returns None when MAX_STREAM_CLIENTS is reached.
+        """
+        subscription = Subscription(asyncio.get_running_loop(), article_filter)
+        with self._lock:
+            if len(self._subscriptions) >= MAX_STREAM_CLIENTS:
+                return None
+            self._subscriptions.add(subscription)
+        return subscription
+    
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+    
+    def publish(self, events: List[Dict]):
+        """
+        Deliver events to every subscription whose filter they match.
+        """
+        if not events:
+            return
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        
+        for subscription in subscriptions:
+            for event in events:
+                if subscription.filter.matches(event):
+                    try:
+                        subscription.offer(event)
+                    except RuntimeError:
+                        # The client's event loop has closed
+                        self.unsubscribe(subscription)
+                        break
+
+
+broadcaster = ArticleBroadcaster()
@@ -0,0 +1,148 @@
+"""
+Feed registry backed by the `feeds` table.
+
+The scraper reads the registry at the start of every run, so sources
+added, removed or toggled through the admin endpoints apply to the next
+scrape without a redeploy. NIGERIAN_NEWS_FEEDS only seeds sources missing
+from the table.
+
+Each attempt records latency, bytes, entries and errors. After
+FEED_FAILURE_THRESHOLD consecutive failures the circuit opens: the feed is
+skipped until retry_after, which starts at FEED_BACKOFF_BASE_HOURS and
+doubles with every further failure up to FEED_BACKOFF_MAX_HOURS. The first
+success closes it again.
+"""
+from datetime import datetime, timedelta
+from typing import List, Optional
+import logging
+import os
+
+from sqlalchemy.orm import Session
+
+from database.db import SessionLocal
+from models.feed import Feed
+
+logger = logging.getLogger(__name__)
+
+FEED_FAILURE_THRESHOLD = int(os.getenv("FEED_FAILURE_THRESHOLD", "2"))
+FEED_BACKOFF_BASE_HOURS = float(os.getenv("FEED_BACKOFF_BASE_HOURS", "6"))
+FEED_BACKOFF_MAX_HOURS = float(os.getenv("FEED_BACKOFF_MAX_HOURS", "168"))
+
+
+def seed_feeds(db: Session) -> int:
+    """
+    Add built-in sources that are not in the table yet. Returns how many.
+    """
+    from scrapers.rss_scraper import NIGERIAN_NEWS_FEEDS
+    
+    known = {name for (name,) in db.query(Feed.name)}
+    added = 0
+    for name, url in NIGERIAN_NEWS_FEEDS.items():
+        if name not in known:
+            db.add(Feed(name=name, url=url))
+            added += 1
+    if added:
+        db.commit()
+        logger.info(f"Seeded {added} feeds into the registry")
+    return added
+
+
+def backoff_for(failures: int) -> Optional[timedelta]:
+    """
+    How long to skip a feed after `failures` consecutive failures.
+    """
+    if failures < FEED_FAILURE_THRESHOLD:
+        return None
+    hours = FEED_BACKOFF_BASE_HOURS * 2 ** (failures - FEED_FAILURE_THRESHOLD)
+    return timedelta(hours=min(hours, FEED_BACKOFF_MAX_HOURS))
+
+
+def circuit_state(feed: Feed, now: datetime = None) -> str:
+    """
+    'disabled', 'open' (being skipped) or 'closed'.
+    """
+    now = now or datetime.utcnow()
+    if not feed.enabled:
+        return "disabled"
+    if feed.retry_after and feed.retry_after > now:
+        return "open"
+    return "closed"
+
+
+def due_feeds(db: Session) -> List[Feed]:
+    """
+    Enabled feeds whose circuit is closed, i.e. the ones to fetch this run.
+    """
+    now = datetime.utcnow()
+    feeds = db.query(Feed).filter(Feed.enabled == True).order_by(Feed.name).all()
+    skipped = [f.name for f in feeds if circuit_state(f, now) == "open"]
+    if skipped:
+        logger.info(f"Skipping feeds with open circuit: {', '.join(skipped)}")
+    return [f for f in feeds if circuit_state(f, now) == "closed"]
+
+
+def record_success(db: Session, name: str, latency_ms: float, size: int, entries: int):
+    feed = db.query(Feed).filter(Feed.name == name).first()
+    if feed is None:
+        return
+    now = datetime.utcnow()
+    feed.last_attempt_at = now
+    feed.last_success_at = now
+    feed.last_latency_ms = round(latency_ms, 1)
+    feed.last_bytes = size
+    feed.last_entries = entries
+    feed.last_error = None
+    if feed.consecutive_failures:
+        logger.info(f"Feed {name} recovered after {feed.consecutive_failures} failures")
+    feed.consecutive_failures = 0
+    feed.retry_after = None
+
+
+def record_failure(db: Session, name: str, error: str, latency_ms: float = None):
+    feed = db.query(Feed).filter(Feed.name == name).first()
+    if feed is None:
+        return
+    now = datetime.utcnow()
+    feed.last_attempt_at = now
+    feed.last_latency_ms = round(latency_ms, 1) if latency_ms is not None else None
+    feed.last_error = (error or '')[:500]
+    feed.consecutive_failures = (feed.consecutive_failures or 0) + 1
+    
+    backoff = backoff_for(feed.consecutive_failures)
+    if backoff:
+        feed.retry_after = now + backoff
+        logger.warning(
+            f"Feed {name} failed {feed.consecutive_failures} times in a row; "
+            f"skipping it until {feed.retry_after:%Y-%m-%d %H:%M} UTC"
+        )
+
+
+def feed_status(feed: Feed) -> dict:
+    """
+    Admin view of a feed and its health.
+    """
+    return {
+        "name": feed.name,
+        "url": feed.url,
+        "enabled": feed.enabled,
+        "circuit": circuit_state(feed),
+        "retry_after": feed.retry_after.isoformat() if feed.retry_after else None,
+        "consecutive_failures": feed.consecutive_failures,
+        "last_attempt_at": feed.last_attempt_at.isoformat() if feed.last_attempt_at else None,
+        "last_success_at": feed.last_success_at.isoformat() if feed.last_success_at else None,
+        "last_latency_ms": feed.last_latency_ms,
+        "last_bytes": feed.last_bytes,
+        "last_entries": feed.last_entries,
+        "last_error": feed.last_error,
+    }
+
+
+def init_feed_registry():
+    """
+    Seed the registry on startup.
+    """
+    db = SessionLocal()
+    try:
+        seed_feeds(db)
+    finally:
+        db.close()
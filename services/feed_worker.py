@@ -0,0 +1,94 @@
+"""
+Functions executed inside the process pool.
+
+They take raw feed bytes and return compact, ready-to-save article records,
+so the parent process only downloads, deduplicates and writes.
+"""
+import logging
+from typing import List, Dict
+
+from scrapers.rss_scraper import parse_feed_bytes, MAX_FEED_ENTRIES
+from scrapers.links import canonicalize_url, link_hash
+from services.classifier import classify_articles
+
+logger = logging.getLogger(__name__)
+
+
+def _classification_text(article_data: Dict) -> str:
+    """
+    Summary plus the fetched page text, when the entry carries it under 'body'.
+    """
+    summary = article_data['summary']
+    return f"{summary} {article_data['body']}" if article_data.get('body') else summary
+
+
+def build_record(article_data: Dict, classification: Dict) -> Dict:
+    """
+    The columns to store for a cleaned feed entry and its classification.
+    Only the summary is stored; page text is saved separately.
+    """
+    title = article_data['title']
+    # Only the topic's priority_locations (Abuja/FCT), not classify_article's
+    # wider Lagos/Kaduna rule, mark a stored article as priority
+    is_priority = classification['stored_priority']
+    locations = classification['locations']
+    topic = classification['topic']
+    
+    priority_reason = None
+    if is_priority:
+        priority_reason = f"Priority: {topic} news from {', '.join(locations) if locations else 'Nigeria'}"
+    
+    link = canonicalize_url(article_data['link'])
+    
+    return {
+        'title': title,
+        'link': link,
+        'link_hash': link_hash(link),
+        'summary': article_data['summary'],
+        'source': article_data['source'],
+        'published_date': article_data['published_date'],
+        'is_security_related': classification['is_security_related'],
+        'locations': ','.join(locations) if locations else 'Nigeria',
+        'incident_type': classification.get('incident_type', 'other'),
+        'topic': topic,
+        'is_priority': bool(is_priority),
+        'priority_reason': priority_reason,
+    }
+
+
+def classify_entry(article_data: Dict) -> Dict:
+    """
+    Classify one cleaned feed entry and return the columns to store.
+    """
+    return classify_entries([article_data])[0]
+
+
+def classify_entries(entries: List[Dict]) -> List[Dict]:
+    """
+    Classify a chunk of entries in one batch, e.g. a feed or entries whose
+    page text is now known.
+    """
+    classifications = classify_articles([
+        (entry['title'], _classification_text(entry), entry['source']) for entry in entries
+    ])
+    return [build_record(entry, c) for entry, c in zip(entries, classifications)]
+
+
+def parse_and_classify_feed(raw: bytes, source_name: str, max_entries: int = MAX_FEED_ENTRIES) -> List[Dict]:
+    """
+    Parse, clean and classify a downloaded feed.
+    Entries that fail classification are dropped and logged.
+    """
+    entries = [e for e in parse_feed_bytes(raw, source_name, max_entries) if e['link']]
+    try:
+        return classify_entries(entries)
+    except Exception as e:
+        logger.error("Error classifying batch from %s (%s); classifying entry by entry", source_name, e)
+    
+    records = []
+    for article_data in entries:
+        try:
+            records.append(classify_entry(article_data))
+        except Exception as e:
+            logger.error("Error classifying entry from %s: %s", source_name, e)
+    return records
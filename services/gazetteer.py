@@ -0,0 +1,161 @@
+"""
+Gazetteer of Nigerian places: the country, 36 states + FCT, all 774 Local
+Government Areas and major towns, loaded from data/gazetteer.csv.
+
+Names are stored in a token trie and matched against article text in one
+left-to-right pass (longest match wins), so adding places does not add
+per-article regex work.
+
+Columns of the data file:
+    name   place name as written in text
+    kind   country | state | lga | town | exclude (consumed, never reported)
+    state  state the place belongs to ('Nigeria' for the country)
+    lga    LGA the place resolves to, if known
+    match  '' (always), 'cap' (only when capitalised in the text) or
+           'strict' (only when its state is also mentioned, or the name is
+           followed by 'LGA' / 'Local Government')
+"""
+import csv
+import os
+import re
+import threading
+from typing import List, NamedTuple
+
+GAZETTEER_PATH = os.path.join(os.path.dirname(__file__), 'data', 'gazetteer.csv')
+
+_TOKEN = re.compile(r"[A-Za-z0-9]+")
+_APOSTROPHES = re.compile(r"['’`]")
+_END = ''  # Trie key marking the end of a complete name
+_LGA_MARKERS = ('lga', 'local')
+
+
+class Place(NamedTuple):
+    name: str
+    kind: str
+    state: str
+    lga: str
+    match: str
+
+
+def tokenize(text: str) -> List[tuple]:
+    """
+    Split text into (lowercase, original) word tokens.
+    Apostrophes are dropped so "Jema'a" and "Jemaa" match alike.
+    """
+    text = _APOSTROPHES.sub('', text)
+    return [(m.group().lower(), m.group()) for m in _TOKEN.finditer(text)]
+
+
+class Gazetteer:
+    """
+    Token trie over place names.
+    """
+    
+    def __init__(self, places: List[Place]):
+        self.root = {}
+        self.size = len(places)
+        for place in places:
+            node = self.root
+            for token, _ in tokenize(place.name):
+                node = node.setdefault(token, {})
+            node.setdefault(_END, []).append(place)
+    
+    @classmethod
+    def load(cls, path: str = GAZETTEER_PATH) -> 'Gazetteer':
+        with open(path, newline='', encoding='utf-8') as f:
+            return cls([Place(**row) for row in csv.DictReader(f)])
+    
+    def scan(self, tokens: List[tuple]) -> List[tuple]:
+        """
+        Longest-match scan: returns (start, end, places) for each matched span.
+        """
+        spans = []
+        i = 0
+        n = len(tokens)
+        while i < n:
+            node = self.root
+            j = i
+            last = None
+            while j < n:
+                node = node.get(tokens[j][0])
+                if node is None:
+                    break
+                j += 1
+                if _END in node:
+                    last = (j, node[_END])
+            if last:
+                spans.append((i, last[0], last[1]))
+                i = last[0]
+            else:
+                i += 1
+        return spans
+    
+    def resolve(self, text: str) -> List[Place]:
+        """
+        Places mentioned in text, in order of first mention.
+        Ambiguous and 'strict' names are kept only when exactly one of their
+        candidate states is otherwise mentioned, or an LGA marker follows.
+        """
+        tokens = tokenize(text)
+        resolved = []
+        mentioned_states = set()
+        pending = []
+        
+        for start, end, places in self.scan(tokens):
+            capitalised = tokens[start][1][0].isupper()
+            places = [p for p in places if p.match != 'cap' or capitalised]
+            if not places or any(p.kind == 'exclude' for p in places):
+                continue
+            
+            # A state or country reading always wins over a same-named LGA or town
+            broad = [p for p in places if p.kind in ('country', 'state')]
+            if broad:
+                resolved.append(broad[0])
+                mentioned_states.add(broad[0].state)
+                continue
+            
+            loose = [p for p in places if p.match != 'strict']
+            if loose and len({p.state for p in loose}) == 1:
+                place = _most_specific(loose)
+                resolved.append(place)
+                mentioned_states.add(place.state)
+            else:
+                pending.append((end, places))
+        
+        for end, places in pending:
+            candidates = [p for p in places if p.state in mentioned_states]
+            if not candidates and end < len(tokens) and tokens[end][0] in _LGA_MARKERS:
+                candidates = places
+            if candidates and len({p.state for p in candidates}) == 1:
+                resolved.append(_most_specific(candidates))
+        
+        return resolved
+
+
+def _most_specific(places: List[Place]) -> Place:
+    """
+    Prefer the LGA reading of a name, then any reading that names an LGA.
+    """
+    for place in places:
+        if place.kind == 'lga':
+            return place
+    for place in places:
+        if place.lga:
+            return place
+    return places[0]
+
+
+_gazetteer = None
+_gazetteer_lock = threading.Lock()
+
+
+def get_gazetteer() -> Gazetteer:
+    """
+    The shared gazetteer, loaded from disk on first use.
+    """
+    global _gazetteer
+    if _gazetteer is None:
+        with _gazetteer_lock:
+            if _gazetteer is None:
+                _gazetteer = Gazetteer.load()
+    return _gazetteer
@@ -0,0 +1,129 @@
+"""
+Process-wide logging setup: non-blocking, optionally structured, sampled.
+
+configure_logging() puts a single QueueHandler on the root logger, so a
+thread that logs (a scrape stage, a request handler) only appends the
+record to an in-memory queue; a QueueListener thread formats it and writes
+it to stderr. Records are queued unformatted, so %-style arguments are
+merged on the listener thread, and a call below LOG_LEVEL costs no more
+than the level check.
+
+LOG_FORMAT=json writes one JSON object per line, with any extra={...}
+fields as keys (the pipeline logs its per-run counters that way).
+
+Lines repeated per feed or per batch are logged with extra=SAMPLED and only
+LOG_SAMPLE_RATE of them are kept; warnings and errors are never sampled.
+"""
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+import atexit
+import logging
+import os
+import queue
+import random
+
+import orjson
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "1.0"))
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Pass as extra= on per-item lines that may be sampled away
+SAMPLED = {"sampled": True}
+
+# Attributes every LogRecord has; anything else came from extra={...}
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "sampled"}
+
+_listener = None
+_handler = None
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per record: time, level, logger, message, extra fields.
+    """
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return orjson.dumps(entry, default=str).decode()
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep `rate` of the records marked SAMPLED below WARNING, and all others.
+    """
+    
+    def __init__(self, rate: float = LOG_SAMPLE_RATE):
+        super().__init__()
+        self.rate = rate
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not getattr(record, "sampled", False):
+            return True
+        return self.rate >= 1 or random.random() < self.rate
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler that leaves formatting to the listener thread.
+    
+    The stock prepare() formats the message on the calling thread so the
+    record can be pickled; this queue never leaves the process, so the
+    record is passed on as it is.
+    """
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def configure_logging(level: str = LOG_LEVEL, fmt: str = LOG_FORMAT,
+                      sample_rate: float = LOG_SAMPLE_RATE, stream=None):
+    """
+    Route all logging through a queue to a listener thread. Idempotent;
+    the listener is flushed and stopped at interpreter exit.
+    """
+    global _listener, _handler
+    if _listener is not None:
+        return
+    
+    output = logging.StreamHandler(stream)
+    output.setFormatter(JsonFormatter() if fmt == "json" else logging.Formatter(TEXT_FORMAT))
+    
+    records = queue.SimpleQueue()
+    handler = DeferredQueueHandler(records)
+    handler.addFilter(SamplingFilter(sample_rate))
+    
+    root = logging.getLogger()
+    for existing in root.handlers[:]:
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level)
+    
+    _handler = handler
+    _listener = QueueListener(records, output, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+
+
+def stop_logging():
+    """
+    Write out queued records, stop the listener thread and detach the
+    queue handler.
+    """
+    global _listener, _handler
+    if _listener is not None:
+        logging.getLogger().removeHandler(_handler)
+        _listener.stop()
+        _listener = _handler = None
@@ -0,0 +1,192 @@
+"""
+Statistical topic classifier: hashed bag-of-words and a linear model.
+
+Text is tokenized on word boundaries (so 'ai' no longer matches "said"),
+unigrams and bigrams are hashed into HASH_FEATURES columns, with title
+tokens hashed separately from summary tokens, and each article becomes one
+L2-normalised row of a SciPy CSR matrix. A batch is scored with a single
+sparse-dense matrix multiply against a (features x topics) weight matrix.
+
+The model is multinomial logistic regression trained on the topics already
+stored in the database (see scripts/train_topic_model.py) and saved to
+TOPIC_MODEL_PATH. Set CLASSIFIER_ENGINE=linear to have it replace the rule
+engine's topic (the keyword topic rules are then skipped, and priority
+follows the predicted topic); everything else still comes from the rules.
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+import logging
+import os
+import re
+import threading
+import zlib
+
+import numpy as np
+from scipy import sparse
+
+logger = logging.getLogger(__name__)
+
+TOPIC_MODEL_PATH = os.getenv(
+    "TOPIC_MODEL_PATH", os.path.join(os.path.dirname(__file__), 'data', 'topic_model.npz')
+)
+
+HASH_FEATURES = 2 ** 16
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+# Term -> column, per feature count; vocabularies are small enough to keep
+_FEATURE_CACHE: Dict[int, Dict[str, int]] = {}
+MAX_CACHED_TERMS = 500_000
+
+
+def _terms(text: str, prefix: str) -> List[str]:
+    tokens = _TOKEN.findall(text.lower())
+    terms = [prefix + t for t in tokens]
+    terms.extend(f"{prefix}{a} {b}" for a, b in zip(tokens, tokens[1:]))
+    return terms
+
+
+def _features(terms: List[str], n_features: int) -> List[int]:
+    cache = _FEATURE_CACHE.setdefault(n_features, {})
+    if len(cache) > MAX_CACHED_TERMS:
+        cache.clear()
+    columns = list(map(cache.get, terms))
+    if None in columns:
+        for i, term in enumerate(terms):
+            if columns[i] is None:
+                # crc32 rather than hash(): columns must not change between processes
+                columns[i] = cache[term] = zlib.crc32(term.encode('utf-8')) % n_features
+    return columns
+
+
+def vectorize(pairs: Sequence[Tuple[str, str]], n_features: int = HASH_FEATURES) -> sparse.csr_matrix:
+    """
+    One L2-normalised row of log term counts per (title, summary) pair.
+    """
+    indices: List[int] = []
+    indptr = [0]
+    for title, summary in pairs:
+        indices.extend(_features(_terms(title or '', 't:') + _terms(summary or '', 's:'), n_features))
+        indptr.append(len(indices))
+    
+    matrix = sparse.csr_matrix(
+        (np.ones(len(indices), dtype=np.float32), np.array(indices, dtype=np.int32), np.array(indptr)),
+        shape=(len(pairs), n_features),
+    )
+    matrix.sum_duplicates()
+    np.log1p(matrix.data, out=matrix.data)
+    
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.diags(1.0 / norms).dot(matrix).tocsr().astype(np.float32)
+
+
+class LinearTopicModel:
+    """
+    Softmax regression over hashed features.
+    """
+    
+    def __init__(self, weights: np.ndarray, bias: np.ndarray, classes: Sequence[str]):
+        self.weights = weights
+        self.bias = bias
+        self.classes = np.asarray(classes)
+        self.n_features = weights.shape[0]
+    
+    def scores(self, pairs: Sequence[Tuple[str, str]]) -> np.ndarray:
+        return vectorize(pairs, self.n_features) @ self.weights + self.bias
+    
+    def predict(self, pairs: Sequence[Tuple[str, str]]) -> List[str]:
+        """
+        Topic for every (title, summary) pair, scored in one multiply.
+        """
+        if not pairs:
+            return []
+        return self.classes[self.scores(pairs).argmax(axis=1)].tolist()
+    
+    @classmethod
+    def train(
+        cls,
+        pairs: Sequence[Tuple[str, str]],
+        labels: Sequence[str],
+        n_features: int = HASH_FEATURES,
+        epochs: int = 200,
+        learning_rate: float = 0.05,
+        l2: float = 1e-4,
+    ) -> 'LinearTopicModel':
+        """
+        Fit by full-batch Adam on the softmax cross-entropy.
+        """
+        classes, y = np.unique(np.asarray(labels), return_inverse=True)
+        X = vectorize(pairs, n_features)
+        targets = np.zeros((len(y), len(classes)), dtype=np.float32)
+        targets[np.arange(len(y)), y] = 1.0
+        
+        W = np.zeros((n_features, len(classes)), dtype=np.float32)
+        b = np.zeros(len(classes), dtype=np.float32)
+        params = [W, b]
+        m = [np.zeros_like(p) for p in params]
+        v = [np.zeros_like(p) for p in params]
+        beta1, beta2, eps = 0.9, 0.999, 1e-8
+        
+        for step in range(1, epochs + 1):
+            logits = X @ W + b
+            logits -= logits.max(axis=1, keepdims=True)
+            probs = np.exp(logits)
+            probs /= probs.sum(axis=1, keepdims=True)
+            error = (probs - targets) / len(y)
+            grads = [X.T @ error + l2 * W, error.sum(axis=0)]
+            
+            for p, g, m_p, v_p in zip(params, grads, m, v):
+                m_p *= beta1
+                m_p += (1 - beta1) * g
+                v_p *= beta2
+                v_p += (1 - beta2) * g * g
+                m_hat = m_p / (1 - beta1 ** step)
+                v_hat = v_p / (1 - beta2 ** step)
+                p -= learning_rate * m_hat / (np.sqrt(v_hat) + eps)
+        
+        return cls(W, b, classes)
+    
+    def save(self, path: str = TOPIC_MODEL_PATH):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        np.savez_compressed(path, weights=self.weights, bias=self.bias, classes=self.classes)
+    
+    @classmethod
+    def load(cls, path: str = TOPIC_MODEL_PATH) -> 'LinearTopicModel':
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data['weights'], data['bias'], data['classes'].tolist())
+
+
+_model = None
+_model_lock = threading.Lock()
+_model_missing = False
+
+
+def get_topic_model() -> Optional[LinearTopicModel]:
+    """
+    The trained model, loaded on first use; None (logged once) if no model
+    file has been trained yet.
+    """
+    global _model, _model_missing
+    if _model is None and not _model_missing:
+        with _model_lock:
+            if _model is None and not _model_missing:
+                try:
+                    _model = LinearTopicModel.load()
+                except FileNotFoundError:
+                    _model_missing = True
+                    logger.warning(
+                        f"No topic model at {TOPIC_MODEL_PATH}; using rule-based topics. "
+                        f"Train one with python -m scripts.train_topic_model"
+                    )
+    return _model
+
+
+def predict_topics(pairs: Sequence[Tuple[str, str]]) -> Optional[List[str]]:
+    """
+    Topics for a batch of (title, summary) pairs, or None without a model.
+    """
+    model = get_topic_model()
+    if model is None:
+        return None
+    return model.predict(pairs)
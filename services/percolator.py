@@ -0,0 +1,225 @@
+"""
+Saved-search percolator: matches new articles against standing queries.
+
+A saved search is a conjunction: every word, "quoted phrase" and prefix*
+term in its query must appear in the title or summary, and its topic,
+location and incident type (when set) must equal the article's. Common
+stopwords are dropped, so "kidnapping in Kaduna" needs kidnapping and kaduna.
+
+Searches are compiled into an inverted index where each one is filed under
+a single required key, its anchor: the longest plain word, else its
+location, incident type or topic. An article looks up only the keys it
+contains (its words, topic, locations and incident type) and fully checks
+just the searches found there, so matching costs grow with the article
+and the handful of candidates, not with the number of saved searches.
+Searches with nothing but prefix terms have no anchor and are checked
+for every article.
+
+The ingestion pipeline loads the enabled searches at the start of each
+run and records matches in the search_matches inbox in the same
+transaction as the articles.
+"""
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+import logging
+import re
+
+from sqlalchemy.orm import Session
+
+from models.article import Article
+from models.saved_search import SavedSearch, SearchMatch
+
+logger = logging.getLogger(__name__)
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_QUERY_PART = re.compile(r'"([^"]*)"|(\S+)')
+
+STOPWORDS = frozenset({
+    "a", "an", "and", "at", "by", "for", "from", "in", "into", "of", "on",
+    "or", "the", "to", "with",
+})
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall((text or '').lower())
+
+
+def parse_query(query: str) -> Tuple[frozenset, Tuple[str, ...], Tuple[str, ...]]:
+    """
+    Split a query into (words, prefixes, phrases). A phrase is stored as
+    its space-joined tokens.
+    """
+    words, prefixes, phrases = set(), [], []
+    for phrase, word in _QUERY_PART.findall(query or ''):
+        if phrase:
+            tokens = tokenize(phrase)
+            if len(tokens) > 1:
+                phrases.append(" ".join(tokens))
+            elif tokens:
+                words.add(tokens[0])
+        elif word.endswith("*") and tokenize(word):
+            prefixes.append(tokenize(word)[0])
+        else:
+            words.update(t for t in tokenize(word) if t not in STOPWORDS)
+    # Every phrase word is also a required word, and a possible anchor
+    for phrase in phrases:
+        words.update(phrase.split())
+    return frozenset(words), tuple(prefixes), tuple(phrases)
+
+
+class CompiledSearch:
+    """
+    A saved search reduced to what matching needs.
+    """
+    __slots__ = ("id", "words", "prefixes", "phrases", "topic", "location", "incident_type")
+    
+    def __init__(self, search_id: int, query: str = None, topic: str = None,
+                 location: str = None, incident_type: str = None):
+        self.id = search_id
+        self.words, self.prefixes, self.phrases = parse_query(query)
+        self.topic = topic.lower() if topic else None
+        self.location = location.lower() if location else None
+        self.incident_type = incident_type.lower() if incident_type else None
+    
+    @classmethod
+    def from_model(cls, search: SavedSearch) -> 'CompiledSearch':
+        return cls(search.id, search.query, search.topic, search.location, search.incident_type)
+    
+    @property
+    def is_empty(self) -> bool:
+        return not (self.words or self.prefixes or self.topic or self.location or self.incident_type)
+    
+    def anchor(self) -> Optional[Tuple[str, str]]:
+        # Longer words are rarer, so fewer articles reach this search's checks
+        if self.words:
+            return ("word", max(self.words, key=lambda w: (len(w), w)))
+        if self.location:
+            return ("location", self.location)
+        if self.incident_type:
+            return ("incident_type", self.incident_type)
+        if self.topic:
+            return ("topic", self.topic)
+        return None
+    
+    def matches(self, doc: 'ArticleDocument') -> bool:
+        if self.topic and self.topic != doc.topic:
+            return False
+        if self.location and self.location not in doc.locations:
+            return False
+        if self.incident_type and self.incident_type != doc.incident_type:
+            return False
+        if not self.words <= doc.words:
+            return False
+        for prefix in self.prefixes:
+            if not any(word.startswith(prefix) for word in doc.words):
+                return False
+        return all(f" {phrase} " in doc.text for phrase in self.phrases)
+
+
+class ArticleDocument:
+    """
+    The normalised fields of one article that searches are matched against.
+    """
+    __slots__ = ("words", "text", "topic", "locations", "incident_type")
+    
+    def __init__(self, title: str, summary: str, topic: str = None,
+                 locations: Iterable[str] = (), incident_type: str = None):
+        tokens = tokenize(title) + tokenize(summary)
+        self.words = frozenset(tokens)
+        # Padded so phrase checks match whole words only
+        self.text = f" {' '.join(tokenize(title))} | {' '.join(tokenize(summary))} "
+        self.topic = topic.lower() if topic else None
+        self.locations = frozenset(l.lower() for l in locations)
+        self.incident_type = incident_type.lower() if incident_type else None
+    
+    @classmethod
+    def from_event(cls, event: Dict) -> 'ArticleDocument':
+        """
+        Built from an article_event() payload.
+        """
+        return cls(event["title"], event["summary"], event["topic"], event["locations"], event["incident_type"])
+    
+    def keys(self) -> Iterable[Tuple[str, str]]:
+        for word in self.words:
+            yield ("word", word)
+        for location in self.locations:
+            yield ("location", location)
+        if self.topic:
+            yield ("topic", self.topic)
+        if self.incident_type:
+            yield ("incident_type", self.incident_type)
+
+
+class Percolator:
+    """
+    Inverted index of compiled searches, keyed by each search's anchor.
+    """
+    
+    def __init__(self, searches: Iterable[CompiledSearch] = ()):
+        self._index: Dict[Tuple[str, str], List[CompiledSearch]] = defaultdict(list)
+        self._scan: List[CompiledSearch] = []
+        self._count = 0
+        for search in searches:
+            self.add(search)
+    
+    def __len__(self):
+        return self._count
+    
+    def add(self, search: CompiledSearch):
+        if search.is_empty:
+            return
+        anchor = search.anchor()
+        if anchor is None:
+            self._scan.append(search)
+        else:
+            self._index[anchor].append(search)
+        self._count += 1
+    
+    def match(self, doc: ArticleDocument) -> List[int]:
+        """
+        Ids of the searches the article satisfies.
+        """
+        if not self._count:
+            return []
+        matched = [s.id for s in self._scan if s.matches(doc)]
+        index = self._index
+        for key in doc.keys():
+            candidates = index.get(key)
+            if candidates:
+                matched.extend(s.id for s in candidates if s.matches(doc))
+        return matched
+    
+    @classmethod
+    def load(cls, db: Session) -> 'Percolator':
+        """
+        Compile every enabled saved search.
+        """
+        searches = db.query(SavedSearch).filter(SavedSearch.enabled == True).all()
+        percolator = cls(CompiledSearch.from_model(s) for s in searches)
+        logger.info(f"Percolator loaded {len(percolator)} saved searches")
+        return percolator
+
+
+def inbox_entries(percolator: Percolator, articles: List[Article], events: List[Dict]) -> List[SearchMatch]:
+    """
+    SearchMatch rows for the flushed articles (with their events) that
+    match any saved search.
+    """
+    entries = []
+    if not len(percolator):
+        return entries
+    now = datetime.utcnow()
+    for article, event in zip(articles, events):
+        for search_id in percolator.match(ArticleDocument.from_event(event)):
+            entries.append(SearchMatch(
+                search_id=search_id,
+                article_id=article.id,
+                matched_at=now,
+                title=article.title,
+                link=article.link,
+                source=article.source,
+                topic=article.topic,
+                published_date=article.published_date,
+            ))
+    return entries
@@ -0,0 +1,343 @@
+"""
+Streaming ingestion pipeline: fetch -> parse/clean/classify -> persist.
+
+Stages run concurrently and are linked by bounded queues, so at most
+PIPELINE_QUEUE_SIZE raw feeds and records wait between stages and memory
+stays flat however many sources are registered:
+
+  * PIPELINE_FETCH_WORKERS threads download due feeds from the registry;
+  * PIPELINE_CLASSIFY_WORKERS threads hand raw feeds to the process pool,
+    where parsing, HTML cleaning and classification happen in one call
+    (splitting them would pickle every entry twice);
+  * one persist thread (SQLite has a single writer) dedupes, optionally
+    fetches page text, matches saved searches (services.percolator) and
+    commits every PIPELINE_COMMIT_BATCH records or PIPELINE_FLUSH_SECONDS,
+    whichever comes first.
+
+Each batch commits in its own transaction. A batch that fails is rolled
+back and retried row by row, so one bad row costs only itself.
+"""
+from datetime import datetime
+from itertools import chain
+from typing import Dict, List, Set
+import logging
+import os
+import queue
+import threading
+import time
+
+from sqlalchemy.orm import Session
+
+from database.db import SessionLocal
+from models.article import ArchivedLink, Article, ArticleBody
+from scrapers.article_fetcher import BODY_FETCH_ENABLED, fetch_article_bodies
+from scrapers.rss_scraper import MAX_FEED_ENTRIES, download_feed
+from services.events import article_event, broadcaster
+from services.feed_registry import due_feeds, record_failure, record_success
+from services.feed_worker import parse_and_classify_feed, classify_entries
+from services.logging_setup import SAMPLED
+from services.percolator import Percolator, inbox_entries
+from services.process_pool import get_process_pool, PROCESS_POOL_WORKERS
+from services.trends import trend_engine
+
+logger = logging.getLogger(__name__)
+
+PIPELINE_FETCH_WORKERS = int(os.getenv("PIPELINE_FETCH_WORKERS", "4"))
+PIPELINE_CLASSIFY_WORKERS = int(os.getenv("PIPELINE_CLASSIFY_WORKERS", str(PROCESS_POOL_WORKERS)))
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "8"))
+PIPELINE_COMMIT_BATCH = int(os.getenv("PIPELINE_COMMIT_BATCH", "100"))
+PIPELINE_FLUSH_SECONDS = float(os.getenv("PIPELINE_FLUSH_SECONDS", "2"))
+
+# Upper bound on how long a worker may spend parsing and classifying one feed
+FEED_PARSE_TIMEOUT_SECONDS = float(os.getenv("FEED_PARSE_TIMEOUT_SECONDS", "60"))
+
+# Link hashes per IN (...) dedupe query
+LINK_HASH_LOOKUP_CHUNK = 500
+
+# Articles per worker task when re-classifying with fetched body text
+BODY_CLASSIFY_CHUNK = 50
+
+_DONE = object()
+
+
+def existing_link_hashes(db: Session, hashes: List[int]) -> Set[int]:
+    """
+    Return which of the given link hashes are already stored, in the hot
+    table or (through archived_links) in a monthly archive.
+    Queries in chunks to stay under SQLite's bound-parameter limit.
+    """
+    hashes = list(set(hashes))
+    found = set()
+    for i in range(0, len(hashes), LINK_HASH_LOOKUP_CHUNK):
+        chunk = hashes[i:i + LINK_HASH_LOOKUP_CHUNK]
+        found.update(
+            h for (h,) in db.query(Article.link_hash).filter(Article.link_hash.in_(chunk))
+        )
+        missing = [h for h in chunk if h not in found]
+        if missing:
+            found.update(
+                h for (h,) in db.query(ArchivedLink.link_hash).filter(ArchivedLink.link_hash.in_(missing))
+            )
+    return found
+
+
+def enrich_with_bodies(records: List[Dict]) -> Dict[str, str]:
+    """
+    Fetch page text for new records and re-classify the ones that got any,
+    updating them in place. Returns {link: body text}.
+    """
+    bodies = fetch_article_bodies(record['link'] for record in records)
+    enriched = [record for record in records if record['link'] in bodies]
+    if not enriched:
+        return bodies
+    
+    chunks = [
+        [dict(record, body=bodies[record['link']]) for record in enriched[i:i + BODY_CLASSIFY_CHUNK]]
+        for i in range(0, len(enriched), BODY_CLASSIFY_CHUNK)
+    ]
+    try:
+        classified = chain.from_iterable(get_process_pool().map(classify_entries, chunks))
+        for record, update in zip(enriched, classified):
+            record.update(update)
+    except Exception as e:
+        # Keep the summary-based classification from the feed stage
+        logger.error("Error re-classifying articles with body text: %s", e)
+    
+    return bodies
+
+
+class IngestionPipeline:
+    """
+    One scrape run. Create, then call run().
+    """
+    
+    def __init__(self, publish: bool = True):
+        self.publish = publish
+        self.feed_queue: queue.Queue = queue.Queue()
+        self.raw_queue: queue.Queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        self.record_queue: queue.Queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        
+        # Feed health outcomes, written to the registry once at the end
+        self._outcomes: List[tuple] = []
+        self._outcomes_lock = threading.Lock()
+        
+        self.seen_hashes: Set[int] = set()
+        self.percolator = Percolator()
+        self.stats = {
+            "feeds": 0, "failed_feeds": 0, "fetched": 0, "saved": 0, "skipped": 0, "failed_rows": 0,
+            "batches": 0, "search_matches": 0,
+        }
+    
+    def _outcome(self, *outcome):
+        with self._outcomes_lock:
+            self._outcomes.append(outcome)
+    
+    # Stage 1: download
+    def _fetch_worker(self):
+        while True:
+            try:
+                source_name, feed_url = self.feed_queue.get_nowait()
+            except queue.Empty:
+                return
+            started = time.perf_counter()
+            try:
+                logger.info("Fetching feed from %s: %s", source_name, feed_url, extra=SAMPLED)
+                raw = download_feed(feed_url)
+            except Exception as e:
+                logger.error("Error fetching feed %s: %s", source_name, e)
+                self._outcome("failure", source_name, str(e), (time.perf_counter() - started) * 1000)
+                continue
+            self.raw_queue.put((source_name, raw, (time.perf_counter() - started) * 1000))
+    
+    # Stage 2: parse, clean and classify in the process pool
+    def _classify_worker(self):
+        pool = get_process_pool()
+        while True:
+            item = self.raw_queue.get()
+            if item is _DONE:
+                return
+            source_name, raw, latency_ms = item
+            try:
+                future = pool.submit(parse_and_classify_feed, raw, source_name, MAX_FEED_ENTRIES)
+                records = future.result(timeout=FEED_PARSE_TIMEOUT_SECONDS)
+            except Exception as e:
+                logger.error("Error processing feed %s: %s", source_name, e)
+                self._outcome("failure", source_name, f"Processing failed: {e}", latency_ms)
+                continue
+            if not records:
+                # An HTML error page or empty document parses to zero entries
+                self._outcome("failure", source_name, "Feed returned no entries", latency_ms)
+                continue
+            
+            self._outcome("success", source_name, latency_ms, len(raw), len(records))
+            logger.info("Processed %d articles from %s", len(records), source_name, extra=SAMPLED)
+            self.record_queue.put(records)
+    
+    # Stage 3: dedupe and commit in batches
+    def _persist_worker(self):
+        db = SessionLocal()
+        pending: List[Dict] = []
+        try:
+            while True:
+                try:
+                    item = self.record_queue.get(timeout=PIPELINE_FLUSH_SECONDS)
+                except queue.Empty:
+                    item = None
+                
+                if item is _DONE:
+                    break
+                if item:
+                    pending.extend(item)
+                    self.stats["fetched"] += len(item)
+                if pending and (item is None or len(pending) >= PIPELINE_COMMIT_BATCH):
+                    self._safe_persist(db, pending)
+                    pending = []
+            
+            if pending:
+                self._safe_persist(db, pending)
+        finally:
+            db.close()
+    
+    def _safe_persist(self, db: Session, records: List[Dict]):
+        # Never let one batch stop the consumer: upstream stages would block on the full queue
+        try:
+            self._persist_batch(db, records)
+        except Exception as e:
+            db.rollback()
+            self.stats["failed_rows"] += len(records)
+            logger.error("Error persisting batch of %d articles: %s", len(records), e)
+    
+    def _persist_batch(self, db: Session, records: List[Dict]):
+        known = existing_link_hashes(db, [r['link_hash'] for r in records]) | self.seen_hashes
+        new_records = []
+        for record in records:
+            if record['link_hash'] in known:
+                self.stats["skipped"] += 1
+                continue
+            known.add(record['link_hash'])
+            new_records.append(record)
+        if not new_records:
+            return
+        
+        # Optional enrichment: full page text for the articles we are keeping
+        bodies = enrich_with_bodies(new_records) if BODY_FETCH_ENABLED else {}
+        
+        def to_article(record):
+            article = Article(**record)
+            if record['link'] in bodies:
+                article.body = ArticleBody(text=bodies[record['link']])
+            return article
+        
+        try:
+            articles = [to_article(r) for r in new_records]
+            db.add_all(articles)
+            # Flush to assign ids, then build events before commit expires the objects
+            db.flush()
+            events = [article_event(a) for a in articles]
+            matches = inbox_entries(self.percolator, articles, events)
+            db.add_all(matches)
+            db.commit()
+            saved = new_records
+            match_count = len(matches)
+        except Exception as e:
+            db.rollback()
+            logger.error("Batch of %d articles failed (%s); retrying row by row", len(new_records), e)
+            events, saved, match_count = [], [], 0
+            for record in new_records:
+                try:
+                    article = to_article(record)
+                    db.add(article)
+                    db.flush()
+                    event = article_event(article)
+                    matches = inbox_entries(self.percolator, [article], [event])
+                    db.add_all(matches)
+                    db.commit()
+                except Exception as row_error:
+                    db.rollback()
+                    self.stats["failed_rows"] += 1
+                    logger.error("Error saving article %s: %s", record['link'], row_error)
+                    continue
+                events.append(event)
+                saved.append(record)
+                match_count += len(matches)
+        
+        self.seen_hashes.update(r['link_hash'] for r in saved)
+        self.stats["saved"] += len(saved)
+        self.stats["search_matches"] += match_count
+        self.stats["batches"] += 1
+        
+        if self.publish:
+            broadcaster.publish(events)
+            trend_engine.record_many(saved)
+    
+    def _record_outcomes(self):
+        db = SessionLocal()
+        try:
+            for outcome in self._outcomes:
+                if outcome[0] == "success":
+                    record_success(db, *outcome[1:])
+                else:
+                    record_failure(db, *outcome[1:])
+            db.commit()
+        finally:
+            db.close()
+    
+    def run(self) -> Dict:
+        """
+        Run every stage to completion and return counters for the run.
+        """
+        started = time.perf_counter()
+        db = SessionLocal()
+        try:
+            feeds = [(feed.name, feed.url) for feed in due_feeds(db)]
+            self.percolator = Percolator.load(db)
+        finally:
+            db.close()
+        for feed in feeds:
+            self.feed_queue.put(feed)
+        self.stats["feeds"] = len(feeds)
+        
+        def start(target, count, name):
+            threads = [
+                threading.Thread(target=target, name=f"pipeline-{name}-{i}", daemon=True)
+                for i in range(count)
+            ]
+            for t in threads:
+                t.start()
+            return threads
+        
+        fetchers = start(self._fetch_worker, min(PIPELINE_FETCH_WORKERS, max(len(feeds), 1)), "fetch")
+        classifiers = start(self._classify_worker, PIPELINE_CLASSIFY_WORKERS, "classify")
+        persister = start(self._persist_worker, 1, "persist")
+        
+        for t in fetchers:
+            t.join()
+        for _ in classifiers:
+            self.raw_queue.put(_DONE)
+        for t in classifiers:
+            t.join()
+        self.record_queue.put(_DONE)
+        for t in persister:
+            t.join()
+        
+        self._record_outcomes()
+        self.stats["failed_feeds"] = sum(1 for outcome in self._outcomes if outcome[0] == "failure")
+        self.stats["elapsed_s"] = round(time.perf_counter() - started, 2)
+        return self.stats
+
+
+def run_pipeline(publish: bool = True) -> Dict:
+    """
+    Run one scrape through the pipeline.
+    """
+    logger.info("Starting ingestion pipeline at %s", datetime.now())
+    stats = IngestionPipeline(publish=publish).run()
+    # One line of per-run counters in place of per-feed and per-article lines
+    logger.info(
+        "Pipeline completed in %ss: %d feeds (%d failed), %d fetched, %d saved, %d skipped, "
+        "%d failed in %d batches, %d saved-search matches",
+        stats['elapsed_s'], stats['feeds'], stats['failed_feeds'], stats['fetched'], stats['saved'],
+        stats['skipped'], stats['failed_rows'], stats['batches'], stats['search_matches'],
+        extra={"stats": stats},
+    )
+    return stats
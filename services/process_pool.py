@@ -0,0 +1,47 @@
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import logging
+import os
+import threading
+
+from services.logging_setup import configure_logging
+
+logger = logging.getLogger(__name__)
+
+# CPU-bound work (feed parsing, classification) runs here instead of in the
+# API process, where it would hold the GIL and stall request handling.
+PROCESS_POOL_WORKERS = int(os.getenv("PROCESS_POOL_WORKERS", "2"))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """
+    Return the shared process pool, creating it on first use.
+    Workers are spawned rather than forked so they never inherit the
+    scheduler or server threads of the parent process.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=PROCESS_POOL_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                # Spawned workers start with unconfigured logging
+                initializer=configure_logging,
+            )
+            logger.info(f"Started process pool with {PROCESS_POOL_WORKERS} workers")
+        return _pool
+
+
+def shutdown_process_pool():
+    """
+    Stop the shared process pool if it was started.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+            _pool = None
+            logger.info("Process pool stopped")
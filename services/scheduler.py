@@ -1,111 +1,80 @@
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.cron import CronTrigger
 from datetime import datetime, timedelta
 import logging
-from sqlalchemy.orm import Session
+import os
 
-from scrapers.rss_scraper import fetch_all_feeds, clean_html_content
-from services.classifier import classify_article, classify_topic, is_security_related, extract_locations
 from models.article import Article
 from database.db import SessionLocal
+from database.archive import run_storage_maintenance
+from database.backup import run_backup
 
 logger = logging.getLogger(__name__)
 
-scheduler = BackgroundScheduler()
+# APScheduler and the ingestion stack (feedparser, requests, bs4) are
+# imported on first use so the API process boots without them
+scheduler = None
 
+# Set to false when the ingestion worker (python -m services.worker) runs the jobs
+RUN_SCHEDULER = os.getenv("RUN_SCHEDULER", "true").lower() == "true"
 
-def scrape_and_save_articles():
+# Storage maintenance runs once a day, away from the scrape times
+MAINTENANCE_HOUR = os.getenv("MAINTENANCE_HOUR", "3")
+
+# Online backups, also away from the scrape times (a write restarts the copy)
+BACKUP_HOURS = os.getenv("BACKUP_HOURS", "4,16")
+
+def scrape_and_save_articles(publish: bool = True):
     """
     Main job: Fetch articles and save to database.
     Now saves all articles and classifies them by topic.
+    Runs the streaming pipeline, which commits in batches as feeds finish.
+    With publish=False the saved rows are left for the API's database
+    tail to pick up instead of being pushed to this process's listeners.
+    The priority briefing is regenerated once the run has committed.
     """
+    from services.pipeline import run_pipeline
+    
     logger.info(f"Starting scheduled scrape at {datetime.now()}")
     
     try:
-        # Fetch articles from all sources
-        articles = fetch_all_feeds()
-        
-        # Save to database
-        db = SessionLocal()
-        saved_count = 0
-        skipped_count = 0
-        
-        for article_data in articles:
-            try:
-                # Check if article already exists
-                existing = db.query(Article).filter(
-                    Article.link == article_data['link']
-                ).first()
-                
-                if existing:
-                    logger.info(f"Article already exists: {article_data['title'][:50]}")
-                    skipped_count += 1
-                    continue
-                
-                # Clean the title and summary before processing
-                clean_title = clean_html_content(article_data['title'])
-                clean_summary = clean_html_content(article_data['summary'])
-                
-                # Get security classification
-                security_check = is_security_related(clean_title, clean_summary)
-                is_sec = security_check[0]
-                security_score = security_check[1]
-                
-                # Get topic classification
-                topic, is_priority = classify_topic(clean_title, clean_summary)
-                
-                # Extract locations
-                locations = extract_locations(clean_title, clean_summary)
-                
-                # Get incident type using classifier
-                incident_class = classify_article(
-                    clean_title, 
-                    clean_summary,
-                    source=article_data['source']
-                )
-                
-                # Save ALL articles now (not just security-related)
-                priority_reason = None
-                if is_priority:
-                    priority_reason = f"Priority: {topic} news from {', '.join(locations) if locations else 'Nigeria'}"
-                
-                # Use cleaned content for the database
-                article = Article(
-                    title=clean_title,
-                    link=article_data['link'],
-                    summary=clean_summary,
-                    source=article_data['source'],
-                    published_date=article_data['published_date'],
-                    is_security_related=is_sec,
-                    locations=','.join(locations) if locations else 'Nigeria',
-                    incident_type=incident_class.get('incident_type', 'other'),
-                    topic=incident_class.get('topic', topic),
-                    is_priority=is_priority,  # New field
-                    priority_reason=priority_reason,  # New field
-                )
-                db.add(article)
-                saved_count += 1
-            
-            except Exception as e:
-                logger.error(f"Error processing article: {e}")
-                skipped_count += 1
-                continue
-        
-        db.commit()
-        db.close()
-        
-        logger.info(f"Scrape completed. Saved {saved_count} articles, skipped {skipped_count}")
-        
+        stats = run_pipeline(publish=publish)
+        logger.info(f"Scrape completed. Saved {stats['saved']} articles, skipped {stats['skipped']}")
+    
     except Exception as e:
         logger.error(f"Error in scheduled scrape: {e}")
+    
+    refresh_priority_briefing()
+
+
+def refresh_priority_briefing():
+    """
+    Rebuild the materialized briefing served by /api/briefing.
+    """
+    from services.briefing import refresh_briefing
+    
+    db = SessionLocal()
+    try:
+        refresh_briefing(db)
+    except Exception as e:
+        logger.error(f"Error regenerating briefing: {e}")
+    finally:
+        db.close()
 
 
 
 def start_scheduler():
     """
     Start the background scheduler.
-    Runs every day at 8 AM and 2 PM (you can customize these times).
+    Runs every day at 8 AM and 2 PM (you can customize these times),
+    plus nightly storage maintenance and online backups. The priority
+    briefing is built once at startup and then after every scrape.
     """
+    global scheduler
+    from apscheduler.schedulers.background import BackgroundScheduler
+    from apscheduler.triggers.cron import CronTrigger
+    
+    if scheduler is None:
+        scheduler = BackgroundScheduler()
+    
     scheduler.add_job(
         scrape_and_save_articles,
         trigger=CronTrigger(hour='8,14', minute='0'),  # 8 AM and 2 PM daily
@@ -113,6 +82,27 @@ def start_scheduler():
         name='Daily news scraping job',
         replace_existing=True,
     )
+    scheduler.add_job(
+        run_storage_maintenance,
+        trigger=CronTrigger(hour=MAINTENANCE_HOUR, minute='30'),
+        id='storage_maintenance_job',
+        name='Archive old articles, incremental VACUUM and planner statistics',
+        replace_existing=True,
+    )
+    # One-off run at startup, so the briefing exists before the first scrape
+    scheduler.add_job(
+        refresh_priority_briefing,
+        id='briefing_seed_job',
+        name='Initial priority briefing',
+        replace_existing=True,
+    )
+    scheduler.add_job(
+        run_backup,
+        trigger=CronTrigger(hour=BACKUP_HOURS, minute='0'),
+        id='backup_job',
+        name='Online database backup and rotation',
+        replace_existing=True,
+    )
     
     if not scheduler.running:
         scheduler.start()
@@ -123,7 +113,7 @@ def stop_scheduler():
     """
     Stop the background scheduler.
     """
-    if scheduler.running:
+    if scheduler is not None and scheduler.running:
         scheduler.shutdown()
         logger.info("Scheduler stopped")
 
@@ -133,6 +123,8 @@ def clean_existing_articles():
     Clean HTML from existing articles in the database.
     Should be run once after updating to the new version.
     """
+    from scrapers.rss_scraper import clean_html_content
+    
     db = SessionLocal()
     try:
         # Get articles from the last 30 days to limit the scope
@@ -158,7 +150,7 @@ def clean_existing_articles():
             logger.info(f"Cleaned HTML from {updated_count} articles")
         else:
             logger.info("No articles needed cleaning")
-            
+    
     except Exception as e:
         db.rollback()
         logger.error(f"Error cleaning articles: {e}")
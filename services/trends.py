@@ -0,0 +1,206 @@
+"""
+In-memory sliding-window trend counters and spike detection.
+
+Articles are counted per (location, incident_type, topic) in hourly
+buckets held in a ring covering TREND_RETENTION_HOURS. Recording a saved
+article is O(1) per location; reusing a ring slot for a new hour clears it
+for every series once. The engine is rebuilt from the database at startup,
+so /api/trends answers from memory without scanning the articles table.
+
+A group spikes when its count over the recent window is at least
+min_count and its z-score against the preceding windows of the same length
+(the baseline) reaches TREND_Z_THRESHOLD.
+"""
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import logging
+import math
+import os
+import threading
+
+from database.archive import article_source
+from database.db import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+TREND_RETENTION_HOURS = int(os.getenv("TREND_RETENTION_HOURS", str(15 * 24)))
+TREND_Z_THRESHOLD = float(os.getenv("TREND_Z_THRESHOLD", "3.0"))
+TREND_MIN_COUNT = int(os.getenv("TREND_MIN_COUNT", "3"))
+
+TREND_DIMENSIONS = ("location", "incident_type", "topic")
+
+_EPOCH = datetime(1970, 1, 1)
+_HOUR = timedelta(hours=1)
+
+SeriesKey = Tuple[str, str, str]
+
+
+def hour_index(value: datetime) -> int:
+    """
+    Hours since the epoch for a naive UTC datetime.
+    """
+    return (value - _EPOCH) // _HOUR
+
+
+class TrendEngine:
+    """
+    Hourly counters per (location, incident_type, topic), safe to update
+    from the scraper thread while API threads read.
+    """
+    
+    def __init__(self, retention_hours: int = TREND_RETENTION_HOURS):
+        self.retention_hours = retention_hours
+        self._lock = threading.Lock()
+        self._slot_hours: List[Optional[int]] = [None] * retention_hours
+        self._series: Dict[SeriesKey, List[int]] = {}
+    
+    def _slot(self, hour: int) -> Optional[int]:
+        """
+        Ring slot for an hour, recycling it if it still holds an older hour.
+        None when the hour is already outside the retained range.
+        """
+        slot = hour % self.retention_hours
+        held = self._slot_hours[slot]
+        if held == hour:
+            return slot
+        if held is not None and held > hour:
+            return None
+        for counts in self._series.values():
+            counts[slot] = 0
+        self._slot_hours[slot] = hour
+        return slot
+    
+    def _add(self, published_date: datetime, locations: str, incident_type: str, topic: str, now_hour: int):
+        if published_date is None:
+            return
+        # Feeds occasionally date entries ahead; count them in the current hour
+        hour = min(hour_index(published_date), now_hour)
+        if hour <= now_hour - self.retention_hours:
+            return
+        slot = self._slot(hour)
+        if slot is None:
+            return
+        
+        for location in (locations or 'Nigeria').split(','):
+            key = (location.strip(), incident_type or 'other', topic or 'general')
+            counts = self._series.get(key)
+            if counts is None:
+                counts = self._series[key] = [0] * self.retention_hours
+            counts[slot] += 1
+    
+    def record(self, published_date: datetime, locations: str, incident_type: str, topic: str):
+        """
+        Count one saved article.
+        """
+        now_hour = hour_index(datetime.utcnow())
+        with self._lock:
+            self._add(published_date, locations, incident_type, topic, now_hour)
+    
+    def record_many(self, records: Iterable[Dict]):
+        """
+        Count saved article records (dicts with Article column names).
+        """
+        now_hour = hour_index(datetime.utcnow())
+        with self._lock:
+            for r in records:
+                self._add(r['published_date'], r['locations'], r['incident_type'], r['topic'], now_hour)
+    
+    def rebuild(self, max_id: int = None):
+        """
+        Reset and reload the retained window from the database, optionally
+        only up to max_id when newer rows will be recorded separately.
+        """
+        now = datetime.utcnow()
+        cutoff = now - timedelta(hours=self.retention_hours)
+        db = SessionLocal()
+        try:
+            src = article_source(db, cutoff)
+            query = db.query(
+                src.c.published_date, src.c.locations, src.c.incident_type, src.c.topic
+            ).filter(src.c.published_date >= cutoff)
+            if max_id is not None:
+                query = query.filter(src.c.id <= max_id)
+            rows = query.all()
+        finally:
+            db.close()
+        
+        now_hour = hour_index(now)
+        with self._lock:
+            self._slot_hours = [None] * self.retention_hours
+            self._series = {}
+            for published_date, locations, incident_type, topic in rows:
+                self._add(published_date, locations, incident_type, topic, now_hour)
+        logger.info(f"Trend engine rebuilt from {len(rows)} articles ({len(self._series)} series)")
+    
+    def _hourly(self, counts: List[int], first_hour: int, hours: int) -> List[int]:
+        values = []
+        for hour in range(first_hour, first_hour + hours):
+            slot = hour % self.retention_hours
+            values.append(counts[slot] if self._slot_hours[slot] == hour else 0)
+        return values
+    
+    def trends(
+        self,
+        window_hours: int = 24,
+        baseline_windows: int = 7,
+        group_by: Sequence[str] = ("location", "incident_type"),
+        location: str = None,
+        incident_type: str = None,
+        topic: str = None,
+        min_count: int = TREND_MIN_COUNT,
+        z_threshold: float = TREND_Z_THRESHOLD,
+    ) -> List[Dict]:
+        """
+        Count per group over the last window_hours, compared with the
+        baseline_windows windows of the same length before it.
+        Sorted by z-score, highest first.
+        """
+        total_hours = window_hours * (baseline_windows + 1)
+        if total_hours > self.retention_hours:
+            raise ValueError(f"Window and baseline span {total_hours}h; only {self.retention_hours}h are kept")
+        
+        first_hour = hour_index(datetime.utcnow()) - total_hours + 1
+        positions = [TREND_DIMENSIONS.index(d) for d in group_by]
+        
+        grouped: Dict[Tuple, List[int]] = {}
+        with self._lock:
+            for key, counts in self._series.items():
+                if location and key[0] != location:
+                    continue
+                if incident_type and key[1] != incident_type:
+                    continue
+                if topic and key[2] != topic:
+                    continue
+                group = tuple(key[p] for p in positions)
+                hourly = self._hourly(counts, first_hour, total_hours)
+                if group in grouped:
+                    grouped[group] = [a + b for a, b in zip(grouped[group], hourly)]
+                else:
+                    grouped[group] = hourly
+        
+        results = []
+        for group, hourly in grouped.items():
+            windows = [sum(hourly[i:i + window_hours]) for i in range(0, total_hours, window_hours)]
+            baseline, current = windows[:-1], windows[-1]
+            if not current and not any(baseline):
+                continue
+            mean = sum(baseline) / len(baseline) if baseline else 0.0
+            std = math.sqrt(sum((b - mean) ** 2 for b in baseline) / len(baseline)) if baseline else 0.0
+            # Floor the spread at Poisson noise (and 1) so a few quiet baseline
+            # windows or a single extra article do not read as a spike
+            z_score = (current - mean) / max(std, math.sqrt(mean), 1.0)
+            
+            results.append({
+                **dict(zip(group_by, group)),
+                "count": current,
+                "baseline_mean": round(mean, 2),
+                "baseline_std": round(std, 2),
+                "z_score": round(z_score, 2),
+                "is_spike": current >= min_count and z_score >= z_threshold,
+            })
+        
+        results.sort(key=lambda r: (r["z_score"], r["count"]), reverse=True)
+        return results
+
+
+trend_engine = TrendEngine()
@@ -0,0 +1,67 @@
+"""
+Standalone ingestion worker.
+
+Runs the scheduler (scraping, feed parsing in the process pool,
+classification and storage maintenance) outside the API process, so
+scrapes never compete with request handling for the GIL or memory. The
+API, started with RUN_SCHEDULER=false, reads what the worker writes; the
+two share nothing but DATABASE_URL, which must point at the same database.
+
+Usage (from the project root):
+    python -m services.worker            # run scheduled jobs until stopped
+    python -m services.worker --once     # scrape once and exit
+"""
+import argparse
+import logging
+import signal
+import threading
+
+from database.db import init_db
+from services.feed_registry import init_feed_registry
+from services.logging_setup import configure_logging
+from services.process_pool import shutdown_process_pool
+from services.scheduler import scrape_and_save_articles, start_scheduler, stop_scheduler
+
+configure_logging()
+logger = logging.getLogger(__name__)
+
+
+def run_worker(once: bool = False):
+    init_db()
+    init_feed_registry()
+    
+    if once:
+        try:
+            scrape_and_save_articles()
+        finally:
+            shutdown_process_pool()
+        return
+    
+    stopping = threading.Event()
+    
+    def request_stop(signum, frame):
+        logger.info(f"Received signal {signum}, stopping worker")
+        stopping.set()
+    
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+    
+    start_scheduler()
+    logger.info("Ingestion worker started")
+    try:
+        stopping.wait()
+    finally:
+        stop_scheduler()
+        shutdown_process_pool()
+        logger.info("Ingestion worker stopped")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--once', action='store_true', help='run one scrape and exit')
+    args = parser.parse_args()
+    run_worker(once=args.once)
+
+
+if __name__ == "__main__":
+    main()
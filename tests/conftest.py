@@ -0,0 +1,12 @@
+"""
+Point the app at a throwaway database, archive and backup directory before
+any test imports it, so tests never touch news_platform.db.
+"""
+import os
+import tempfile
+
+_root = tempfile.mkdtemp(prefix="news-platform-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_root, 'news_platform.db')}"
+os.environ["ARCHIVE_DIR"] = os.path.join(_root, "archive")
+os.environ["BACKUP_DIR"] = os.path.join(_root, "backups")
+os.environ["RUN_SCHEDULER"] = "false"
@@ -0,0 +1,73 @@
+"""
+Tests for the admin API's authentication and feed URL checks.
+
+Run from the project root:
+    python -m pytest -q tests
+"""
+import pytest
+from fastapi.testclient import TestClient
+
+from api import admin
+from database.db import init_db
+
+TOKEN = "test-admin-token"
+
+
+@pytest.fixture
+def client():
+    init_db()
+    from main import app
+    return TestClient(app)
+
+
+def test_admin_disabled_without_token(client, monkeypatch):
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", "")
+
+    assert client.get("/api/admin/feeds").status_code == 503
+    assert client.post("/api/admin/feeds", json={"name": "x", "url": "http://93.184.215.14/rss"}).status_code == 503
+
+
+def test_admin_open_only_with_explicit_opt_in(client, monkeypatch):
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", "")
+    monkeypatch.setattr(admin, "ADMIN_ALLOW_UNAUTHENTICATED", True)
+
+    assert client.get("/api/admin/feeds").status_code == 200
+
+
+def test_admin_requires_matching_token(client, monkeypatch):
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", TOKEN)
+
+    assert client.get("/api/admin/feeds").status_code == 401
+    assert client.get("/api/admin/feeds", headers={"X-Admin-Token": "wrong"}).status_code == 401
+    assert client.get("/api/admin/feeds", headers={"X-Admin-Token": TOKEN}).status_code == 200
+
+
+@pytest.mark.parametrize("url", [
+    "http://127.0.0.1/rss",
+    "http://localhost:8000/api/admin/feeds",
+    "http://10.0.0.5/rss",
+    "http://192.168.1.1/rss",
+    "http://169.254.169.254/latest/meta-data/",
+    "http://[::1]/rss",
+    "http://0.0.0.0/rss",
+])
+def test_add_feed_rejects_non_public_hosts(client, monkeypatch, url):
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", TOKEN)
+
+    response = client.post(
+        "/api/admin/feeds", json={"name": "internal", "url": url}, headers={"X-Admin-Token": TOKEN}
+    )
+
+    assert response.status_code == 422
+
+
+def test_add_feed_accepts_public_host(client, monkeypatch):
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", TOKEN)
+
+    response = client.post(
+        "/api/admin/feeds", json={"name": "public_feed", "url": "https://93.184.215.14/rss"},
+        headers={"X-Admin-Token": TOKEN},
+    )
+
+    assert response.status_code == 201
+    assert response.json()["url"] == "https://93.184.215.14/rss"
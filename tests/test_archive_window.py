@@ -0,0 +1,56 @@
+"""
+Tests for windows that reach more archive months than can be attached.
+
+Run from the project root:
+    python -m pytest -q tests
+"""
+from datetime import datetime
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+
+from database import archive
+from database.archive import ARCHIVE_DIR, ArchiveWindowError, archive_path, article_source
+from database.db import SessionLocal, init_db
+from models.article import Article
+
+MONTHS = [(2024, 1), (2024, 2), (2024, 3)]
+
+
+@pytest.fixture
+def archive_months(monkeypatch):
+    init_db()
+    os.makedirs(ARCHIVE_DIR, exist_ok=True)
+    for year, month in MONTHS:
+        engine = create_engine(f"sqlite:///{archive_path(year, month)}")
+        Article.__table__.create(engine)
+        engine.dispose()
+    monkeypatch.setattr(archive, "MAX_ATTACHED_ARCHIVES", 2)
+    yield
+    for year, month in MONTHS:
+        os.remove(archive_path(year, month))
+
+
+def test_article_source_refuses_partial_windows(archive_months):
+    db = SessionLocal()
+    try:
+        with pytest.raises(ArchiveWindowError):
+            article_source(db, datetime(2023, 12, 1))
+        # Two of the months fit
+        article_source(db, datetime(2024, 2, 15))
+    finally:
+        db.close()
+
+
+@pytest.mark.parametrize("path", ["/api/articles", "/api/statistics", "/api/timeseries"])
+def test_routes_reject_windows_they_cannot_read_in_full(archive_months, path):
+    from main import app
+    client = TestClient(app)
+
+    response = client.get(path, params={"days": 3000, "bucket": "week"})
+
+    assert response.status_code == 400
+    assert "archived months" in response.json()["detail"]
+    assert client.get(path, params={"days": 30}).status_code == 200
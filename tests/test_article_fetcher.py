@@ -0,0 +1,239 @@
+"""
+Tests for the article body fetcher, against a local stand-in news site.
+
+Run from the project root:
+    python -m pytest -q tests
+"""
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+import time
+
+import pytest
+import requests
+
+from scrapers import article_fetcher
+from scrapers.article_fetcher import (
+    HostThrottle, PageTooLargeError, download_page, extract_main_text, fetch_article_bodies,
+)
+from services.feed_worker import classify_entries
+from services.pipeline import enrich_with_bodies
+from services.process_pool import shutdown_process_pool
+
+STORY = (
+    "Gunmen kidnapped eleven residents of Kubwa in Abuja on Sunday night, "
+    "the police command said in a statement."
+)
+STORY_MORE = "The bandits stormed the estate shortly after midnight and fired shots into the air."
+
+ARTICLE_PAGE = f"""<html><head><title>Story</title>
+<style>p {{ color: red; }}</style><script>var tracking = "do not index this script text at all";</script>
+</head><body>
+<header><p>Breaking news, sports, politics and entertainment from around the country</p></header>
+<nav><p>Home | Politics | Business | Sports | Entertainment | Opinion | Contact us</p></nav>
+<article>
+  <h1>Residents count losses in the capital</h1>
+  <p>By Staff</p>
+  <p>{STORY}</p>
+  <figure><p>Photo caption that describes the picture above in some detail</p></figure>
+  <p>{STORY_MORE}</p>
+</article>
+<aside><p>Related: ten other stories you might also like to read this week</p></aside>
+<footer><p>Copyright 2026 Test Daily. All rights reserved. Terms and privacy policy.</p></footer>
+</body></html>"""
+
+# No <article>: the div whose own paragraphs hold the most text wins
+DIV_PAGE = f"""<html><body>
+<div class="sidebar"><p>Subscribe to our newsletter for the latest headlines daily</p></div>
+<div class="story"><p>{STORY}</p><p>{STORY_MORE}</p></div>
+</body></html>"""
+
+# Served slower than the timeout the tests set
+SLOW_SECONDS = 1.0
+
+# Request start times per path, recorded by the server
+hits = {}
+hits_lock = threading.Lock()
+
+
+class StandInSite(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: bytes, content_type: str = "text/html; charset=utf-8", length: bool = True):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        if length:
+            self.send_header("Content-Length", str(len(body)))
+        else:
+            self.send_header("Connection", "close")
+            self.close_connection = True
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        with hits_lock:
+            hits.setdefault(path, []).append(time.monotonic())
+
+        if path.startswith("/article"):
+            self._send(200, ARTICLE_PAGE.encode())
+        elif path == "/div":
+            self._send(200, DIV_PAGE.encode())
+        elif path == "/big":
+            self._send(200, b"<html><body>" + b"x" * 50_000 + b"</body></html>")
+        elif path == "/big-streamed":
+            # No Content-Length, so only the streamed byte count can catch it
+            self._send(200, b"<html><body>" + b"x" * 50_000 + b"</body></html>", length=False)
+        elif path == "/slow":
+            time.sleep(SLOW_SECONDS)
+            self._send(200, ARTICLE_PAGE.encode())
+        elif path == "/feed.json":
+            self._send(200, b'{"items": []}', content_type="application/json")
+        else:
+            self._send(404, b"<html><body>Not found</body></html>")
+
+
+@pytest.fixture(scope="module")
+def site():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInSite)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+    shutdown_process_pool()
+
+
+@pytest.fixture(autouse=True)
+def fast_fetches(monkeypatch):
+    hits.clear()
+    monkeypatch.setattr(article_fetcher, "BODY_FETCH_TIMEOUT_SECONDS", 0.3)
+
+
+def test_extract_main_text_strips_boilerplate():
+    text = extract_main_text(ARTICLE_PAGE)
+
+    assert text == f"{STORY}\n\n{STORY_MORE}"
+    for boilerplate in ("Breaking news", "Politics | Business", "Photo caption", "Related:", "Copyright", "tracking"):
+        assert boilerplate not in text
+
+
+def test_extract_main_text_without_article_element():
+    assert extract_main_text(DIV_PAGE) == f"{STORY}\n\n{STORY_MORE}"
+
+
+def test_extract_main_text_caps_length():
+    assert extract_main_text(ARTICLE_PAGE, max_chars=30) == STORY[:30]
+
+
+def test_extract_main_text_without_paragraphs():
+    assert extract_main_text("<html><body><div>Short</div></body></html>") == ''
+
+
+def test_download_page(site):
+    assert download_page(f"{site}/article") == ARTICLE_PAGE
+
+
+@pytest.mark.parametrize("path", ["/big", "/big-streamed"])
+def test_download_page_byte_cap(site, path):
+    with pytest.raises(PageTooLargeError):
+        download_page(f"{site}{path}", max_bytes=10_000)
+
+    assert download_page(f"{site}{path}", max_bytes=100_000) is not None
+
+
+def test_download_page_failures(site):
+    with pytest.raises(requests.Timeout):
+        download_page(f"{site}/slow")
+
+    with pytest.raises(requests.HTTPError):
+        download_page(f"{site}/missing")
+
+    assert download_page(f"{site}/feed.json") is None
+
+
+def test_fetch_article_bodies_skips_failures(site):
+    urls = [f"{site}/{path}" for path in ("article", "div", "slow", "missing", "feed.json", "big")]
+
+    bodies = fetch_article_bodies(urls + [urls[0], None])
+
+    assert bodies == {
+        f"{site}/article": f"{STORY}\n\n{STORY_MORE}",
+        f"{site}/div": f"{STORY}\n\n{STORY_MORE}",
+    }
+    # Each URL fetched once, duplicates and empty links dropped
+    assert len(hits["/article"]) == 1
+
+
+def test_host_throttle_spaces_and_limits_requests():
+    throttle = HostThrottle(per_host=1, delay=0.1)
+    active = {"a.example": 0, "b.example": 0}
+    peak = {"a.example": 0, "b.example": 0}
+    starts = {"a.example": [], "b.example": []}
+    lock = threading.Lock()
+
+    def request(host):
+        throttle.acquire(host)
+        try:
+            with lock:
+                starts[host].append(time.monotonic())
+                active[host] += 1
+                peak[host] = max(peak[host], active[host])
+            time.sleep(0.02)
+            with lock:
+                active[host] -= 1
+        finally:
+            throttle.release(host)
+
+    started = time.monotonic()
+    threads = [threading.Thread(target=request, args=(host,)) for host in ("a.example", "b.example") * 3]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for host in starts:
+        assert peak[host] == 1
+        gaps = [b - a for a, b in zip(starts[host], starts[host][1:])]
+        assert all(gap >= 0.09 for gap in gaps)
+    # The two hosts are throttled independently: three spaced starts each, not six
+    assert time.monotonic() - started < 0.5
+
+
+def test_fetch_article_bodies_throttles_per_host(site, monkeypatch):
+    monkeypatch.setattr(article_fetcher, "HostThrottle", lambda: HostThrottle(per_host=1, delay=0.15))
+
+    bodies = fetch_article_bodies([f"{site}/article-{i}" for i in range(3)], workers=3)
+
+    assert len(bodies) == 3
+    starts = sorted(t for path, times in hits.items() if path.startswith("/article-") for t in times)
+    assert len(starts) == 3
+    assert all(b - a >= 0.14 for a, b in zip(starts, starts[1:]))
+
+
+def test_enrich_with_bodies_reclassifies_only_fetched_records(site):
+    entries = [
+        {
+            "title": "Residents count losses in the capital",
+            "summary": "Read the full story.",
+            "source": "Test Daily",
+            "link": f"{site}/{path}",
+            "published_date": datetime(2026, 1, 1),
+        }
+        for path in ("article", "missing")
+    ]
+    records = classify_entries(entries)
+    assert [r["topic"] for r in records] == ["general", "general"]
+    untouched = dict(records[1])
+
+    bodies = enrich_with_bodies(records)
+
+    assert bodies == {f"{site}/article": f"{STORY}\n\n{STORY_MORE}"}
+    assert records[0]["topic"] == "security"
+    assert records[0]["locations"] == "FCT"
+    assert records[0]["is_priority"] is True
+    # The stored summary stays the feed's; page text is saved separately
+    assert records[0]["summary"] == "Read the full story."
+    assert records[1] == untouched
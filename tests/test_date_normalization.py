@@ -0,0 +1,69 @@
+"""
+Tests for the one-off normalization of stored published dates to UTC.
+
+Run from the project root:
+    python -m pytest -q tests
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, select, text
+
+from database.migrations import detect_date_offsets, normalize_published_dates
+from models.article import Article
+
+articles = Article.__table__
+EXTRACTED = datetime(2026, 1, 13, 7, 30)
+
+
+@pytest.fixture
+def conn(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'dates.db'}")
+    articles.create(engine)
+    with engine.connect() as conn:
+        yield conn
+
+
+def _add(conn, source: str, published: str, legacy: bool = True):
+    # Raw text, as the old scrapers stored it
+    conn.execute(
+        text(
+            "INSERT INTO articles (source, published_date, extracted_date, published_utc) "
+            "VALUES (:source, :published, :extracted, :utc)"
+        ),
+        {"source": source, "published": published, "extracted": f"{EXTRACTED:%Y-%m-%d %H:%M:%S.%f}",
+         "utc": None if legacy else 1},
+    )
+
+
+def _dates(conn, source: str):
+    rows = conn.execute(select(articles.c.published_date).where(articles.c.source == source).order_by(articles.c.id))
+    return [value for (value,) in rows]
+
+
+def test_detects_offsets_rounded_to_the_half_hour(conn):
+    # Published 57 minutes "after" extraction: a dropped +01:00
+    _add(conn, "punch", "2026-01-13 08:27:26.000000")
+    # A 12 minute lead is clock skew, not an offset
+    _add(conn, "vanguard", "2026-01-13 07:42:00.000000")
+    # Kept its offset, so it says nothing about a dropped one
+    _add(conn, "guardian", "2026-01-13T10:00:00+01:00")
+
+    assert detect_date_offsets(conn) == {"punch": timedelta(hours=1)}
+
+
+def test_shifts_legacy_rows_once(conn):
+    _add(conn, "punch", "2026-01-13 08:27:26.000000")
+    _add(conn, "punch", "2026-01-13 05:00:00.000000")
+    _add(conn, "vanguard", "2026-01-13T09:00:00+01:00")
+    # Stored by the UTC-aware ingestion code
+    _add(conn, "punch", "2026-01-13 06:00:00.000000", legacy=False)
+
+    assert normalize_published_dates(conn) == 3
+    expected = [datetime(2026, 1, 13, 7, 27, 26), datetime(2026, 1, 13, 4), datetime(2026, 1, 13, 6)]
+    assert _dates(conn, "punch") == expected
+    assert _dates(conn, "vanguard") == [datetime(2026, 1, 13, 8)]
+
+    # A second run finds nothing left to normalize
+    assert normalize_published_dates(conn) == 0
+    assert _dates(conn, "punch") == expected
@@ -0,0 +1,48 @@
+"""
+Tests for the stored priority flag of classified feed entries.
+
+Run from the project root:
+    python -m pytest -q tests
+"""
+from datetime import datetime
+
+import pytest
+
+from services.classifier import classify_topic
+from services.feed_worker import classify_entries
+
+ENTRIES = [
+    ("Residents flee village in Kaduna", "Gunmen kidnapped twelve residents of a village in Kaduna State, police said."),
+    ("Residents flee estate in Abuja suburb", "Gunmen kidnapped twelve residents of Kubwa in Abuja, police said."),
+    ("Gridlock on Ikorodu Road", "Traffic congestion in Lagos after a crash on the highway, motorists report."),
+    ("Gridlock on Kubwa expressway", "Traffic congestion in Abuja after a crash on the highway, motorists report."),
+    ("Lagos assembly passes budget", "The Lagos State House of Assembly passed the 2026 budget on Tuesday."),
+    # Security words in the title make any location priority, as they always have
+    ("Gunmen kidnap 12 in Kaduna", "Gunmen kidnapped twelve residents of a village in Kaduna State."),
+]
+
+
+def _entry(title: str, summary: str) -> dict:
+    return {
+        "title": title,
+        "summary": summary,
+        "source": "Test Daily",
+        "link": f"https://example.com/{abs(hash(title))}",
+        "published_date": datetime(2026, 1, 1),
+    }
+
+
+@pytest.mark.parametrize("title, summary", ENTRIES)
+def test_stored_priority_matches_topic_rule(title, summary):
+    record = classify_entries([_entry(title, summary)])[0]
+
+    # What the scheduler stored before classification moved into the batch path
+    _, expected = classify_topic(title, summary)
+    assert record["is_priority"] is bool(expected)
+    assert (record["priority_reason"] is not None) is record["is_priority"]
+
+
+def test_lagos_and_kaduna_locations_alone_are_not_priority():
+    records = classify_entries([_entry(*entry) for entry in ENTRIES])
+
+    assert [r["is_priority"] for r in records] == [False, True, False, True, False, True]